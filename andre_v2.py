@@ -4,11 +4,18 @@ import random
 import datetime
 import os
 import math
+import time
 from collections import deque
 
+import quiz_logic
+from attempt_logger import AttemptLogger
+from log_records import make_record, to_jsonl
+
 class KidsConversionGame:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, root=None, on_exit=None, seed=None):
+        # root/on_exit let the launcher host the game in its own Tk root
+        self.root = root if root is not None else tk.Tk()
+        self.on_exit = on_exit
         self.root.title("🚀 Distance Converter Adventure! 🌟")
         self.root.geometry("850x750")
         self.root.configure(bg='#FFE4E1')
@@ -18,12 +25,24 @@ class KidsConversionGame:
         self.total_questions = 0
         self.current_question = ""
         self.current_answer = 0.0
+        self.current_key = None
         self.current_unit_from = ""
         self.current_unit_to = ""
         self.current_sigfigs = 3
         self.prev_conversion_type = None
         self.recent_q = deque(maxlen=20)  # remember more recent questions
+        # Questions come from self.rng (seeded, logged); stars and cheers from self.fx_rng
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.fx_rng = quiz_logic.effects_rng(self.seed)
         self.log_file = "kids_conversion_log.txt"
+        self.start_log()
+        self.logger = AttemptLogger(self.log_file)
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.logger.log(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Session seed: {self.seed}\n")
+        self.current_value_key = ""
+        self.question_shown_at = time.monotonic()
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
         
         # New interactive features
         self.streak = 0
@@ -76,130 +95,32 @@ class KidsConversionGame:
     def create_stars(self):
         """Create random star positions for background animation"""
         for _ in range(25):
-            x = random.randint(50, 800)
-            y = random.randint(50, 700)
-            size = random.randint(1, 3)
-            self.star_positions.append([x, y, size, random.uniform(0, 2*math.pi)])
+            x = self.fx_rng.randint(50, 800)
+            y = self.fx_rng.randint(50, 700)
+            size = self.fx_rng.randint(1, 3)
+            self.star_positions.append([x, y, size, self.fx_rng.uniform(0, 2*math.pi)])
     
     # --------- number helpers ---------
     def round_sig(self, x, sig):
         """Round to a number of significant figures (1–4)."""
-        if x == 0:
-            return 0.0
-        if sig < 1:
-            sig = 1
-        if sig > 6:
-            sig = 6
-        return float(f"{x:.{sig}g}")
+        return quiz_logic.round_sig(x, sig)
 
     def format_number(self, num):
         """Format number (no trailing zeros; avoid sci-notation for our ranges)."""
-        if abs(num - int(num)) < 1e-12:
-            return str(int(num))
-        formatted = f"{num:.10f}".rstrip('0').rstrip('.')
-        return formatted
+        return quiz_logic.format_number(num)
     
     # --------- enhanced question generation ---------
     def get_difficulty_ranges(self):
         """Get value ranges based on current difficulty level"""
-        if self.difficulty_level == 1:
-            # Easy: nice round numbers
-            km_range = (1, 100)
-            m_range = (1000, 10000)
-        elif self.difficulty_level == 2:
-            # Medium: wider range
-            km_range = (1, 500)
-            m_range = (1000, 30000)
-        else:
-            # Hard: full range with decimals
-            km_range = (0.5, 999)
-            m_range = (500, 50000)
-        
-        return km_range, m_range
+        return quiz_logic.difficulty_ranges(self.difficulty_level)
     
     def generate_question_once(self, force_type=None):
         """Generate one candidate question with better variation."""
-        # Decide conversion type with better alternation
-        if force_type is not None:
-            conversion_type = force_type
-        else:
-            choices = ["km_to_m", "m_to_km"]
-            if self.prev_conversion_type in choices:
-                other = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-                # Strong preference for alternating
-                conversion_type = random.choices([other, self.prev_conversion_type], weights=[0.85, 0.15])[0]
-            else:
-                conversion_type = random.choice(choices)
-
-        # Varied sig figs (1-4) with preference for 2-3
-        sig_figs = random.choices([1, 2, 3, 4], weights=[1, 3, 3, 2])[0]
-        
-        # Get difficulty-based ranges
-        km_range, m_range = self.get_difficulty_ranges()
-
-        # Fun question templates
-        km_templates = [
-            "🚀 The spaceship traveled {val} kilometers.\nHow many meters is that?",
-            "🌙 The moon rover drove {val} km across the surface.\nConvert to meters!",
-            "✈️ The airplane flew {val} kilometers.\nWhat's that in meters?",
-            "🏃 The marathon runner completed {val} km.\nHow many meters did they run?",
-            "🚂 The train traveled {val} kilometers.\nExpress this in meters!",
-            "🎈 The hot air balloon drifted {val} km.\nHow many meters is that?"
-        ]
-        
-        m_templates = [
-            "🌟 The rocket flew {val} meters into the sky.\nHow many kilometers is that?",
-            "🏊 The swimmer completed {val} meters.\nConvert to kilometers!",
-            "🚴 The cyclist rode {val} meters.\nWhat's that in kilometers?",
-            "🎯 The arrow flew {val} meters.\nExpress this in kilometers!",
-            "🦘 The kangaroo hopped {val} meters total.\nHow many km did it hop?",
-            "⛷️ The skier descended {val} meters.\nConvert to kilometers!"
-        ]
-
-        if conversion_type == "km_to_m":
-            raw = random.uniform(*km_range)
-            # Add some variety: sometimes use nice round numbers
-            if random.random() < 0.3 and sig_figs <= 2:
-                raw = round(raw / 10) * 10  # Round to nearest 10
-            
-            km_value = self.round_sig(raw, sig_figs)
-            template = random.choice(km_templates)
-            question = template.format(val=self.format_number(km_value))
-            correct_answer = km_value * 1000
-            unit_from, unit_to = "km", "m"
-            value_key = f"{conversion_type}:{self.format_number(km_value)}"
-
-        else:  # m_to_km
-            raw = random.uniform(*m_range)
-            # Sometimes use multiples of 1000 for easier division
-            if random.random() < 0.25 and sig_figs <= 3:
-                raw = round(raw / 1000) * 1000
-            
-            m_value = self.round_sig(raw, sig_figs)
-            template = random.choice(m_templates)
-            question = template.format(val=self.format_number(m_value))
-            correct_answer = m_value / 1000
-            unit_from, unit_to = "m", "km"
-            value_key = f"{conversion_type}:{self.format_number(m_value)}"
-
-        return question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key
+        return quiz_logic.generate_km_question(self.difficulty_level, self.prev_conversion_type, force_type, self.rng)
 
     def generate_question(self):
         """Generate a non-repeating, robust question (up to 100 tries)."""
-        for attempt in range(100):
-            q = self.generate_question_once()
-            question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key = q
-            
-            # More strict anti-repeat logic
-            if value_key not in self.recent_q:
-                # Avoid immediate same direction (first 10 attempts)
-                if attempt < 10 and self.prev_conversion_type == conversion_type:
-                    continue
-                return q
-        
-        # If still failing, force alternate direction
-        alternate = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-        return self.generate_question_once(force_type=alternate)
+        return quiz_logic.pick_km_question(self.difficulty_level, self.prev_conversion_type, self.recent_q, self.rng)
 
     def new_question(self):
         """Generate and display a new question"""
@@ -209,20 +130,22 @@ class KidsConversionGame:
          self.current_unit_to,
          self.current_sigfigs,
          conversion_type,
-         value_key) = self.generate_question()
+         value_key,
+         self.current_key) = self.generate_question()
         
         self.prev_conversion_type = conversion_type
         self.recent_q.append(value_key)
+        self.current_value_key = value_key
+        self.question_shown_at = time.monotonic()
         
         # Auto-adjust difficulty based on performance
-        if self.total_questions > 0 and self.total_questions % 10 == 0:
-            accuracy = (self.score / self.total_questions) * 100
-            if accuracy >= 85 and self.difficulty_level < 3:
-                self.difficulty_level += 1
-                self.show_notification(f"🎊 Level Up! Difficulty increased to {self.difficulty_level}!")
-            elif accuracy < 50 and self.difficulty_level > 1:
-                self.difficulty_level -= 1
-                self.show_notification(f"💪 Taking it easier! Difficulty adjusted to {self.difficulty_level}")
+        new_level = quiz_logic.adjust_difficulty(self.difficulty_level, self.score, self.total_questions)
+        if new_level > self.difficulty_level:
+            self.difficulty_level = new_level
+            self.show_notification(f"🎊 Level Up! Difficulty increased to {self.difficulty_level}!")
+        elif new_level < self.difficulty_level:
+            self.difficulty_level = new_level
+            self.show_notification(f"💪 Taking it easier! Difficulty adjusted to {self.difficulty_level}")
 
         self.question_label.config(text=self.current_question)
         self.answer_var.set("")
@@ -533,29 +456,23 @@ class KidsConversionGame:
     # --------- checking logic ---------
     def tolerance_from_sigfigs(self, true_value, sigfigs):
         """Set a forgiving tolerance based on displayed significant figures."""
-        if true_value == 0:
-            return 1e-12
-        magnitude = 10 ** (math.floor(math.log10(abs(true_value))) - sigfigs + 1)
-        tol = 0.5 * magnitude
-        return max(tol, 1e-9)
+        return quiz_logic.tolerance_from_sigfigs(true_value, sigfigs)
 
     def check_answer(self):
         """Check the user's answer"""
         user_input = self.answer_var.get().strip()
+        status, user_answer = quiz_logic.grade(user_input, self.current_key)
         
-        if not user_input:
+        if status == "empty":
             messagebox.showwarning("Oops! 🤔", "Please enter an answer first!")
             return
         
-        try:
-            user_answer = float(user_input)
-        except ValueError:
+        if status == "invalid":
             messagebox.showerror("Invalid Input! 😵", "Please enter a number only!\n\nFor example: 1500 or 2.5")
             return
         
-        # Check if correct within tolerance
-        tolerance = self.tolerance_from_sigfigs(self.current_answer, self.current_sigfigs)
-        is_correct = abs(user_answer - self.current_answer) <= tolerance
+        # Correct within a tolerance from the question's significant figures
+        is_correct = status == "correct"
         
         self.total_questions += 1
         
@@ -566,7 +483,7 @@ class KidsConversionGame:
                 self.best_streak = self.streak
             
             # Random encouraging message
-            message = random.choice(self.correct_messages)
+            message = self.fx_rng.choice(self.correct_messages)
             if self.streak >= 3:
                 message += f"\n🔥 {self.streak} in a row!"
             
@@ -577,9 +494,9 @@ class KidsConversionGame:
             self.streak = 0
             
             # ALWAYS show correct answer clearly
-            correct = self.format_number(self.current_answer)
+            correct = self.current_key.text
             tip = "Multiply by 1000" if self.current_unit_to == "m" else "Divide by 1000"
-            encouragement = random.choice(self.encouragement_messages)
+            encouragement = self.fx_rng.choice(self.encouragement_messages)
             
             self.result_label.config(
                 text=(
@@ -662,11 +579,15 @@ class KidsConversionGame:
                     f"User: {user_answer} | Correct: {self.format_number(correct_answer)} | "
                     f"{result} | Streak: {self.streak} | Level: {self.difficulty_level}\n")
         
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Could not write to log: {e}")
+        self.logger.log(log_entry)
+
+        direction, value = self.current_value_key.split(":", 1)
+        record = make_record(
+            "kids", direction, value, self.format_number(correct_answer), user_answer, is_correct,
+            sig_figs=self.current_sigfigs, streak=self.streak, level=self.difficulty_level,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.seed
+        )
+        self.record_logger.log(to_jsonl(record))
     
     def show_help(self):
         """Show help dialog"""
@@ -720,15 +641,31 @@ Have fun learning! 🌟"""
             message = "Thanks for trying the Distance Converter Adventure! 🚀\n\nCome back anytime to practice!"
         
         messagebox.showinfo("Thanks for Playing! 👋", message)
-        self.root.destroy()
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
     
-    def run(self):
-        """Start the game"""
-        # Initialize log file
+    def close_window(self):
+        """Flush the attempt log and close the window"""
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
+    
+    def finish(self):
+        """Leave the game: back to the launcher when hosted, otherwise close the window"""
+        if self.on_exit is not None:
+            self.on_exit()
+        else:
+            self.root.destroy()
+    
+    def start_log(self):
+        """Write the log header the first time the log is created"""
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write("=== Kids Distance Conversion Game Log ===\n\n")
-        
+    
+    def run(self):
+        """Start the game"""
         self.root.mainloop()
 
 if __name__ == "__main__":
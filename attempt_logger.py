@@ -0,0 +1,120 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+FSYNC_POLICIES = ("never", "batch", "close")
+
+
+class AttemptLogger:
+    """Append log lines from a background thread so the Tk thread never touches the disk.
+
+    Lines are queued by log() and written in batches every flush_interval
+    seconds. fsync policy: "never" (leave it to the OS), "batch" (fsync after
+    every batch) or "close" (fsync on flush() / close() only).
+    """
+
+    def __init__(self, path, flush_interval=0.5, fsync="never"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.queue = queue.Queue()
+        self.file = None
+        self.closed = False
+
+        self.lines_written = 0
+        self.batches_written = 0
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.total_write_ms = 0.0
+
+        self.thread = threading.Thread(target=self._run, name="attempt-logger", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def log(self, line):
+        if not self.closed:
+            self.queue.put(line)
+
+    def flush(self, timeout=5.0):
+        """Block until everything logged so far is on disk."""
+        if self.closed:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join(timeout=5.0)
+
+    def stats(self):
+        batches = self.batches_written
+        return {
+            "queue_depth": self.queue.qsize(),
+            "lines_written": self.lines_written,
+            "batches_written": batches,
+            "last_write_ms": round(self.last_write_ms, 3),
+            "avg_write_ms": round(self.total_write_ms / batches, 3) if batches else 0.0,
+            "max_write_ms": round(self.max_write_ms, 3),
+        }
+
+    def _run(self):
+        running = True
+        while running:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            # Wait out the interval so a burst of answers goes out as one write
+            if item is not None and not isinstance(item, threading.Event):
+                time.sleep(self.flush_interval)
+            lines = []
+            waiters = []
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    lines.append(item)
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(lines, force_sync=bool(waiters) or not running)
+            for waiter in waiters:
+                waiter.set()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write(self, lines, force_sync=False):
+        if not lines and not force_sync:
+            return
+        start = time.perf_counter()
+        try:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            if lines:
+                self.file.write("".join(lines))
+            self.file.flush()
+            if self.fsync == "batch" or (force_sync and self.fsync == "close"):
+                os.fsync(self.file.fileno())
+        except Exception as e:
+            print(f"Log error: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        if lines:
+            self.lines_written += len(lines)
+            self.batches_written += 1
+            self.last_write_ms = elapsed
+            self.total_write_ms += elapsed
+            self.max_write_ms = max(self.max_write_ms, elapsed)
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from battle_engine import BattleEngine
+
+# How a simulated child answers. The chance of a correct answer is
+#   accuracy + streak_bonus * min(streak, 5) - miss_penalty (right after a miss)
+# clamped to [0, 1].
+PROFILES = {
+    "steady": {"accuracy": 0.7, "streak_bonus": 0.0, "miss_penalty": 0.0},
+    "hot_hand": {"accuracy": 0.65, "streak_bonus": 0.03, "miss_penalty": 0.0},
+    "tilts": {"accuracy": 0.75, "streak_bonus": 0.0, "miss_penalty": 0.15},
+}
+
+
+def answer_chance(profile, streak, missed_last):
+    p = profile["accuracy"] + profile["streak_bonus"] * min(streak, 5)
+    if missed_last:
+        p -= profile["miss_penalty"]
+    return min(1.0, max(0.0, p))
+
+
+def simulate_game(rng, profile, max_turns):
+    """Play one game to the hero's defeat (or max_turns) with the real battle rules."""
+    engine = BattleEngine(seed=rng.getrandbits(32))
+    questions_on_monster = 0
+    monster_lengths = []
+    missed_last = False
+    while engine.total_questions < max_turns:
+        is_correct = rng.random() < answer_chance(profile, engine.streak, missed_last)
+        engine.apply_result(is_correct)
+        missed_last = not is_correct
+        questions_on_monster += 1
+        if engine.monster_hp <= 0:
+            monster_lengths.append(questions_on_monster)
+            questions_on_monster = 0
+            engine.next_monster()
+        elif engine.hero_hp <= 0:
+            break
+    return engine.level, engine.total_questions, monster_lengths, engine.hero_hp <= 0
+
+
+def run_chunk(args):
+    profile, games, seed, max_turns = args
+    rng = random.Random(seed)
+    levels = Counter()
+    lengths = Counter()
+    per_monster = Counter()
+    unfinished = 0
+    for _ in range(games):
+        level, turns, monster_lengths, defeated = simulate_game(rng, profile, max_turns)
+        levels[level] += 1
+        lengths[turns] += 1
+        per_monster.update(monster_lengths)
+        if not defeated:
+            unfinished += 1
+    return levels, lengths, per_monster, unfinished
+
+
+def summarize(histogram):
+    """Mean and percentiles of a {value: count} histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return {"count": 0}
+    mean = sum(value * count for value, count in histogram.items()) / total
+    wanted = {"p10": 0.10, "p50": 0.50, "p90": 0.90, "p99": 0.99}
+    result = {"count": total, "mean": round(mean, 2), "min": min(histogram), "max": max(histogram)}
+    seen = 0
+    pending = sorted(wanted.items(), key=lambda item: item[1])
+    for value in sorted(histogram):
+        seen += histogram[value]
+        while pending and seen >= pending[0][1] * total:
+            result[pending.pop(0)[0]] = value
+    return result
+
+
+def simulate(profile, games, seed=0, max_turns=2000, workers=None, chunk_size=10000):
+    """Simulate `games` games split across a process pool and merge the histograms."""
+    chunks = []
+    remaining = games
+    index = 0
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunks.append((profile, size, seed * 1000003 + index, max_turns))
+        remaining -= size
+        index += 1
+
+    levels, lengths, per_monster = Counter(), Counter(), Counter()
+    unfinished = 0
+    with Pool(workers or os.cpu_count()) as pool:
+        for chunk in pool.imap_unordered(run_chunk, chunks):
+            levels.update(chunk[0])
+            lengths.update(chunk[1])
+            per_monster.update(chunk[2])
+            unfinished += chunk[3]
+
+    return {
+        "profile": profile,
+        "games": games,
+        "unfinished": unfinished,
+        "level_reached": summarize(levels),
+        "questions_per_monster": summarize(per_monster),
+        "game_length": summarize(lengths),
+        "level_histogram": dict(sorted(levels.items())),
+    }
+
+
+def print_report(name, report, elapsed):
+    print(f"=== {name}: {report['games']} games in {elapsed:.1f}s ===")
+    print(f"Profile: {report['profile']}")
+    for key in ("level_reached", "questions_per_monster", "game_length"):
+        stats = report[key]
+        parts = ", ".join(f"{k}={v}" for k, v in stats.items())
+        print(f"  {key.replace('_', ' ')}: {parts}")
+    total = report["games"]
+    print("  level reached:")
+    for level, count in report["level_histogram"].items():
+        share = count / total * 100
+        print(f"    LV {level:>3}: {share:6.2f}% {'#' * int(share / 2)}")
+    if report["unfinished"]:
+        print(f"  ⚠️ {report['unfinished']} games hit the turn limit")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance check for the battle rules.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--profile", choices=sorted(PROFILES), action="append",
+                        help="named answer profile (repeatable, default: all)")
+    parser.add_argument("--accuracy", type=float, help="custom profile: base accuracy 0-1")
+    parser.add_argument("--streak-bonus", type=float, default=0.0)
+    parser.add_argument("--miss-penalty", type=float, default=0.0)
+    parser.add_argument("--max-turns", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the reports to this JSON file")
+    args = parser.parse_args()
+
+    profiles = {}
+    if args.accuracy is not None:
+        profiles["custom"] = {"accuracy": args.accuracy,
+                              "streak_bonus": args.streak_bonus,
+                              "miss_penalty": args.miss_penalty}
+    for name in args.profile or ([] if profiles else sorted(PROFILES)):
+        profiles[name] = PROFILES[name]
+
+    reports = {}
+    for name, profile in profiles.items():
+        start = time.perf_counter()
+        reports[name] = simulate(profile, args.games, args.seed, args.max_turns, args.workers)
+        print_report(name, reports[name], time.perf_counter() - start)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
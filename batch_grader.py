@@ -0,0 +1,202 @@
+import argparse
+import csv
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+import quiz_logic
+
+STATUSES = ("correct", "wrong", "zeros", "invalid", "empty")
+CORRECT, WRONG, ZEROS, INVALID, EMPTY = range(len(STATUSES))
+ERROR_CODES = {"empty": EMPTY, "invalid": INVALID}
+
+# Game names as in log_records. Battle uses v3's rules: sig-fig tolerance and no padded zeros.
+KM_GAMES = ("battle", "kids")
+FORBID_ZEROS = ("battle",)
+GAMES = KM_GAMES + ("rocket", "division")
+
+# Answers within this relative distance of a range edge are re-checked exactly
+EDGE = 1e-12
+CHUNK_SIZE = 50000
+
+
+def make_key(game, correct, sig_figs):
+    """AnswerKey for one question record (`correct` is the expected answer as shown)."""
+    if game == "division":
+        return quiz_logic.whole_number_key(int(correct))
+    if game == "rocket":
+        return quiz_logic.rocket_key(Decimal(correct))
+    if game in KM_GAMES:
+        return quiz_logic.sig_fig_key(Decimal(correct), int(sig_figs))
+    raise ValueError(f"unknown game {game!r} (expected one of {', '.join(GAMES)})")
+
+
+class BatchGrader:
+    """Grades columns of answers with the game rules and keeps per-student totals.
+
+    Every distinct question gets one AnswerKey and every distinct typed
+    string one scan; the range checks then run over whole columns in
+    float64. Rows that land within float rounding of a range edge are
+    re-checked against the exact Decimal key, so the result always matches
+    quiz_logic.grade().
+    """
+
+    def __init__(self):
+        self.key_ids = {}
+        self.keys = []
+        self.totals = {}
+
+    def key_id(self, game, correct, sig_figs):
+        record = (game, correct, sig_figs)
+        kid = self.key_ids.get(record)
+        if kid is None:
+            kid = self.key_ids[record] = len(self.keys)
+            self.keys.append((make_key(*record), game in FORBID_ZEROS))
+        return kid
+
+    def grade_columns(self, games, corrects, sig_figs, users):
+        """Return (status codes, key ids) for equal-length columns of question records and typed answers."""
+        n = len(users)
+        key_ids = np.fromiter(map(self.key_id, games, corrects, sig_figs), dtype=np.int64, count=n)
+        keys = [key for key, _ in self.keys]
+        lo = np.array([float(key.lo) for key in keys])[key_ids]
+        hi = np.array([float(key.hi) for key in keys])[key_ids]
+        whole_only = np.array([key.whole_only for key in keys], dtype=bool)[key_ids]
+        forbid = np.array([forbid for _, forbid in self.keys], dtype=bool)[key_ids]
+
+        typed = {}
+        user_ids = np.fromiter((typed.setdefault(u, len(typed)) for u in users), dtype=np.int64, count=n)
+        scans = [quiz_logic.scan_answer(u) for u in typed]
+        value = np.array([float(s.value) if s.error is None else np.nan for s in scans])[user_ids]
+        error = np.array([ERROR_CODES.get(s.error, -1) for s in scans], dtype=np.int8)[user_ids]
+        violation = np.array([s.violation is not None for s in scans], dtype=bool)[user_ids]
+        whole = np.array([s.whole for s in scans], dtype=bool)[user_ids]
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            inside = (value >= lo) & (value <= hi)
+            scale = np.maximum(np.abs(value), np.maximum(np.abs(lo), np.abs(hi)))
+            near = (np.abs(value - lo) <= EDGE * scale) | (np.abs(value - hi) <= EDGE * scale)
+        status = np.where(inside, CORRECT, WRONG).astype(np.int8)
+        for i in np.flatnonzero(near):
+            status[i] = CORRECT if keys[key_ids[i]].accepts(scans[user_ids[i]].value) else WRONG
+
+        # Same precedence as quiz_logic.grade_scan
+        status[forbid & violation] = ZEROS
+        status[whole_only & ~whole] = INVALID
+        failed = error >= 0
+        status[failed] = error[failed]
+        return status, key_ids
+
+    def add_totals(self, students, status):
+        ids = {}
+        student_ids = np.fromiter((ids.setdefault(s, len(ids)) for s in students), dtype=np.int64, count=len(students))
+        counts = np.bincount(student_ids * len(STATUSES) + status, minlength=len(ids) * len(STATUSES))
+        for student, row in zip(ids, counts.reshape(len(ids), len(STATUSES))):
+            if student in self.totals:
+                self.totals[student] += row
+            else:
+                self.totals[student] = row.copy()
+
+    def summary_rows(self):
+        for student, counts in sorted(self.totals.items()):
+            total = int(counts.sum())
+            row = {"student": student, "questions": total}
+            row.update({name: int(c) for name, c in zip(STATUSES, counts)})
+            row["percent"] = round(100 * int(counts[CORRECT]) / total, 1) if total else 0.0
+            yield row
+
+
+def load_questions(path):
+    """index -> (answer, sig_figs) from a question_bank.py CSV."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row["index"]: (row["answer"], row["sig_figs"]) for row in csv.DictReader(f)}
+
+
+def read_chunks(reader, size):
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade_file(answers_path, output_path, summary_path, questions_path=None, game="battle", chunk_size=CHUNK_SIZE):
+    """Grade a CSV of answers, streaming graded rows and then per-student totals to disk.
+
+    Each row needs `user` (what was typed) and either `correct` (expected
+    answer as shown) and `sig_figs`, or an `index` into the question bank at
+    `questions_path`. Optional columns: `student`, `game` (default `game`).
+    Returns the BatchGrader with its totals.
+    """
+    questions = load_questions(questions_path) if questions_path else None
+    grader = BatchGrader()
+    with open(answers_path, newline='', encoding='utf-8') as src, \
+            open(output_path, 'w', newline='', encoding='utf-8') as dst:
+        reader = csv.reader(src)
+        header = next(reader)
+        col = {name: i for i, name in enumerate(header)}
+        if "user" not in col:
+            raise ValueError(f"{answers_path}: no 'user' column")
+        if "correct" not in col and not (questions and "index" in col):
+            raise ValueError(f"{answers_path}: needs 'correct' and 'sig_figs' columns, or 'index' with --questions")
+        writer = csv.writer(dst)
+        writer.writerow(header + ["expected", "status", "ok"])
+
+        line = 1
+        for chunk in read_chunks(reader, chunk_size):
+            users = [row[col["user"]] for row in chunk]
+            games = [row[col["game"]] for row in chunk] if "game" in col else [game] * len(chunk)
+            if "correct" in col:
+                corrects = [row[col["correct"]] for row in chunk]
+                sig_figs = [row[col["sig_figs"]] if "sig_figs" in col else "" for row in chunk]
+            else:
+                try:
+                    records = [questions[row[col["index"]]] for row in chunk]
+                except KeyError as e:
+                    raise ValueError(f"{answers_path}: question index {e} not in {questions_path}") from None
+                corrects = [answer for answer, _ in records]
+                sig_figs = [sig for _, sig in records]
+            try:
+                status, key_ids = grader.grade_columns(games, corrects, sig_figs, users)
+            except (ValueError, InvalidOperation) as e:
+                raise ValueError(f"{answers_path}: bad question record between lines {line + 1} and "
+                                 f"{line + len(chunk)}: {e}") from None
+            students = [row[col["student"]] for row in chunk] if "student" in col else [""] * len(chunk)
+            grader.add_totals(students, status)
+
+            expected = [grader.keys[k][0].text for k in key_ids.tolist()]
+            writer.writerows(
+                row + [text, STATUSES[s], "true" if s == CORRECT else "false"]
+                for row, text, s in zip(chunk, expected, status.tolist())
+            )
+            line += len(chunk)
+
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["student", "questions", *STATUSES, "percent"])
+        writer.writeheader()
+        writer.writerows(grader.summary_rows())
+    return grader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a CSV of worksheet answers with the game rules.")
+    parser.add_argument("answers", help="CSV with user, and correct/sig_figs or index")
+    parser.add_argument("--questions", help="question_bank.py CSV to look up questions by index")
+    parser.add_argument("--game", default="battle", choices=GAMES, help="rules for rows without a game column")
+    parser.add_argument("--output", default="graded.csv")
+    parser.add_argument("--summary", default="grade_summary.csv")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    grader = grade_file(args.answers, args.output, args.summary, args.questions, args.game, args.chunk_size)
+    totals = sum(grader.totals.values()) if grader.totals else np.zeros(len(STATUSES), dtype=np.int64)
+    print(f"Graded {int(totals.sum())} answers from {len(grader.totals)} students: "
+          + ", ".join(f"{int(c)} {name}" for name, c in zip(STATUSES, totals)))
+    print(f"Wrote {args.output} and {args.summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+import random
+import math
+import struct
+import zlib
+from bisect import bisect
+
+import quiz_logic
+
+SNAPSHOT_VERSION = 3
+# version, seed, questions drawn, score, total, current question (type, sig figs, text, template,
+# flags), recent window, streak, best streak, hints, difficulty, level, hero HP,
+# monster HP, monster; then a CRC32 of all that
+SNAPSHOT_STRUCT = struct.Struct("<HQIIIBB16sBB80sIIIBHHIB")
+SNAPSHOT_CRC = struct.Struct("<I")
+NO_INDEX = 0xFF
+# Flags of the current question
+ANSWERED = 1
+HINT_USED = 2
+# Recent-window tag of a question: CRC32 of its value key, 4 bytes. The 49,993 values the
+# pools can hold have distinct CRC32s, so a tag names exactly one of them
+TAG_SIZE = 4
+
+
+class BattleEngine:
+    """Rules of the Math Battle Arena with no UI attached.
+
+    Drive it with new_question() and submit(answer); the Tk game in
+    hero_monster_v3 is only a view over this state. Each question and each
+    monster is drawn from its own generator derived from self.seed, so a
+    session can be replayed from its seed.
+
+    State is small enough to host many sessions: slots only, the current
+    question kept as references to its shared pool entry and template, and
+    the recent-question window as one bytes object of CRC32 tags, oldest
+    first, searched with bytes.find(). Monster HP, hero
+    damage and the previous question type follow from the level and the
+    current question, so they are derived rather than stored.
+    """
+
+    __slots__ = (
+        "seed", "rng", "questions_drawn", "score", "total_questions",
+        "conversion_type", "current_sigfigs", "question_entry", "template", "current_key",
+        "question_answered", "hint_used", "recent",
+        "streak", "best_streak", "hints_used", "difficulty_level",
+        "level", "hero_hp", "monster_hp", "monster_index",
+    )
+
+    KM_TEMPLATES = (
+        "🚀 Spaceship traveled {val} km",
+        "✈️ Jet flew {val} kilometers",
+        "🏃 Runner completed {val} km",
+        "🚂 Train moved {val} kilometers",
+        "🎈 Balloon drifted {val} km"
+    )
+    M_TEMPLATES = (
+        "🌟 Rocket ascended {val} meters",
+        "🏊 Swimmer covered {val} m",
+        "🚴 Cyclist rode {val} meters",
+        "⛷️ Skier descended {val} m",
+        "🦘 Kangaroo hopped {val} meters"
+    )
+    MONSTER_TYPES = (
+        {"name": "Slime", "emoji": "🟢", "color": "#90EE90"},
+        {"name": "Bat", "emoji": "🦇", "color": "#8B4513"},
+        {"name": "Goblin", "emoji": "👹", "color": "#DAA520"},
+        {"name": "Dragon", "emoji": "🐉", "color": "#FF4500"},
+        {"name": "Demon", "emoji": "😈", "color": "#8B0000"},
+        {"name": "Golem", "emoji": "🗿", "color": "#808080"},
+        {"name": "Hydra", "emoji": "🐍", "color": "#9370DB"}
+    )
+    HEAL_ON_VICTORY = 25
+    # Sig figs 1-4 weighted 1:3:3:2, as a lookup table for one random() call
+    SIG_FIG_TABLE = (1, 2, 2, 2, 3, 3, 3, 4, 4)
+    # The original generator re-drew a question in the same direction up to 10 times, so one
+    # only got through when its 15% draw came up 11 times running
+    SAME_DIRECTION_CHANCE = 0.15 ** 11
+    RECENT_SIZE = 20
+    # Range-weighted picks tried before a recent value is allowed again
+    MAX_DRAWS = 20
+
+    # Starting stats, the same for every session
+    hero_max_hp = 100
+    base_monster_hp = 60
+    base_hero_damage = 15
+    monster_damage = 12
+
+    # Value pools keyed by (difficulty, sig_figs, conversion_type, round_only),
+    # shared read-only by every engine; each engine draws with its own rng
+    _question_pools = {}
+    NO_ENTRY = (0.0, "", b"")
+
+    def __init__(self, seed=None):
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        # Only set while a question is being drawn
+        self.rng = None
+        self.questions_drawn = 0
+        self.score = 0
+        self.total_questions = 0
+        self.conversion_type = None
+        self.current_sigfigs = 3
+        self.question_entry = self.NO_ENTRY
+        self.template = ""
+        self.current_key = None
+        self.question_answered = False
+        self.hint_used = False
+        self.recent = bytes(TAG_SIZE * self.RECENT_SIZE)
+
+        self.streak = 0
+        self.best_streak = 0
+        self.hints_used = 0
+        self.difficulty_level = 1
+
+        self.level = 1
+        self.hero_hp = self.hero_max_hp
+        self.monster_hp = self.monster_max_hp
+        self.monster_index = self.draw_monster()
+
+    # --------- current question and monster ---------
+    @property
+    def value(self):
+        return self.question_entry[0]
+
+    @property
+    def value_text(self):
+        return self.question_entry[1]
+
+    @property
+    def prev_conversion_type(self):
+        # The type of the question on screen is the one the next draw alternates from
+        return self.conversion_type
+
+    @property
+    def monster_max_hp(self):
+        return int(self.base_monster_hp * (1.25 ** (self.level - 1)))
+
+    @property
+    def hero_damage(self):
+        # +2 on every third level
+        return self.base_hero_damage + 2 * (self.level // 3)
+
+    @property
+    def current_question(self):
+        return self.template.format(val=self.value_text)
+
+    @property
+    def current_value_key(self):
+        return f"{self.conversion_type}:{self.value_text}" if self.conversion_type else ""
+
+    @property
+    def current_answer(self):
+        if self.conversion_type == "km_to_m":
+            return self.value * 1000
+        return self.value / 1000
+
+    @property
+    def current_unit_from(self):
+        return {"km_to_m": "km", "m_to_km": "m"}.get(self.conversion_type, "")
+
+    @property
+    def current_unit_to(self):
+        return {"km_to_m": "m", "m_to_km": "km"}.get(self.conversion_type, "")
+
+    @property
+    def current_monster(self):
+        return self.MONSTER_TYPES[self.monster_index]
+
+    def draw_monster(self):
+        # Each level's monster comes from its own generator, like each question
+        return random.Random(f"monster/{self.seed}/{self.level}").randrange(len(self.MONSTER_TYPES))
+
+    # --------- number helpers (shared with the other games) ---------
+    round_sig = staticmethod(quiz_logic.round_sig)
+    format_number = staticmethod(quiz_logic.format_number)
+
+    # --------- question generation ---------
+    def get_difficulty_ranges(self):
+        return quiz_logic.difficulty_ranges(self.difficulty_level)
+
+    def pick_conversion_type(self):
+        choices = ["km_to_m", "m_to_km"]
+        if self.prev_conversion_type in choices:
+            other = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
+            return other if self.rng.random() >= self.SAME_DIRECTION_CHANCE else self.prev_conversion_type
+        return self.rng.choice(choices)
+
+    def enumerate_sig_values(self, lo, hi, sig, multiple_of=None):
+        # Every number in [round_sig(lo), round_sig(hi)] written with exactly `sig` significant figures
+        lo = self.round_sig(lo, sig)
+        hi = self.round_sig(hi, sig)
+        values = []
+        for exp in range(math.floor(math.log10(lo)), math.floor(math.log10(hi)) + 1):
+            shift = exp - sig + 1
+            for mantissa in range(10 ** (sig - 1), 10 ** sig):
+                value = float(f"{mantissa}e{shift}")
+                if value < lo:
+                    continue
+                if value > hi:
+                    break
+                if multiple_of is not None and value % multiple_of:
+                    continue
+                values.append(value)
+        return values
+
+    def get_question_pool(self, conversion_type, sig_figs, round_only=False):
+        key = (self.difficulty_level, sig_figs, conversion_type, round_only)
+        pool = self._question_pools.get(key)
+        if pool is None:
+            km_range, m_range = self.get_difficulty_ranges()
+            if conversion_type == "km_to_m":
+                values = self.enumerate_sig_values(*km_range, sig_figs, 10 if round_only else None)
+            else:
+                values = self.enumerate_sig_values(*m_range, sig_figs, 1000 if round_only else None)
+            if not values:
+                return self.get_question_pool(conversion_type, sig_figs)
+            # Keep each value with its display text and recent-window tag so draws never re-format numbers
+            entries = tuple(
+                (value, text, question_tag(f"{conversion_type}:{text}"))
+                for value, text in ((value, self.format_number(value)) for value in values)
+            )
+            lo, hi = km_range if conversion_type == "km_to_m" else m_range
+            pool = {"type": conversion_type, "entries": entries, "cum_weights": self.range_weights(values, lo, hi)}
+            self._question_pools[key] = pool
+        return pool
+
+    def range_weights(self, values, lo, hi):
+        # Cumulative share of [lo, hi] that rounds to each value: the original drew a uniform
+        # number from the range and rounded it, so wide-rounding values came up more often
+        bounds = [lo] + [(a + b) / 2 for a, b in zip(values, values[1:])] + [hi]
+        cum_weights = []
+        total = 0.0
+        for low, high in zip(bounds, bounds[1:]):
+            total += max(min(high, hi) - max(low, lo), 0.0)
+            cum_weights.append(total)
+        return tuple(cum_weights)
+
+    def draw_value(self, pool):
+        # Range-weighted picks until one is not in the recent window, so every value keeps its
+        # share; after MAX_DRAWS misses the last pick is used even though it is recent
+        entries = pool["entries"]
+        cum_weights = pool["cum_weights"]
+        total = cum_weights[-1]
+        last = len(entries) - 1
+        random_ = self.rng.random
+        for _ in range(self.MAX_DRAWS):
+            entry = entries[min(bisect(cum_weights, random_() * total), last)]
+            if not self.is_recent(entry[2]):
+                break
+        return entry
+
+    def draw_question(self, force_type=None):
+        """(conversion_type, sig_figs, pool entry, template) for the next question."""
+        conversion_type = force_type if force_type is not None else self.pick_conversion_type()
+        random_ = self.rng.random
+        sig_figs = self.SIG_FIG_TABLE[int(random_() * len(self.SIG_FIG_TABLE))]
+        # Same "nice round number" preference as before, drawn from the round-only pool
+        if conversion_type == "km_to_m":
+            round_only = random_() < 0.3 and sig_figs <= 2
+        else:
+            round_only = random_() < 0.25 and sig_figs <= 3
+        pool = self.get_question_pool(conversion_type, sig_figs, round_only)
+        entry = self.draw_value(pool)
+        templates = self.KM_TEMPLATES if conversion_type == "km_to_m" else self.M_TEMPLATES
+        return conversion_type, sig_figs, entry, self.rng.choice(templates)
+
+    def build_question(self, conversion_type, sig_figs, entry, template):
+        value, value_text, _ = entry
+        if conversion_type == "km_to_m":
+            correct_answer = value * 1000
+            unit_from, unit_to = "km", "m"
+        else:
+            correct_answer = value / 1000
+            unit_from, unit_to = "m", "km"
+        question = template.format(val=value_text)
+        value_key = f"{conversion_type}:{value_text}"
+        key = quiz_logic.km_answer_key(conversion_type, value_text, sig_figs)
+        return question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key, key
+
+    def generate_question_once(self, force_type=None):
+        return self.build_question(*self.draw_question(force_type))
+
+    def generate_question(self):
+        return self.generate_question_once()
+
+    def remember_question(self, value_key):
+        self.remember_tag(question_tag(value_key))
+
+    def is_recent(self, tag):
+        # Only matches that start on a tag boundary count, not ones straddling two tags
+        recent = self.recent
+        i = recent.find(tag)
+        while i != -1 and i % TAG_SIZE:
+            i = recent.find(tag, i + 1)
+        return i != -1
+
+    def remember_tag(self, tag):
+        # Drop the oldest tag, append the newest
+        self.recent = self.recent[TAG_SIZE:] + tag
+
+    def new_question(self):
+        """Move to the next question. Returns +1/-1 if difficulty changed, else 0."""
+        self.rng = quiz_logic.question_rng(self.seed, self.questions_drawn)
+        (self.conversion_type,
+         self.current_sigfigs,
+         self.question_entry,
+         self.template) = self.draw_question()
+        self.rng = None
+        self.questions_drawn += 1
+        self.current_key = quiz_logic.km_answer_key(self.conversion_type, self.value_text, self.current_sigfigs)
+        self.question_answered = False
+        self.hint_used = False
+        self.remember_tag(self.question_entry[2])
+
+        old_level = self.difficulty_level
+        self.difficulty_level = quiz_logic.adjust_difficulty(old_level, self.score, self.total_questions)
+        return self.difficulty_level - old_level
+
+    def use_hint(self):
+        """The hint for the current question, or None if it was already given."""
+        if self.hint_used:
+            return None
+        self.hint_used = True
+        self.hints_used += 1
+        if self.current_unit_to == "m":
+            return "💡 To convert km → m: multiply by 1000"
+        return "💡 To convert m → km: divide by 1000"
+
+    # --------- checking logic ---------
+    # Forbid padded zeros like 3.0, 2.50, 0005
+    has_unnecessary_zeros = staticmethod(quiz_logic.has_unnecessary_zeros)
+    tolerance_from_sigfigs = staticmethod(quiz_logic.tolerance_from_sigfigs)
+
+    def submit(self, answer):
+        """Grade one answer and apply the battle result.
+
+        Returns a dict whose "status" is one of "answered" (the question
+        already had its turn), "empty", "zeros", "invalid" (nothing changed)
+        or "correct" / "wrong" (a turn was played). For "zeros", "violation"
+        says which padding was found (see AnswerScan).
+        """
+        if self.question_answered:
+            return {"status": "answered"}
+        user_input = answer.strip()
+        scan = quiz_logic.scan_answer(user_input)
+        status, _ = quiz_logic.grade_scan(scan, self.current_key, forbid_zeros=True)
+        if status == "zeros":
+            return {"status": status, "violation": scan.violation}
+        if status not in ("correct", "wrong"):
+            return {"status": status}
+
+        is_correct = status == "correct"
+        dmg = self.apply_result(is_correct)
+
+        return {
+            "status": "correct" if is_correct else "wrong",
+            "input": user_input,
+            "damage": dmg,
+            "monster_defeated": self.monster_hp <= 0,
+            "hero_defeated": self.monster_hp > 0 and self.hero_hp <= 0,
+        }
+
+    # --------- battle rules ---------
+    def apply_result(self, is_correct):
+        """Play one turn for a graded answer. Returns the damage dealt."""
+        self.question_answered = True
+        self.total_questions += 1
+        if is_correct:
+            self.score += 1
+            self.streak += 1
+            if self.streak > self.best_streak:
+                self.best_streak = self.streak
+            dmg = self.calculate_hero_damage()
+            self.monster_hp = max(0, self.monster_hp - dmg)
+        else:
+            self.streak = 0
+            dmg = self.calculate_monster_damage()
+            self.hero_hp = max(0, self.hero_hp - dmg)
+        return dmg
+
+    def calculate_hero_damage(self):
+        return self.hero_damage + (self.level - 1) * 2 + min(self.streak, 5)
+
+    def calculate_monster_damage(self):
+        return self.monster_damage + (self.level - 1) * 2
+
+    def next_monster(self):
+        """Level up after a victory: stronger monster, small heal. Returns HP healed."""
+        self.level += 1
+        self.monster_hp = self.monster_max_hp
+        self.monster_index = self.draw_monster()
+
+        heal = self.HEAL_ON_VICTORY
+        self.hero_hp = min(self.hero_max_hp, self.hero_hp + heal)
+        return heal
+
+    @property
+    def accuracy(self):
+        return (self.score / self.total_questions * 100) if self.total_questions else 0
+
+    # --------- save / resume ---------
+    def snapshot(self):
+        """The whole game as SNAPSHOT_STRUCT bytes plus a CRC32.
+
+        Generators are not saved: they are derived from the seed, the
+        questions drawn and the level, so those restore them exactly.
+        """
+        conversions = quiz_logic.CONVERSIONS
+        if self.conversion_type is None:
+            conversion = template = NO_INDEX
+        else:
+            conversion = conversions.index(self.conversion_type)
+            templates = self.KM_TEMPLATES if self.conversion_type == "km_to_m" else self.M_TEMPLATES
+            template = templates.index(self.template)
+        body = SNAPSHOT_STRUCT.pack(
+            SNAPSHOT_VERSION, self.seed, self.questions_drawn, self.score, self.total_questions,
+            conversion, self.current_sigfigs, self.value_text.encode('utf-8'), template,
+            (ANSWERED if self.question_answered else 0) | (HINT_USED if self.hint_used else 0),
+            self.recent, self.streak, self.best_streak, self.hints_used,
+            self.difficulty_level, self.level, self.hero_hp, self.monster_hp, self.monster_index,
+        )
+        return body + SNAPSHOT_CRC.pack(zlib.crc32(body))
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Engine restored from snapshot() bytes. Raises ValueError if they are damaged or from another version."""
+        if len(data) != SNAPSHOT_STRUCT.size + SNAPSHOT_CRC.size:
+            raise ValueError(f"snapshot is {len(data)} bytes, expected {SNAPSHOT_STRUCT.size + SNAPSHOT_CRC.size}")
+        body = data[:SNAPSHOT_STRUCT.size]
+        if SNAPSHOT_CRC.unpack_from(data, SNAPSHOT_STRUCT.size)[0] != zlib.crc32(body):
+            raise ValueError("snapshot checksum mismatch")
+        fields = SNAPSHOT_STRUCT.unpack(body)
+        if fields[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"snapshot version {fields[0]} is not supported")
+        (_, seed, questions_drawn, score, total_questions,
+         conversion, sig_figs, value_text, template, flags, recent,
+         streak, best_streak, hints_used, difficulty_level, level, hero_hp,
+         monster_hp, monster_index) = fields
+
+        engine = cls.__new__(cls)
+        engine.seed = seed
+        engine.rng = None
+        engine.questions_drawn = questions_drawn
+        engine.score = score
+        engine.total_questions = total_questions
+        engine.current_sigfigs = sig_figs
+        if conversion == NO_INDEX:
+            engine.conversion_type = None
+            engine.question_entry = cls.NO_ENTRY
+            engine.template = ""
+            engine.current_key = None
+        else:
+            engine.conversion_type = quiz_logic.CONVERSIONS[conversion]
+            text = value_text.rstrip(b"\0").decode('utf-8')
+            engine.question_entry = (float(text), text, question_tag(f"{engine.conversion_type}:{text}"))
+            templates = cls.KM_TEMPLATES if engine.conversion_type == "km_to_m" else cls.M_TEMPLATES
+            engine.template = templates[template]
+            engine.current_key = quiz_logic.km_answer_key(engine.conversion_type, text, sig_figs)
+        engine.question_answered = bool(flags & ANSWERED)
+        engine.hint_used = bool(flags & HINT_USED)
+        engine.recent = recent
+
+        engine.streak = streak
+        engine.best_streak = best_streak
+        engine.hints_used = hints_used
+        engine.difficulty_level = difficulty_level
+
+        engine.level = level
+        engine.hero_hp = hero_hp
+        engine.monster_hp = monster_hp
+        engine.monster_index = monster_index
+        return engine
+
+
+def question_tag(value_key):
+    return zlib.crc32(value_key.encode('utf-8')).to_bytes(TAG_SIZE, 'little')
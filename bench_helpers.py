@@ -0,0 +1,254 @@
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from collections import deque
+
+import quiz_logic
+
+# (name, module, class) for every copy of the game helpers. Classes are
+# created with __new__ so no Tk window is opened.
+VARIANTS = [
+    ("andre", "andre", "KidsConversionGame"),
+    ("andre_v2", "andre_v2", "KidsConversionGame"),
+    ("hero_monster", "hero_monster", "KidsConversionGame"),
+    ("hero_monster_v2", "hero_monster_v2", "BattleConverterGame"),
+    ("hero_monster_v3", "battle_engine", "BattleEngine"),
+    ("rocket", "rocket", "RocketLaunchGame"),
+    ("division_quiz", "division_quiz", "DivisionQuizApp"),
+    ("division_quiz02", "division_quiz02", "DivisionQuizApp"),
+]
+
+HELPERS = ("round_sig", "format_number", "tolerance_from_sigfigs", "has_unnecessary_zeros",
+           "generate_question_once", "generate_question", "generate_mission", "is_answer_correct")
+
+# Variants that draw every question from its own quiz_logic.question_rng(seed, n)
+PER_QUESTION_RNG = ("hero_monster_v3", "rocket", "division_quiz02")
+
+HISTORY_FILE = "bench_history.json"
+REGRESSION = 1.25
+
+
+def make_instance(cls):
+    """Instance with just the state the helpers read, without running __init__."""
+    if hasattr(cls, "__slots__"):
+        # Slotted classes (BattleEngine) open no window, so they are built normally
+        return cls(seed=0)
+    obj = cls.__new__(cls)
+    obj.seed = 0
+    obj.difficulty_level = 1
+    obj.prev_conversion_type = None
+    obj.recent_q = deque(maxlen=20)
+    obj.current_value_key = None
+    # Games draw from their own rng; point it at the module so random.seed() still pins each run
+    obj.rng = random
+    return obj
+
+
+def make_inputs(seed, size):
+    rng = random.Random(seed)
+    numbers = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.3:
+            numbers.append(float(rng.randint(1, 50000)))
+        elif kind < 0.6:
+            numbers.append(round(rng.uniform(0.001, 999), rng.randint(1, 4)))
+        else:
+            numbers.append(rng.uniform(0.5, 50000))
+    sigs = [rng.randint(1, 4) for _ in range(size)]
+    answers = ["3.0", "2.50", "0005", "12", "0.5", "1200", "0.050", "007.5", "45.25", "-3.10"]
+    strings = [rng.choice(answers) for _ in range(size)]
+    targets = [rng.choice([0.0, 1.5, 2500.0, 0.125, 3.75]) for _ in range(size)]
+    guesses = [t if rng.random() < 0.5 else t * rng.choice([10, 0.1, 1.0000001]) for t in targets]
+    return {
+        "numbers": numbers,
+        "pairs": list(zip(numbers, sigs)),
+        "strings": strings,
+        "answer_pairs": list(zip(guesses, targets)),
+    }
+
+
+def next_question(obj):
+    # The bookkeeping new_question() does between generate_question() calls
+    q = obj.generate_question()
+    if len(q) >= 7:
+        obj.prev_conversion_type = q[5]
+        if hasattr(obj, "remember_question"):
+            obj.remember_question(q[6])
+        else:
+            obj.recent_q.append(q[6])
+
+
+def build_case(cls, helper, inputs, per_question_rng=False):
+    """Return (case(obj) running `helper` once over the inputs, calls per run), or (None, 0).
+
+    With per_question_rng, each generator call first derives its question's
+    rng the way the game does, so that cost is timed too.
+    """
+    if not hasattr(cls, helper):
+        return None, 0
+    if helper == "round_sig":
+        def case(obj):
+            f = obj.round_sig
+            for x, sig in inputs["pairs"]:
+                f(x, sig)
+        return case, len(inputs["pairs"])
+    if helper == "format_number":
+        def case(obj):
+            f = obj.format_number
+            for x in inputs["numbers"]:
+                f(x)
+        return case, len(inputs["numbers"])
+    if helper == "tolerance_from_sigfigs":
+        def case(obj):
+            f = obj.tolerance_from_sigfigs
+            for x, sig in inputs["pairs"]:
+                f(x, sig)
+        return case, len(inputs["pairs"])
+    if helper == "has_unnecessary_zeros":
+        def case(obj):
+            f = obj.has_unnecessary_zeros
+            for s in inputs["strings"]:
+                f(s)
+        return case, len(inputs["strings"])
+    if helper == "is_answer_correct":
+        def case(obj):
+            f = obj.is_answer_correct
+            for guess, target in inputs["answer_pairs"]:
+                f(guess, target)
+        return case, len(inputs["answer_pairs"])
+    calls = len(inputs["numbers"]) // 10
+    if helper == "generate_question" and hasattr(cls, "remember_question"):
+        # BattleEngine: the new_question() the game calls, generator, answer key and difficulty included
+        def case(obj):
+            f = obj.new_question
+            for _ in range(calls):
+                f()
+        return case, calls
+    if helper in ("generate_question_once", "generate_question", "generate_mission"):
+        if per_question_rng:
+            def case(obj):
+                f = getattr(obj, helper) if helper != "generate_question" else lambda: next_question(obj)
+                question_rng = quiz_logic.question_rng
+                for n in range(calls):
+                    obj.rng = question_rng(obj.seed, n)
+                    f()
+        else:
+            def case(obj):
+                f = getattr(obj, helper) if helper != "generate_question" else lambda: next_question(obj)
+                for _ in range(calls):
+                    f()
+        return case, calls
+    return None, 0
+
+
+def time_case(cls, case, calls, seed, repeat):
+    """Best-of-`repeat` nanoseconds per call, each run from the same seed and fresh state."""
+    # Warm-up run; also builds class-level caches such as the BattleEngine pools
+    obj = make_instance(cls)
+    random.seed(seed)
+    case(obj)
+    best = None
+    for _ in range(repeat):
+        obj = make_instance(cls)
+        random.seed(seed)
+        start = time.perf_counter_ns()
+        case(obj)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / calls
+
+
+def run(seed=1234, size=2000, repeat=5, only=None):
+    inputs = make_inputs(seed, size)
+    results = {}
+    skipped = {}
+    for name, module_name, class_name in VARIANTS:
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except ImportError as e:
+            skipped[name] = str(e)
+            continue
+        for helper in HELPERS:
+            if only and helper not in only:
+                continue
+            case, calls = build_case(cls, helper, inputs, name in PER_QUESTION_RNG)
+            if case is None:
+                continue
+            try:
+                ns = time_case(cls, case, calls, seed, repeat)
+            except Exception as e:
+                skipped[f"{name}.{helper}"] = f"{type(e).__name__}: {e}"
+                continue
+            results.setdefault(helper, {})[name] = round(ns, 1)
+    return results, skipped
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_results(results, previous=None):
+    for helper, timings in results.items():
+        fastest = min(timings, key=timings.get)
+        print(f"=== {helper} ===")
+        for name, ns in sorted(timings.items(), key=lambda item: item[1]):
+            note = " ← fastest" if name == fastest else ""
+            old = (previous or {}).get(helper, {}).get(name)
+            if old and ns > old * REGRESSION:
+                note += f" ⚠️ was {old:.0f} ns"
+            print(f"  {name:<18} {ns:>12.1f} ns/call{note}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the numeric helpers of every game version.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--size", type=int, default=2000, help="inputs per helper")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", choices=HELPERS, help="helper to time (repeatable)")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    previous = history[-1]["results"] if history else None
+    results, skipped = run(args.seed, args.size, args.repeat, args.only)
+    print_results(results, previous)
+    for name, reason in skipped.items():
+        print(f"skipped {name}: {reason}")
+
+    if not args.no_save:
+        history.append({
+            "when": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "size": args.size,
+            "repeat": args.repeat,
+            "results": results,
+        })
+        with open(args.history, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
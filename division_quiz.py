@@ -1,12 +1,16 @@
 import tkinter as tk
-import random
 import csv
 import os
+import time
 from datetime import datetime
 
+import quiz_logic
+from attempt_logger import AttemptLogger
+from log_records import make_record, to_jsonl
+
 
 class DivisionQuizApp:
-    def __init__(self, master):
+    def __init__(self, master, seed=None):
         self.master = master
         self.master.title("Division Quiz – 2–12 Times Tables")
         self.master.configure(bg="#f0f8ff")  # light blue-ish background
@@ -15,16 +19,25 @@ class DivisionQuizApp:
         self.current_dividend = None
         self.current_divisor = None
         self.current_answer = None
+        self.current_key = None
         self.score = 0
         self.questions_asked = 0            # how many questions have been shown
         self.questions_answered = 0         # how many questions the child actually answered (valid numeric)
         self.answered_correctly_this_question = False
         self.answered_this_question = False  # at least one valid numeric answer given
         self.attempts_for_current_question = 0
+        self.streak = 0                     # correct answers in a row, for the attempt records
+        # Question n comes from question_rng(seed, n), as in division_quiz02
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.rng = None
 
         # Logging
         self.log_file = "division_quiz_log.csv"
         self.init_log_file()
+        self.log_session_seed()
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.question_shown_at = time.monotonic()
+        self.master.protocol("WM_DELETE_WINDOW", self.close_window)
 
         # ---------- Fonts ----------
         self.title_font = ("Arial", 22, "bold")
@@ -178,6 +191,12 @@ class DivisionQuizApp:
                     "score_so_far"
                 ])
 
+    def log_session_seed(self):
+        """Note the session seed as a short row, which the CSV readers skip."""
+        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+        with open(self.log_file, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([timestamp, f"Session seed: {self.seed}"])
+
     def log_attempt(self, user_input, valid_input, is_correct):
         """
         Log a single attempt to CSV.
@@ -209,6 +228,14 @@ class DivisionQuizApp:
                 self.score
             ])
 
+        record = make_record(
+            "division", "div", f"{self.current_dividend}/{self.current_divisor}", self.current_answer,
+            user_input, is_correct, streak=self.streak,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.seed,
+            question=self.questions_asked - 1
+        )
+        self.record_logger.log(to_jsonl(record))
+
     # ---------- Game logic ----------
 
     def generate_question(self, min_factor=2, max_factor=12):
@@ -222,16 +249,15 @@ class DivisionQuizApp:
 
         So question is: dividend ÷ divisor = ?
         """
-        a = random.randint(min_factor, max_factor)
-        b = random.randint(min_factor, max_factor)
-        dividend = a * b
-        divisor = b
-        answer = a
-        return dividend, divisor, answer
+        return quiz_logic.generate_division(min_factor, max_factor, self.rng)
 
     def new_question(self):
+        self.rng = quiz_logic.question_rng(self.seed, self.questions_asked)
         self.current_dividend, self.current_divisor, self.current_answer = self.generate_question()
+        self.rng = None
+        self.current_key = quiz_logic.whole_number_key(self.current_answer)
         self.questions_asked += 1
+        self.question_shown_at = time.monotonic()
         self.answered_correctly_this_question = False
         self.answered_this_question = False
         self.attempts_for_current_question = 0
@@ -265,9 +291,10 @@ class DivisionQuizApp:
 
     def check_answer(self):
         user_input = self.answer_entry.get().strip()
+        status, user_answer = quiz_logic.grade(user_input, self.current_key)
 
         # Empty input → not counted as attempt, no log
-        if not user_input:
+        if status == "empty":
             self.feedback_label.config(
                 text="Please type an answer first.",
                 fg="red"
@@ -279,7 +306,7 @@ class DivisionQuizApp:
         self.attempts_for_current_question += 1
 
         # Non-numeric input → log as invalid attempt
-        if not user_input.isdigit():
+        if status == "invalid":
             self.feedback_label.config(
                 text="Please enter a whole number.",
                 fg="red"
@@ -288,17 +315,16 @@ class DivisionQuizApp:
             self.log_attempt(user_input=user_input, valid_input=False, is_correct=None)
             return
 
-        user_answer = int(user_input)
-
         # First valid numeric answer for this question → count it as "answered"
         if not self.answered_this_question:
             self.questions_answered += 1
             self.answered_this_question = True
 
-        if user_answer == self.current_answer:
+        if status == "correct":
             # Only count the first correct attempt for this question toward score
             if not self.answered_correctly_this_question:
                 self.score += 1
+                self.streak += 1
                 self.answered_correctly_this_question = True
 
             self.feedback_label.config(
@@ -311,6 +337,7 @@ class DivisionQuizApp:
             # Log correct attempt
             self.log_attempt(user_input=user_input, valid_input=True, is_correct=True)
         else:
+            self.streak = 0
             self.feedback_label.config(
                 text="❌ Not quite. Try again!",
                 fg="red"
@@ -323,6 +350,11 @@ class DivisionQuizApp:
 
         self.update_score_label()
 
+    def close_window(self):
+        """Flush the attempt records and close the window"""
+        self.record_logger.close()
+        self.master.destroy()
+
 
 def main():
     root = tk.Tk()
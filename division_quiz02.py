@@ -1,14 +1,19 @@
 import tkinter as tk
-import random
 import csv
 import os
+import time
 from datetime import datetime
 from tkinter import scrolledtext
 
+import quiz_logic
+from attempt_logger import AttemptLogger
+from log_records import make_record, to_jsonl
+
 
 class DivisionQuizApp:
-    def __init__(self, master):
+    def __init__(self, master, on_exit=None, seed=None):
         self.master = master
+        self.on_exit = on_exit  # set when the launcher hosts the quiz
         self.master.title("🎮 Division Quiz Adventure! 🌟")
         self.master.geometry("900x800")
         
@@ -19,6 +24,7 @@ class DivisionQuizApp:
         self.current_dividend = None
         self.current_divisor = None
         self.current_answer = None
+        self.current_key = None
         self.score = 0
         self.questions_asked = 0
         self.questions_answered = 0
@@ -27,10 +33,18 @@ class DivisionQuizApp:
         self.streak = 0  # Track correct answers in a row
         self.session_start_time = datetime.now()
         self.attempts_for_current_question = 0
+        # Question n comes from question_rng(seed, n) (seed is in the CSV and .jsonl records); cheers from self.fx_rng
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.rng = None
+        self.fx_rng = quiz_logic.effects_rng(self.seed)
         
         # Logging to CSV file
         self.log_file = "division_quiz_log.csv"
         self.init_log_file()
+        self.log_session_seed()
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.question_shown_at = time.monotonic()
+        self.master.protocol("WM_DELETE_WINDOW", self.close_window)
         
         # Activity log for display
         self.activity_log = []
@@ -311,12 +325,7 @@ class DivisionQuizApp:
 
         So question is: dividend ÷ divisor = ?
         """
-        a = random.randint(min_factor, max_factor)
-        b = random.randint(min_factor, max_factor)
-        dividend = a * b
-        divisor = b
-        answer = a
-        return dividend, divisor, answer
+        return quiz_logic.generate_division(min_factor, max_factor, self.rng)
 
     def animate_correct(self):
         """Create a celebration animation for correct answers"""
@@ -374,6 +383,12 @@ class DivisionQuizApp:
                     "streak"
                 ])
 
+    def log_session_seed(self):
+        """Note the session seed as a short row, which the CSV readers skip."""
+        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+        with open(self.log_file, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([timestamp, f"Session seed: {self.seed}"])
+
     def log_attempt_to_csv(self, user_input, valid_input, is_correct):
         """
         Log a single attempt to CSV file.
@@ -406,6 +421,14 @@ class DivisionQuizApp:
                 self.streak
             ])
 
+        record = make_record(
+            "division", "div", f"{self.current_dividend}/{self.current_divisor}", self.current_answer,
+            user_input, is_correct, streak=self.streak,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.seed,
+            question=self.questions_asked - 1
+        )
+        self.record_logger.log(to_jsonl(record))
+
     def add_to_log(self, message):
         """Add a message to the activity log display"""
         self.log_text.config(state=tk.NORMAL)
@@ -480,11 +503,14 @@ class DivisionQuizApp:
             )
 
     def new_question(self):
+        self.rng = quiz_logic.question_rng(self.seed, self.questions_asked)
         self.current_dividend, self.current_divisor, self.current_answer = self.generate_question()
+        self.current_key = quiz_logic.whole_number_key(self.current_answer)
         self.questions_asked += 1
         self.answered_correctly_this_question = False
         self.answered_this_question = False
         self.attempts_for_current_question = 0
+        self.question_shown_at = time.monotonic()
 
         # Update question display
         self.question_number_label.config(text=f"Question: {self.questions_asked}")
@@ -523,9 +549,10 @@ class DivisionQuizApp:
 
     def check_answer(self):
         user_input = self.answer_entry.get().strip()
+        status, user_answer = quiz_logic.grade(user_input, self.current_key)
 
         # Empty input → not counted as attempt, no log
-        if not user_input:
+        if status == "empty":
             self.feedback_label.config(
                 text="⚠️ Please type an answer first!",
                 fg="#FF4500",
@@ -538,7 +565,7 @@ class DivisionQuizApp:
         self.attempts_for_current_question += 1
 
         # Non-numeric input → log as invalid attempt
-        if not user_input.isdigit():
+        if status == "invalid":
             self.feedback_label.config(
                 text="⚠️ Please enter a whole number!",
                 fg="#FF4500",
@@ -549,8 +576,6 @@ class DivisionQuizApp:
             self.log_attempt_to_csv(user_input=user_input, valid_input=False, is_correct=None)
             return
 
-        user_answer = int(user_input)
-        
         # Determine if this is the first attempt for this question
         is_first_attempt = not self.answered_this_question
 
@@ -562,7 +587,7 @@ class DivisionQuizApp:
         # Create question string for logging
         question_str = f"{self.current_dividend} ÷ {self.current_divisor} = ?"
 
-        if user_answer == self.current_answer:
+        if status == "correct":
             # Only count the first correct attempt for this question toward score
             if not self.answered_correctly_this_question:
                 self.score += 1
@@ -576,7 +601,7 @@ class DivisionQuizApp:
             self.log_attempt_to_display(question_str, user_answer, self.current_answer, True, is_first_attempt)
             
             # Random encouraging message
-            message = random.choice(self.correct_messages)
+            message = self.fx_rng.choice(self.correct_messages)
             
             # Extra praise for streaks
             streak_bonus = ""
@@ -606,7 +631,7 @@ class DivisionQuizApp:
             # Log to display
             self.log_attempt_to_display(question_str, user_answer, self.current_answer, False, is_first_attempt)
             
-            message = random.choice(self.try_again_messages)
+            message = self.fx_rng.choice(self.try_again_messages)
             self.feedback_label.config(
                 text=f"{message}",
                 fg="#DC143C",
@@ -617,6 +642,14 @@ class DivisionQuizApp:
 
         self.update_score_label()
 
+    def close_window(self):
+        """Flush the attempt records and close the window (or go back to the launcher)"""
+        self.record_logger.close()
+        if self.on_exit is not None:
+            self.on_exit()
+        else:
+            self.master.destroy()
+
 
 def main():
     root = tk.Tk()
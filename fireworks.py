@@ -0,0 +1,148 @@
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to plain lists
+    np = None
+
+MAX_FIREWORKS = 1500
+GRAVITY = 0.3
+COLORS = ('red', 'yellow', 'green', 'blue', 'purple', 'orange', 'pink')
+
+
+class Fireworks:
+    """Firework sparks stored as struct-of-arrays and drawn with a pool of ovals.
+
+    Slot i of x/y/vx/vy/life is always drawn by oval i. Gravity and life
+    decay are applied to every slot at once (vectorised when numpy is
+    installed), dead sparks are hidden rather than deleted and their slots
+    are reused by the next burst. When every slot is busy the sparks closest
+    to burning out are replaced.
+    """
+
+    def __init__(self, canvas, max_particles=MAX_FIREWORKS, use_numpy=True, rng=random):
+        self.canvas = canvas
+        self.rng = rng
+        self.max_particles = max_particles
+        self.np = np if use_numpy else None
+        self.items = []
+        if self.np is not None:
+            self.x = self.np.zeros(max_particles)
+            self.y = self.np.zeros(max_particles)
+            self.vx = self.np.zeros(max_particles)
+            self.vy = self.np.zeros(max_particles)
+            self.life = self.np.zeros(max_particles)
+        else:
+            self.x = [0.0] * max_particles
+            self.y = [0.0] * max_particles
+            self.vx = [0.0] * max_particles
+            self.vy = [0.0] * max_particles
+            self.life = [0.0] * max_particles
+        self.visible = [False] * max_particles
+        self.count = 0
+
+    def reset(self):
+        """Forget the pool after the canvas was cleared with delete('all')"""
+        self.items = []
+        for i in range(self.max_particles):
+            self.life[i] = 0.0
+            self.visible[i] = False
+        self.count = 0
+
+    def burst(self, x, y, count=12, colors=COLORS, speed=(3, 8), life=(20, 40)):
+        slots = self.free_slots(count)
+        for slot in slots:
+            angle = self.rng.uniform(0, 2 * math.pi)
+            velocity = self.rng.uniform(*speed)
+            self.x[slot] = x
+            self.y[slot] = y
+            self.vx[slot] = math.cos(angle) * velocity
+            self.vy[slot] = math.sin(angle) * velocity
+            self.life[slot] = self.rng.randint(*life)
+            color = self.rng.choice(colors)
+            self.canvas.itemconfig(self.items[slot], fill=color, outline=color)
+            self.visible[slot] = False  # shown by the next draw()
+        self.count = self.live_count()
+
+    def free_slots(self, count):
+        count = min(count, self.max_particles)
+        while len(self.items) < self.max_particles and len(self.items) < self.count + count:
+            self.items.append(self.canvas.create_oval(0, 0, 0, 0, tags="fireworks", state='hidden'))
+        usable = len(self.items)
+        if self.np is not None:
+            life = self.life[:usable]
+            free = self.np.flatnonzero(life <= 0)
+            if len(free) < count:
+                # Pool full: replace the sparks with the least life left
+                free = self.np.argsort(life)
+            return free[:count].tolist()
+        free = [i for i in range(usable) if self.life[i] <= 0]
+        if len(free) < count:
+            free = sorted(range(usable), key=self.life.__getitem__)
+        return free[:count]
+
+    def live_count(self):
+        if self.np is not None:
+            return int(self.np.count_nonzero(self.life > 0))
+        return sum(1 for value in self.life if value > 0)
+
+    def step(self, steps=1.0):
+        """Apply one tick (or `steps` ticks) of motion, gravity and life decay to every spark"""
+        if self.np is not None:
+            alive = self.life > 0
+            self.x += self.vx * steps * alive
+            self.y += self.vy * steps * alive
+            self.vy += GRAVITY * steps * alive
+            self.life -= steps * alive
+            return
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        for i in range(len(self.items)):
+            if life[i] > 0:
+                x[i] += vx[i] * steps
+                y[i] += vy[i] * steps
+                vy[i] += GRAVITY * steps
+                life[i] -= steps
+
+    def draw(self):
+        canvas = self.canvas
+        items = self.items
+        visible = self.visible
+        used = len(items)
+        if self.np is not None:
+            life = self.life[:used]
+            size = self.np.maximum(1, life // 3)
+            left = (self.x[:used] - size).tolist()
+            top = (self.y[:used] - size).tolist()
+            right = (self.x[:used] + size).tolist()
+            bottom = (self.y[:used] + size).tolist()
+            alive = (life > 0).tolist()
+        else:
+            left, top, right, bottom, alive = [], [], [], [], []
+            for i in range(used):
+                size = max(1, self.life[i] // 3)
+                left.append(self.x[i] - size)
+                top.append(self.y[i] - size)
+                right.append(self.x[i] + size)
+                bottom.append(self.y[i] + size)
+                alive.append(self.life[i] > 0)
+        count = 0
+        for i in range(used):
+            if alive[i]:
+                canvas.coords(items[i], left[i], top[i], right[i], bottom[i])
+                if not visible[i]:
+                    canvas.itemconfig(items[i], state='normal')
+                    visible[i] = True
+                count += 1
+            elif visible[i]:
+                canvas.itemconfig(items[i], state='hidden')
+                visible[i] = False
+        self.count = count
+
+    def tick(self, steps=1.0):
+        """Advance and redraw; returns True while any spark is still burning"""
+        if not self.count:
+            return False
+        self.step(steps)
+        self.draw()
+        return self.count > 0
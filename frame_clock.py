@@ -0,0 +1,100 @@
+import itertools
+import time
+
+
+def ease_out(p):
+    return 1 - (1 - p) * (1 - p)
+
+
+class FrameClock:
+    """One after() per frame for every animation on a Tk window.
+
+    An animation is a step(dt_ms, elapsed_ms) callback; it keeps running
+    until it returns False or is cancelled by the handle add() returned.
+    Steps that don't fit in budget_ms are carried over to the next frame
+    (they still get the full dt since they last ran). The clock stops
+    scheduling frames when nothing is animating and restarts on add().
+    """
+
+    def __init__(self, widget, frame_ms=16, budget_ms=10, max_dt_ms=100):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.budget_ms = budget_ms
+        self.max_dt_ms = max_dt_ms
+        self.animations = {}
+        self.handles = itertools.count(1)
+        self.after_id = None
+        self.cursor = 0
+        self.last_frame_ms = 0.0
+
+    def add(self, step):
+        handle = next(self.handles)
+        now = time.perf_counter()
+        self.animations[handle] = [step, now, now]
+        self.start()
+        return handle
+
+    def tween(self, duration_ms, update, on_done=None, ease=None):
+        """Call update(progress) every frame with progress going 0 → 1 over duration_ms."""
+        def step(dt, elapsed):
+            p = min(1.0, elapsed / duration_ms) if duration_ms > 0 else 1.0
+            update(ease(p) if ease else p)
+            if p < 1.0:
+                return True
+            if on_done:
+                on_done()
+            return False
+        return self.add(step)
+
+    def delay(self, ms, callback):
+        """Run callback once after ms, on a frame (cancellable like any animation)."""
+        def step(dt, elapsed):
+            if elapsed < ms:
+                return True
+            callback()
+            return False
+        return self.add(step)
+
+    def cancel(self, handle):
+        if handle is not None:
+            self.animations.pop(handle, None)
+
+    def running(self, handle):
+        return handle in self.animations
+
+    def start(self):
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.frame_ms, self.frame)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.animations.clear()
+
+    def frame(self):
+        self.after_id = None
+        start = time.perf_counter()
+        handles = list(self.animations)
+        if handles:
+            # Begin where the last over-budget frame left off so nobody starves
+            self.cursor %= len(handles)
+            handles = handles[self.cursor:] + handles[:self.cursor]
+        ran = 0
+        for handle in handles:
+            animation = self.animations.get(handle)
+            if animation is None:
+                continue
+            if ran and (time.perf_counter() - start) * 1000 > self.budget_ms:
+                break
+            step, started, last = animation
+            now = time.perf_counter()
+            animation[2] = now
+            dt = min((now - last) * 1000, self.max_dt_ms)
+            if not step(dt, (now - started) * 1000):
+                self.animations.pop(handle, None)
+            ran += 1
+        self.cursor = (self.cursor + ran) % len(handles) if ran < len(handles) else 0
+        self.last_frame_ms = (time.perf_counter() - start) * 1000
+        if self.animations:
+            self.start()
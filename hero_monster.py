@@ -4,10 +4,15 @@ import random
 import datetime
 import os
 import math
+import time
 from collections import deque
 
+import quiz_logic
+from attempt_logger import AttemptLogger
+from log_records import make_record, to_jsonl
+
 class KidsConversionGame:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.root = tk.Tk()
         self.root.title("🚀 Distance Converter Adventure! 🌟")
         self.root.geometry("850x800")
@@ -18,12 +23,23 @@ class KidsConversionGame:
         self.total_questions = 0
         self.current_question = ""
         self.current_answer = 0.0
+        self.current_key = None
         self.current_unit_from = ""
         self.current_unit_to = ""
         self.current_sigfigs = 3
         self.prev_conversion_type = None
         self.recent_q = deque(maxlen=20)  # remember more recent questions
+        # Questions come from self.rng (seeded, logged); stars and cheers from self.fx_rng
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.fx_rng = quiz_logic.effects_rng(self.seed)
         self.log_file = "kids_conversion_log.txt"
+        self.logger = AttemptLogger(self.log_file)
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.logger.log(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Session seed: {self.seed}\n")
+        self.current_value_key = ""
+        self.question_shown_at = time.monotonic()
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
         
         # New interactive features
         self.streak = 0
@@ -43,7 +59,7 @@ class KidsConversionGame:
         self.hero_damage = 15
         self.monster_damage = 12
         self.monster_names = ["Slime", "Bat", "Lizard", "Goblin", "Golem", "Wyvern", "Hydra"]
-        self.current_monster_name = random.choice(self.monster_names)
+        self.current_monster_name = self.rng.choice(self.monster_names)
 
         # Colors
         self.colors = {
@@ -88,109 +104,32 @@ class KidsConversionGame:
     def create_stars(self):
         """Create random star positions for background animation"""
         for _ in range(25):
-            x = random.randint(50, 800)
-            y = random.randint(50, 700)
-            size = random.randint(1, 3)
-            self.star_positions.append([x, y, size, random.uniform(0, 2*math.pi)])
+            x = self.fx_rng.randint(50, 800)
+            y = self.fx_rng.randint(50, 700)
+            size = self.fx_rng.randint(1, 3)
+            self.star_positions.append([x, y, size, self.fx_rng.uniform(0, 2*math.pi)])
     
     # --------- number helpers ---------
     def round_sig(self, x, sig):
         """Round to a number of significant figures (1–4)."""
-        if x == 0:
-            return 0.0
-        if sig < 1:
-            sig = 1
-        if sig > 6:
-            sig = 6
-        return float(f"{x:.{sig}g}")
+        return quiz_logic.round_sig(x, sig)
 
     def format_number(self, num):
         """Format number (no trailing zeros; avoid sci-notation for our ranges)."""
-        if abs(num - int(num)) < 1e-12:
-            return str(int(num))
-        formatted = f"{num:.10f}".rstrip('0').rstrip('.')
-        return formatted
+        return quiz_logic.format_number(num)
     
     # --------- enhanced question generation ---------
     def get_difficulty_ranges(self):
         """Get value ranges based on current difficulty level"""
-        if self.difficulty_level == 1:
-            km_range = (1, 100)
-            m_range = (1000, 10000)
-        elif self.difficulty_level == 2:
-            km_range = (1, 500)
-            m_range = (1000, 30000)
-        else:
-            km_range = (0.5, 999)
-            m_range = (500, 50000)
-        return km_range, m_range
+        return quiz_logic.difficulty_ranges(self.difficulty_level)
     
     def generate_question_once(self, force_type=None):
         """Generate one candidate question with better variation."""
-        if force_type is not None:
-            conversion_type = force_type
-        else:
-            choices = ["km_to_m", "m_to_km"]
-            if self.prev_conversion_type in choices:
-                other = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-                conversion_type = random.choices([other, self.prev_conversion_type], weights=[0.85, 0.15])[0]
-            else:
-                conversion_type = random.choice(choices)
-
-        sig_figs = random.choices([1, 2, 3, 4], weights=[1, 3, 3, 2])[0]
-        km_range, m_range = self.get_difficulty_ranges()
-
-        km_templates = [
-            "🚀 The spaceship traveled {val} kilometers.\nHow many meters is that?",
-            "🌙 The moon rover drove {val} km across the surface.\nConvert to meters!",
-            "✈️ The airplane flew {val} kilometers.\nWhat's that in meters?",
-            "🏃 The marathon runner completed {val} km.\nHow many meters did they run?",
-            "🚂 The train traveled {val} kilometers.\nExpress this in meters!",
-            "🎈 The hot air balloon drifted {val} km.\nHow many meters is that?"
-        ]
-        m_templates = [
-            "🌟 The rocket flew {val} meters into the sky.\nHow many kilometers is that?",
-            "🏊 The swimmer completed {val} meters.\nConvert to kilometers!",
-            "🚴 The cyclist rode {val} meters.\nWhat's that in kilometers?",
-            "🎯 The arrow flew {val} meters.\nExpress this in kilometers!",
-            "🦘 The kangaroo hopped {val} meters total.\nHow many km did it hop?",
-            "⛷️ The skier descended {val} meters.\nConvert to kilometers!"
-        ]
-
-        if conversion_type == "km_to_m":
-            raw = random.uniform(*km_range)
-            if random.random() < 0.3 and sig_figs <= 2:
-                raw = round(raw / 10) * 10
-            km_value = self.round_sig(raw, sig_figs)
-            template = random.choice(km_templates)
-            question = template.format(val=self.format_number(km_value))
-            correct_answer = km_value * 1000
-            unit_from, unit_to = "km", "m"
-            value_key = f"{conversion_type}:{self.format_number(km_value)}"
-        else:  # m_to_km
-            raw = random.uniform(*m_range)
-            if random.random() < 0.25 and sig_figs <= 3:
-                raw = round(raw / 1000) * 1000
-            m_value = self.round_sig(raw, sig_figs)
-            template = random.choice(m_templates)
-            question = template.format(val=self.format_number(m_value))
-            correct_answer = m_value / 1000
-            unit_from, unit_to = "m", "km"
-            value_key = f"{conversion_type}:{self.format_number(m_value)}"
-
-        return question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key
+        return quiz_logic.generate_km_question(self.difficulty_level, self.prev_conversion_type, force_type, self.rng)
 
     def generate_question(self):
         """Generate a non-repeating, robust question (up to 100 tries)."""
-        for attempt in range(100):
-            q = self.generate_question_once()
-            question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key = q
-            if value_key not in self.recent_q:
-                if attempt < 10 and self.prev_conversion_type == conversion_type:
-                    continue
-                return q
-        alternate = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-        return self.generate_question_once(force_type=alternate)
+        return quiz_logic.pick_km_question(self.difficulty_level, self.prev_conversion_type, self.recent_q, self.rng)
 
     def new_question(self):
         """Generate and display a new question"""
@@ -200,20 +139,22 @@ class KidsConversionGame:
          self.current_unit_to,
          self.current_sigfigs,
          conversion_type,
-         value_key) = self.generate_question()
+         value_key,
+         self.current_key) = self.generate_question()
         
         self.prev_conversion_type = conversion_type
         self.recent_q.append(value_key)
+        self.current_value_key = value_key
+        self.question_shown_at = time.monotonic()
         
         # Auto-adjust difficulty based on performance
-        if self.total_questions > 0 and self.total_questions % 10 == 0:
-            accuracy = (self.score / self.total_questions) * 100
-            if accuracy >= 85 and self.difficulty_level < 3:
-                self.difficulty_level += 1
-                self.show_notification(f"🎊 Level Up! Difficulty increased to {self.difficulty_level}!")
-            elif accuracy < 50 and self.difficulty_level > 1:
-                self.difficulty_level -= 1
-                self.show_notification(f"💪 Taking it easier! Difficulty adjusted to {self.difficulty_level}")
+        new_level = quiz_logic.adjust_difficulty(self.difficulty_level, self.score, self.total_questions)
+        if new_level > self.difficulty_level:
+            self.difficulty_level = new_level
+            self.show_notification(f"🎊 Level Up! Difficulty increased to {self.difficulty_level}!")
+        elif new_level < self.difficulty_level:
+            self.difficulty_level = new_level
+            self.show_notification(f"💪 Taking it easier! Difficulty adjusted to {self.difficulty_level}")
 
         self.question_label.config(text=self.current_question)
         self.answer_var.set("")
@@ -552,26 +493,20 @@ class KidsConversionGame:
     # --------- checking logic ---------
     def tolerance_from_sigfigs(self, true_value, sigfigs):
         """Set a forgiving tolerance based on displayed significant figures."""
-        if true_value == 0:
-            return 1e-12
-        magnitude = 10 ** (math.floor(math.log10(abs(true_value))) - sigfigs + 1)
-        tol = 0.5 * magnitude
-        return max(tol, 1e-9)
+        return quiz_logic.tolerance_from_sigfigs(true_value, sigfigs)
 
     def check_answer(self):
         """Check the user's answer and apply battle damage"""
         user_input = self.answer_var.get().strip()
-        if not user_input:
+        status, user_answer = quiz_logic.grade(user_input, self.current_key)
+        if status == "empty":
             messagebox.showwarning("Oops! 🤔", "Please enter an answer first!")
             return
-        try:
-            user_answer = float(user_input)
-        except ValueError:
+        if status == "invalid":
             messagebox.showerror("Invalid Input! 😵", "Please enter a number only!\n\nFor example: 1500 or 2.5")
             return
         
-        tolerance = self.tolerance_from_sigfigs(self.current_answer, self.current_sigfigs)
-        is_correct = abs(user_answer - self.current_answer) <= tolerance
+        is_correct = status == "correct"
         self.total_questions += 1
         
         if is_correct:
@@ -582,7 +517,7 @@ class KidsConversionGame:
             dmg = self.calculate_hero_damage()
             self.monster_hp = max(0, self.monster_hp - dmg)
 
-            message = random.choice(self.correct_messages)
+            message = self.fx_rng.choice(self.correct_messages)
             if self.streak >= 3:
                 message += f"\n🔥 {self.streak} in a row!"
             message += f"\n🗡️ You dealt {dmg} damage to the {self.current_monster_name}!"
@@ -594,9 +529,9 @@ class KidsConversionGame:
             dmg = self.calculate_monster_damage()
             self.hero_hp = max(0, self.hero_hp - dmg)
 
-            correct = self.format_number(self.current_answer)
+            correct = self.current_key.text
             tip = "Multiply by 1000" if self.current_unit_to == "m" else "Divide by 1000"
-            encouragement = random.choice(self.encouragement_messages)
+            encouragement = self.fx_rng.choice(self.encouragement_messages)
             msg = (f"{encouragement}\n\n"
                    f"✅ Correct answer: {correct} {self.current_unit_to}\n\n"
                    f"💡 Remember: {tip}\n"
@@ -652,7 +587,7 @@ class KidsConversionGame:
         # Scale monster HP roughly exponentially/light linear
         self.monster_max_hp = int(self.base_monster_hp * (1.25 ** (self.level - 1)))
         self.monster_hp = self.monster_max_hp
-        self.current_monster_name = random.choice(self.monster_names)
+        self.current_monster_name = self.rng.choice(self.monster_names)
 
         # Small heal on level-up
         heal = 20
@@ -683,6 +618,8 @@ class KidsConversionGame:
                  f"   Highest Level: {self.level}\n"
                  f"   Achievements: {len(self.achievements)}\n\n")
         messagebox.showinfo("💀 Game Over", f"The hero has fallen!\n\n{stats}Thanks for playing!")
+        self.logger.close()
+        self.record_logger.close()
         self.root.destroy()
     
     def animate_success(self):
@@ -735,11 +672,17 @@ class KidsConversionGame:
                     f"{result} | Streak: {self.streak} | Level: {self.difficulty_level} | "
                     f"HeroHP {self.hero_hp}/{self.hero_max_hp} | "
                     f"MonsterHP {self.monster_hp}/{self.monster_max_hp}\n")
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Could not write to log: {e}")
+        self.logger.log(log_entry)
+
+        direction, value = self.current_value_key.split(":", 1)
+        record = make_record(
+            "kids", direction, value, self.format_number(correct_answer), user_answer, is_correct,
+            sig_figs=self.current_sigfigs, streak=self.streak, level=self.difficulty_level,
+            hero_hp=self.hero_hp, hero_max_hp=self.hero_max_hp,
+            monster_hp=self.monster_hp, monster_max_hp=self.monster_max_hp,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.seed
+        )
+        self.record_logger.log(to_jsonl(record))
     
     def show_help(self):
         help_text = """🚀 How to Play:
@@ -785,6 +728,14 @@ Have fun learning & battling! 🌟"""
         else:
             message = "Thanks for trying the Distance Converter Adventure! 🚀\n\nCome back anytime to practice!"
         messagebox.showinfo("Thanks for Playing! 👋", message)
+        self.logger.close()
+        self.record_logger.close()
+        self.root.destroy()
+    
+    def close_window(self):
+        """Flush the attempt log and close the window"""
+        self.logger.close()
+        self.record_logger.close()
         self.root.destroy()
     
     def run(self):
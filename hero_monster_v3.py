@@ -1,62 +1,63 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 import datetime
 import os
 import math
-from collections import deque
+import time
+
+from attempt_logger import AttemptLogger
+from battle_engine import BattleEngine
+from frame_clock import FrameClock
+from log_records import make_record, to_jsonl
+from particles import ParticleSystem
+from snapshot_store import SnapshotStore
+import quiz_logic
 
 class BattleConverterGame:
-    def __init__(self):
-        self.root = tk.Tk()
+    ZERO_MESSAGES = {
+        "leading_zeros": "Please remove the zeros at the front.",
+        "zero_fraction": "Please leave off the .0 at the end.",
+        "trailing_zeros": "Please remove the zeros at the end of the decimals.",
+    }
+
+    def __init__(self, root=None, on_exit=None, seed=None):
+        # root/on_exit let the launcher host the game in its own Tk root;
+        # seed replays a logged session (questions and monsters) and leaves the saved game alone;
+        # without one the saved game is resumed
+        self.root = root if root is not None else tk.Tk()
+        self.on_exit = on_exit
         self.root.title("⚔️ Math Battle Arena! 🐉")
         self.root.geometry("900x850")
         self.root.configure(bg='#1a1a2e')
         
-        # Game state
-        self.score = 0
-        self.total_questions = 0
-        self.current_question = ""
-        self.current_answer = 0.0
-        self.current_unit_from = ""
-        self.current_unit_to = ""
-        self.current_sigfigs = 3
-        self.prev_conversion_type = None
-        self.recent_q = deque(maxlen=20)
+        # Game rules and state live in the engine; this class only draws them
+        self.store = SnapshotStore("battle_save.bin") if seed is None else None
+        self.engine = self.load_game() if self.store is not None else None
+        resumed = self.engine is not None
+        if not resumed:
+            self.engine = BattleEngine(seed)
+        self.fx_rng = quiz_logic.effects_rng(self.engine.seed)
         self.log_file = "battle_log.txt"
-        
-        self.streak = 0
-        self.best_streak = 0
-        self.hints_used = 0
-        self.hint_available = True
-        self.difficulty_level = 1
-
-        # Battle system
-        self.level = 1
-        self.hero_max_hp = 100
-        self.hero_hp = self.hero_max_hp
-        self.base_monster_hp = 60
-        self.monster_max_hp = self.base_monster_hp
-        self.monster_hp = self.monster_max_hp
-        self.hero_damage = 15
-        self.monster_damage = 12
-        
-        # Enhanced monster system
-        self.monster_types = [
-            {"name": "Slime", "emoji": "🟢", "color": "#90EE90"},
-            {"name": "Bat", "emoji": "🦇", "color": "#8B4513"},
-            {"name": "Goblin", "emoji": "👹", "color": "#DAA520"},
-            {"name": "Dragon", "emoji": "🐉", "color": "#FF4500"},
-            {"name": "Demon", "emoji": "😈", "color": "#8B0000"},
-            {"name": "Golem", "emoji": "🗿", "color": "#808080"},
-            {"name": "Hydra", "emoji": "🐍", "color": "#9370DB"}
-        ]
-        self.current_monster = random.choice(self.monster_types)
-        
-        # Animation variables
-        self.attack_animation_id = None
+        self.start_log()
+        self.logger = AttemptLogger(self.log_file)
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.logger.log(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Session seed: {self.engine.seed}"
+                        + (f" (resumed at level {self.engine.level})" if resumed else "") + "\n")
+        self.question_shown_at = time.monotonic()
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.outcome_id = None
+        
+        # Animation variables (all animations run on one frame clock)
+        self.clock = FrameClock(self.root)
+        self.idle_animation_id = None
+        self.hero_attack_id = None
+        self.monster_attack_id = None
         self.shake_animation_id = None
-        self.particle_ids = []
+        self.hero_offset = 0.0
+        self.monster_offset = 0.0
+        self.shake_offset = 0.0
+        self.idle_bob = 3
+        self.max_particles = 160
         self.hero_x = 150
         self.hero_y = 150
         self.monster_x = 650
@@ -76,121 +77,25 @@ class BattleConverterGame:
         }
         
         self.setup_ui()
-        self.new_question()
+        if resumed:
+            self.update_displays()
+        if resumed and not self.engine.question_answered:
+            self.show_question()
+        else:
+            self.new_question()
         self.animate_idle()
         
-    def round_sig(self, x, sig):
-        if x == 0:
-            return 0.0
-        if sig < 1:
-            sig = 1
-        if sig > 6:
-            sig = 6
-        return float(f"{x:.{sig}g}")
-
-    def format_number(self, num):
-        if abs(num - int(num)) < 1e-12:
-            return str(int(num))
-        formatted = f"{num:.10f}".rstrip('0').rstrip('.')
-        return formatted
-    
-    def get_difficulty_ranges(self):
-        if self.difficulty_level == 1:
-            km_range = (1, 100)
-            m_range = (1000, 10000)
-        elif self.difficulty_level == 2:
-            km_range = (1, 500)
-            m_range = (1000, 30000)
-        else:
-            km_range = (0.5, 999)
-            m_range = (500, 50000)
-        return km_range, m_range
-    
-    def generate_question_once(self, force_type=None):
-        if force_type is not None:
-            conversion_type = force_type
-        else:
-            choices = ["km_to_m", "m_to_km"]
-            if self.prev_conversion_type in choices:
-                other = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-                conversion_type = random.choices([other, self.prev_conversion_type], weights=[0.85, 0.15])[0]
-            else:
-                conversion_type = random.choice(choices)
-
-        sig_figs = random.choices([1, 2, 3, 4], weights=[1, 3, 3, 2])[0]
-        km_range, m_range = self.get_difficulty_ranges()
-
-        km_templates = [
-            "🚀 Spaceship traveled {val} km",
-            "✈️ Jet flew {val} kilometers",
-            "🏃 Runner completed {val} km",
-            "🚂 Train moved {val} kilometers",
-            "🎈 Balloon drifted {val} km"
-        ]
-        m_templates = [
-            "🌟 Rocket ascended {val} meters",
-            "🏊 Swimmer covered {val} m",
-            "🚴 Cyclist rode {val} meters",
-            "⛷️ Skier descended {val} m",
-            "🦘 Kangaroo hopped {val} meters"
-        ]
-
-        if conversion_type == "km_to_m":
-            raw = random.uniform(*km_range)
-            if random.random() < 0.3 and sig_figs <= 2:
-                raw = round(raw / 10) * 10
-            km_value = self.round_sig(raw, sig_figs)
-            template = random.choice(km_templates)
-            question = template.format(val=self.format_number(km_value))
-            correct_answer = km_value * 1000
-            unit_from, unit_to = "km", "m"
-            value_key = f"{conversion_type}:{self.format_number(km_value)}"
-        else:
-            raw = random.uniform(*m_range)
-            if random.random() < 0.25 and sig_figs <= 3:
-                raw = round(raw / 1000) * 1000
-            m_value = self.round_sig(raw, sig_figs)
-            template = random.choice(m_templates)
-            question = template.format(val=self.format_number(m_value))
-            correct_answer = m_value / 1000
-            unit_from, unit_to = "m", "km"
-            value_key = f"{conversion_type}:{self.format_number(m_value)}"
-
-        return question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key
-
-    def generate_question(self):
-        for attempt in range(100):
-            q = self.generate_question_once()
-            question, correct_answer, unit_from, unit_to, sig_figs, conversion_type, value_key = q
-            if value_key not in self.recent_q:
-                if attempt < 10 and self.prev_conversion_type == conversion_type:
-                    continue
-                return q
-        alternate = "m_to_km" if self.prev_conversion_type == "km_to_m" else "km_to_m"
-        return self.generate_question_once(force_type=alternate)
-
     def new_question(self):
-        (self.current_question,
-         self.current_answer,
-         self.current_unit_from,
-         self.current_unit_to,
-         self.current_sigfigs,
-         conversion_type,
-         value_key) = self.generate_question()
-        
-        self.prev_conversion_type = conversion_type
-        self.recent_q.append(value_key)
-        
-        if self.total_questions > 0 and self.total_questions % 10 == 0:
-            accuracy = (self.score / self.total_questions) * 100
-            if accuracy >= 85 and self.difficulty_level < 3:
-                self.difficulty_level += 1
-                self.show_floating_text("⬆️ LEVEL UP!", self.root.winfo_width()//2, 200, '#ffd700')
-            elif accuracy < 50 and self.difficulty_level > 1:
-                self.difficulty_level -= 1
-
-        self.question_label.config(text=self.current_question)
-        target_text = f"Convert to {self.current_unit_to.upper()}"
+        difficulty_change = self.engine.new_question()
+        self.save_game()
+        if difficulty_change > 0:
+            self.show_floating_text("⬆️ LEVEL UP!", self.root.winfo_width()//2, 200, '#ffd700')
+        self.show_question()
+
+    def show_question(self):
+        self.question_shown_at = time.monotonic()
+        self.question_label.config(text=self.engine.current_question)
+        target_text = f"Convert to {self.engine.current_unit_to.upper()}"
         self.target_label.config(text=target_text)
         self.answer_var.set("")
         self.result_label.config(text="")
@@ -198,8 +103,11 @@ class BattleConverterGame:
         # Clear the top banner when moving to a new question
         self.set_top_banner("")
         
-        self.hint_available = True
-        self.hint_button.config(state='normal', bg=self.colors['gold'])
+        # A resumed question keeps its hint used
+        if self.engine.hint_used:
+            self.hint_button.config(state='disabled', bg='#666666')
+        else:
+            self.hint_button.config(state='normal', bg=self.colors['gold'])
         self.check_button.config(state='normal')
         self.next_button.config(state='disabled')
         self.answer_entry.focus()
@@ -270,6 +178,7 @@ class BattleConverterGame:
         
         # Draw battlefield
         self.draw_battlefield()
+        self.particles = ParticleSystem(self.battle_canvas, self.max_particles, clock=self.clock, rng=self.fx_rng)
         
         # Battle Info Frame
         battle_info = tk.Frame(self.root, bg=self.colors['secondary_bg'], pady=5)
@@ -289,7 +198,7 @@ class BattleConverterGame:
         
         self.hero_hp_label = tk.Label(
             hero_frame,
-            text=f"❤️ {self.hero_hp}/{self.hero_max_hp}",
+            text=f"❤️ {self.engine.hero_hp}/{self.engine.hero_max_hp}",
             font=('Arial', 11),
             fg=self.colors['text'],
             bg=self.colors['secondary_bg']
@@ -301,9 +210,9 @@ class BattleConverterGame:
             orient='horizontal',
             length=350,
             mode='determinate',
-            maximum=self.hero_max_hp
+            maximum=self.engine.hero_max_hp
         )
-        self.hero_hp_bar['value'] = self.hero_hp
+        self.hero_hp_bar['value'] = self.engine.hero_hp
         self.hero_hp_bar.pack(fill='x', pady=2)
         
         # Level display center
@@ -312,7 +221,7 @@ class BattleConverterGame:
         
         self.level_label = tk.Label(
             level_frame,
-            text=f"⚔️\nLV {self.level}",
+            text=f"⚔️\nLV {self.engine.level}",
             font=('Arial', 16, 'bold'),
             fg=self.colors['gold'],
             bg=self.colors['secondary_bg']
@@ -325,16 +234,16 @@ class BattleConverterGame:
         
         self.monster_name_label = tk.Label(
             monster_frame,
-            text=f"{self.current_monster['emoji']} {self.current_monster['name'].upper()}",
+            text=f"{self.engine.current_monster['emoji']} {self.engine.current_monster['name'].upper()}",
             font=('Arial', 12, 'bold'),
-            fg=self.current_monster['color'],
+            fg=self.engine.current_monster['color'],
             bg=self.colors['secondary_bg']
         )
         self.monster_name_label.pack(anchor='e')
         
         self.monster_hp_label = tk.Label(
             monster_frame,
-            text=f"❤️ {self.monster_hp}/{self.monster_max_hp}",
+            text=f"❤️ {self.engine.monster_hp}/{self.engine.monster_max_hp}",
             font=('Arial', 11),
             fg=self.colors['text'],
             bg=self.colors['secondary_bg']
@@ -346,9 +255,9 @@ class BattleConverterGame:
             orient='horizontal',
             length=350,
             mode='determinate',
-            maximum=self.monster_max_hp
+            maximum=self.engine.monster_max_hp
         )
-        self.monster_hp_bar['value'] = self.monster_hp
+        self.monster_hp_bar['value'] = self.engine.monster_hp
         self.monster_hp_bar.pack(fill='x', pady=2)
 
         # Question Frame
@@ -472,6 +381,21 @@ class BattleConverterGame:
             cursor='hand2'
         )
         help_button.pack(side='left', padx=20)
+
+        new_game_button = tk.Button(
+            help_frame,
+            text="🆕 New Game",
+            font=('Arial', 12, 'bold'),
+            bg=self.colors['secondary'],
+            fg=self.colors['text'],
+            padx=15,
+            pady=5,
+            command=self.new_game,
+            relief='raised',
+            bd=2,
+            cursor='hand2'
+        )
+        new_game_button.pack(side='right', padx=20)
         
         self.answer_entry.focus()
 
@@ -492,104 +416,72 @@ class BattleConverterGame:
         # Monster
         self.monster_sprite = self.battle_canvas.create_text(
             self.monster_x, self.monster_y,
-            text=self.current_monster['emoji'],
+            text=self.engine.current_monster['emoji'],
             font=('Arial', 70),
             tags='monster'
         )
     
     def animate_idle(self):
-        if hasattr(self, 'hero_sprite'):
-            offset = math.sin(self.root.winfo_width() * 0.05) * 2
-            self.battle_canvas.coords(self.hero_sprite, self.hero_x, self.hero_y + offset)
-        if hasattr(self, 'monster_sprite'):
-            offset = math.cos(self.root.winfo_width() * 0.05) * 2
-            self.battle_canvas.coords(self.monster_sprite, self.monster_x, self.monster_y + offset)
-        self.root.after(50, self.animate_idle)
+        self.clock.cancel(self.idle_animation_id)
+        self.idle_animation_id = self.clock.add(self.update_pose)
+
+    def update_pose(self, dt, elapsed):
+        # Idle bob plus whatever attack / shake offsets are tweening right now
+        phase = elapsed * 2 * math.pi / 1500
+        self.battle_canvas.coords(
+            self.hero_sprite,
+            self.hero_x + self.hero_offset + self.shake_offset,
+            self.hero_y + math.sin(phase) * self.idle_bob
+        )
+        self.battle_canvas.coords(
+            self.monster_sprite,
+            self.monster_x + self.monster_offset - self.shake_offset,
+            self.monster_y + math.cos(phase) * self.idle_bob
+        )
+        return True
+
+    def lunge(self, offset_name, distance, move_ms, on_hit):
+        """Slide a sprite offset out over move_ms, pause 100 ms at the hit, slide back."""
+        hit = []
+        def step(dt, elapsed):
+            if elapsed >= move_ms and not hit:
+                hit.append(True)
+                on_hit()
+            if elapsed < move_ms:
+                p = elapsed / move_ms
+            else:
+                p = max(0.0, min(1.0, 1 - (elapsed - move_ms - 100) / move_ms))
+            setattr(self, offset_name, distance * p)
+            return p > 0 or elapsed < move_ms
+        return self.clock.add(step)
     
     def animate_hero_attack(self):
-        steps = 10
-        dx = (self.monster_x - self.hero_x) * 0.6 / steps
-        def move_forward(step=0):
-            if step < steps:
-                self.battle_canvas.move('hero', dx, 0)
-                self.root.after(30, lambda: move_forward(step + 1))
-            else:
-                self.create_impact_effect(self.monster_x - 50, self.monster_y)
-                self.root.after(100, move_back)
-        def move_back(step=0):
-            if step < steps:
-                self.battle_canvas.move('hero', -dx, 0)
-                self.root.after(30, lambda: move_back(step + 1))
-        move_forward()
+        self.clock.cancel(self.hero_attack_id)
+        self.hero_attack_id = self.lunge(
+            'hero_offset', (self.monster_x - self.hero_x) * 0.6, 300,
+            lambda: self.create_impact_effect(self.monster_x - 50, self.monster_y)
+        )
     
     def animate_monster_attack(self):
-        steps = 8
-        dx = (self.hero_x - self.monster_x) * 0.5 / steps
-        def move_forward(step=0):
-            if step < steps:
-                self.battle_canvas.move('monster', dx, 0)
-                self.root.after(40, lambda: move_forward(step + 1))
-            else:
-                self.shake_screen()
-                self.create_impact_effect(self.hero_x + 30, self.hero_y)
-                self.root.after(100, move_back)
-        def move_back(step=0):
-            if step < steps:
-                self.battle_canvas.move('monster', -dx, 0)
-                self.root.after(40, lambda: move_back(step + 1))
-        move_forward()
+        def hit():
+            self.shake_screen()
+            self.create_impact_effect(self.hero_x + 30, self.hero_y)
+        self.clock.cancel(self.monster_attack_id)
+        self.monster_attack_id = self.lunge('monster_offset', (self.hero_x - self.monster_x) * 0.5, 320, hit)
     
-    def create_impact_effect(self, x, y):
-        colors = ['#ff0000', '#ff6600', '#ffff00', '#ffffff']
-        for _ in range(12):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 8)
-            color = random.choice(colors)
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            particle = self.battle_canvas.create_oval(
-                x-4, y-4, x+4, y+4,
-                fill=color,
-                outline=''
-            )
-            self.animate_particle(particle, dx, dy, 15)
-    
-    def animate_particle(self, particle, dx, dy, steps):
-        def move(step=0):
-            if step < steps:
-                try:
-                    self.battle_canvas.move(particle, dx, dy)
-                    self.root.after(30, lambda: move(step + 1))
-                except:
-                    pass
-            else:
-                try:
-                    self.battle_canvas.delete(particle)
-                except:
-                    pass
-        move()
+    def create_impact_effect(self, x, y, count=12):
+        self.particles.burst(x, y, count)
     
     def shake_screen(self):
         shake_amount = 8
         shakes = 6
-        def shake(count=0):
-            if count < shakes:
-                offset = shake_amount if count % 2 == 0 else -shake_amount
-                try:
-                    self.battle_canvas.move('hero', offset, 0)
-                    self.battle_canvas.move('monster', -offset, 0)
-                except:
-                    pass
-                self.root.after(50, lambda: shake(count + 1))
+        def shake(p):
+            if p >= 1:
+                self.shake_offset = 0
             else:
-                try:
-                    hero_coords = self.battle_canvas.coords(self.hero_sprite)
-                    monster_coords = self.battle_canvas.coords(self.monster_sprite)
-                    self.battle_canvas.coords(self.hero_sprite, self.hero_x, hero_coords[1])
-                    self.battle_canvas.coords(self.monster_sprite, self.monster_x, monster_coords[1])
-                except:
-                    pass
-        shake()
+                self.shake_offset = shake_amount if int(p * shakes) % 2 == 0 else -shake_amount
+        self.clock.cancel(self.shake_animation_id)
+        self.shake_animation_id = self.clock.tween(shakes * 50, shake)
     
     def show_floating_text(self, text, x, y, color):
         label = self.battle_canvas.create_text(
@@ -599,31 +491,21 @@ class BattleConverterGame:
             fill=color,
             tags='floating'
         )
-        def float_up(step=0):
-            if step < 20:
-                self.battle_canvas.move(label, 0, -3)
-                try:
-                    self.battle_canvas.itemconfig(label, font=('Arial', max(12, 24 - step), 'bold'))
-                except:
-                    pass
-                self.root.after(50, lambda: float_up(step + 1))
-            else:
-                try:
-                    self.battle_canvas.delete(label)
-                except:
-                    pass
-        float_up()
+        size = [24]
+        def float_up(p):
+            self.battle_canvas.coords(label, x, y - 60 * p)
+            new_size = max(12, 24 - int(p * 20))
+            if new_size != size[0]:
+                size[0] = new_size
+                self.battle_canvas.itemconfig(label, font=('Arial', new_size, 'bold'))
+        self.clock.tween(1000, float_up, on_done=lambda: self.battle_canvas.delete(label))
     
     def show_hint(self):
-        if not self.hint_available:
+        hint = self.engine.use_hint()
+        if hint is None:
             return
-        self.hints_used += 1
-        self.hint_available = False
         self.hint_button.config(state='disabled', bg='#666666')
-        if self.current_unit_to == "m":
-            hint = "💡 To convert km → m: multiply by 1000"
-        else:
-            hint = "💡 To convert m → km: divide by 1000"
+        self.save_game()
         messagebox.showinfo("💡 Hint", hint)
 
     # ------- TOP BANNER CONTROL -------
@@ -638,212 +520,173 @@ class BattleConverterGame:
             # Clear to background color and empty text
             self.top_banner.config(text="", bg=self.colors['bg'], fg=self.colors['text'])
 
-    # ------- Optional: forbid padded zeros like 3.0, 2.50, 0005 -------
-    def _has_unnecessary_zeros(self, s: str) -> bool:
-        s = s.strip()
-        if not s:
-            return False
-        if s[0] in "+-":
-            s = s[1:]
-        if "e" in s.lower():
-            return False
-        if s.startswith("0") and len(s) > 1 and not s.startswith("0."):
-            return True
-        if "." in s:
-            int_part, frac_part = s.split(".", 1)
-            if len(frac_part) > 0 and set(frac_part) == {"0"}:
-                return True
-            if len(frac_part) > 1 and frac_part.endswith("0"):
-                return True
-        return False
-    
-    def tolerance_from_sigfigs(self, true_value, sigfigs):
-        if true_value == 0:
-            return 1e-12
-        magnitude = 10 ** (math.floor(math.log10(abs(true_value))) - sigfigs + 1)
-        tol = 0.5 * magnitude
-        return max(tol, 1e-9)
-
     def check_answer(self):
-        user_input = self.answer_var.get().strip()
-        if not user_input:
+        outcome = self.engine.submit(self.answer_var.get())
+        status = outcome["status"]
+        if status == "answered":
+            return
+        if status == "empty":
             messagebox.showwarning("⚠️", "Enter an answer first!")
             return
-
-        # Optional formatting rule (remove if not needed)
-        if self._has_unnecessary_zeros(user_input):
+        if status == "zeros":
             messagebox.showerror(
                 "🛑 Formatting",
-                "Please avoid unnecessary zeros.\n"
+                f"{self.ZERO_MESSAGES[outcome['violation']]}\n"
                 "Examples not allowed: 3.0, 2.50, 0005, 0.00\n"
                 "Use the simplest form (e.g., 3, 2.5, 5, 0)."
             )
             return
-
-        try:
-            user_answer = float(user_input)
-        except ValueError:
+        if status == "invalid":
             messagebox.showerror("❌", "Please enter a number only!")
             return
-        
-        tolerance = self.tolerance_from_sigfigs(self.current_answer, self.current_sigfigs)
-        is_correct = abs(user_answer - self.current_answer) <= tolerance
-        self.total_questions += 1
+
+        is_correct = status == "correct"
+        dmg = outcome["damage"]
+        # No second attack while the result plays out
+        self.check_button.config(state='disabled')
         
         if is_correct:
             # Clear any previous top banner
             self.set_top_banner("")
-            self.score += 1
-            self.streak += 1
-            if self.streak > self.best_streak:
-                self.best_streak = self.streak
-            
-            dmg = self.calculate_hero_damage()
-            self.monster_hp = max(0, self.monster_hp - dmg)
             
             # Animate attack
             self.animate_hero_attack()
             self.show_floating_text(f"-{dmg}", self.monster_x, self.monster_y - 40, '#ff3366')
             
             message = "⚔️ CRITICAL HIT!"
-            if self.streak >= 3:
-                message += f" 🔥 {self.streak} COMBO!"
+            if self.engine.streak >= 3:
+                message += f" 🔥 {self.engine.streak} COMBO!"
             self.result_label.config(text=message, fg=self.colors['success'])
             
         else:
-            self.streak = 0
-            dmg = self.calculate_monster_damage()
-            self.hero_hp = max(0, self.hero_hp - dmg)
-            
             # Animate counter-attack
             self.root.after(800, self.animate_monster_attack)
             self.root.after(800, lambda: self.show_floating_text(f"-{dmg}", self.hero_x, self.hero_y - 40, '#ff3366'))
             
-            correct = self.format_number(self.current_answer)
-            tip = "× 1000" if self.current_unit_to == "m" else "÷ 1000"
+            correct = self.engine.current_key.text
+            tip = "× 1000" if self.engine.current_unit_to == "m" else "÷ 1000"
 
             # >>> Show CORRECT ANSWER on TOP banner <<<
-            self.set_top_banner(f"✅ Correct answer: {correct} {self.current_unit_to}")
+            self.set_top_banner(f"✅ Correct answer: {correct} {self.engine.current_unit_to}")
 
             # Also keep bottom details
             message = f"❌ Wrong!\n💡 Use: {tip}"
             self.result_label.config(text=message, fg=self.colors['error'])
         
         self.update_displays()
-        self.log_attempt(self.current_question, user_input, self.current_answer, is_correct)
+        self.log_attempt(self.engine.current_question, outcome["input"], self.engine.current_answer, is_correct)
+        self.save_game()
         
-        if self.monster_hp <= 0:
-            self.root.after(1200, self.on_monster_defeated)
-        elif self.hero_hp <= 0:
-            self.root.after(1200, self.on_hero_defeated)
+        if outcome["monster_defeated"]:
+            self.outcome_id = self.root.after(1200, self.on_monster_defeated)
+        elif outcome["hero_defeated"]:
+            self.outcome_id = self.root.after(1200, self.on_hero_defeated)
         else:
-            self.check_button.config(state='disabled')
             self.next_button.config(state='normal')
             self.next_button.focus()
     
-    def calculate_hero_damage(self):
-        return self.hero_damage + (self.level - 1) * 2 + min(self.streak, 5)
-
-    def calculate_monster_damage(self):
-        return self.monster_damage + (self.level - 1) * 2
-
     def update_displays(self):
         # HP bars
-        self.hero_hp_label.config(text=f"❤️ {self.hero_hp}/{self.hero_max_hp}")
-        self.hero_hp_bar['maximum'] = self.hero_max_hp
-        self.hero_hp_bar['value'] = self.hero_hp
+        self.hero_hp_label.config(text=f"❤️ {self.engine.hero_hp}/{self.engine.hero_max_hp}")
+        self.hero_hp_bar['maximum'] = self.engine.hero_max_hp
+        self.hero_hp_bar['value'] = self.engine.hero_hp
         
-        self.monster_hp_label.config(text=f"❤️ {self.monster_hp}/{self.monster_max_hp}")
-        self.monster_hp_bar['maximum'] = self.monster_max_hp
-        self.monster_hp_bar['value'] = self.monster_hp
+        self.monster_hp_label.config(text=f"❤️ {self.engine.monster_hp}/{self.engine.monster_max_hp}")
+        self.monster_hp_bar['maximum'] = self.engine.monster_max_hp
+        self.monster_hp_bar['value'] = self.engine.monster_hp
         
         # Score
-        percentage = (self.score / self.total_questions * 100) if self.total_questions else 0
-        self.score_label.config(text=f"⭐ {self.score}/{self.total_questions} ({percentage:.0f}%)")
+        percentage = self.engine.accuracy
+        self.score_label.config(text=f"⭐ {self.engine.score}/{self.engine.total_questions} ({percentage:.0f}%)")
         
         # Streak
-        self.streak_label.config(text=f"🔥 {self.streak} | Best: {self.best_streak}")
+        self.streak_label.config(text=f"🔥 {self.engine.streak} | Best: {self.engine.best_streak}")
         
         # Level
-        self.level_label.config(text=f"⚔️\nLV {self.level}")
+        self.level_label.config(text=f"⚔️\nLV {self.engine.level}")
 
     def on_monster_defeated(self):
+        self.outcome_id = None
         for _ in range(20):
-            x = self.monster_x + random.randint(-30, 30)
-            y = self.monster_y + random.randint(-30, 30)
-            self.create_impact_effect(x, y)
+            x = self.monster_x + self.fx_rng.randint(-30, 30)
+            y = self.monster_y + self.fx_rng.randint(-30, 30)
+            self.create_impact_effect(x, y, 8)
         self.show_floating_text("💀 DEFEATED!", self.monster_x, self.monster_y, '#ff0000')
         
-        self.level += 1
-        self.monster_max_hp = int(self.base_monster_hp * (1.25 ** (self.level - 1)))
-        self.monster_hp = self.monster_max_hp
+        heal = self.engine.next_monster()
+        self.save_game()
         
-        # New monster
-        self.current_monster = random.choice(self.monster_types)
-        
-        # Heal hero
-        heal = 25
-        self.hero_hp = min(self.hero_max_hp, self.hero_hp + heal)
-        
-        if self.level % 3 == 0:
-            self.hero_damage += 2
+        self.show_monster()
+        self.update_displays()
+        self.result_label.config(
+            text=f"🏆 VICTORY! Level {self.engine.level}!\n💚 Recovered {heal} HP",
+            fg=self.colors['gold']
+        )
         
+        self.check_button.config(state='disabled')
+        self.next_button.config(state='normal')
+        self.next_button.focus()
+
+    def show_monster(self):
         # Redraw monster sprite
         self.battle_canvas.delete(self.monster_sprite)
         self.monster_sprite = self.battle_canvas.create_text(
             self.monster_x, self.monster_y,
-            text=self.current_monster['emoji'],
+            text=self.engine.current_monster['emoji'],
             font=('Arial', 70),
             tags='monster'
         )
         
         self.monster_name_label.config(
-            text=f"{self.current_monster['emoji']} {self.current_monster['name'].upper()}",
-            fg=self.current_monster['color']
+            text=f"{self.engine.current_monster['emoji']} {self.engine.current_monster['name'].upper()}",
+            fg=self.engine.current_monster['color']
         )
-        
-        self.update_displays()
-        self.result_label.config(
-            text=f"🏆 VICTORY! Level {self.level}!\n💚 Recovered {heal} HP",
-            fg=self.colors['gold']
-        )
-        
-        self.check_button.config(state='disabled')
-        self.next_button.config(state='normal')
-        self.next_button.focus()
 
     def on_hero_defeated(self):
+        self.outcome_id = None
         for _ in range(15):
-            x = self.hero_x + random.randint(-20, 20)
-            y = self.hero_y + random.randint(-20, 20)
-            self.create_impact_effect(x, y)
+            x = self.hero_x + self.fx_rng.randint(-20, 20)
+            y = self.hero_y + self.fx_rng.randint(-20, 20)
+            self.create_impact_effect(x, y, 8)
         self.show_floating_text("💀 DEFEATED!", self.hero_x, self.hero_y, '#ff0000')
         
-        percentage = (self.score / self.total_questions * 100) if self.total_questions else 0
+        percentage = self.engine.accuracy
         stats = (f"⚔️ GAME OVER ⚔️\n\n"
                 f"📊 Final Stats:\n"
-                f"Score: {self.score}/{self.total_questions} ({percentage:.0f}%)\n"
-                f"Best Streak: {self.best_streak}\n"
-                f"Level Reached: {self.level}\n"
-                f"Hints Used: {self.hints_used}\n\n"
+                f"Score: {self.engine.score}/{self.engine.total_questions} ({percentage:.0f}%)\n"
+                f"Best Streak: {self.engine.best_streak}\n"
+                f"Level Reached: {self.engine.level}\n"
+                f"Hints Used: {self.engine.hints_used}\n\n"
                 f"Thanks for playing!")
+        # The game-over state is already saved, so the next start begins a new game
         messagebox.showinfo("💀 Defeated", stats)
-        self.root.destroy()
+        self.clock.stop()
+        self.close_store()
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
     
     def log_attempt(self, question, user_answer, correct_answer, is_correct):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         result = "✓" if is_correct else "✗"
         clean_question = question.replace('\n', ' ')
         log_entry = (f"[{timestamp}] {result} Q: {clean_question} | "
-                    f"User: {user_answer} | Correct: {self.format_number(correct_answer)} | "
-                    f"Streak: {self.streak} | Lv {self.level} | "
-                    f"Hero {self.hero_hp}/{self.hero_max_hp} | "
-                    f"Monster {self.monster_hp}/{self.monster_max_hp}\n")
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Log error: {e}")
+                    f"User: {user_answer} | Correct: {self.engine.format_number(correct_answer)} | "
+                    f"Streak: {self.engine.streak} | Lv {self.engine.level} | "
+                    f"Hero {self.engine.hero_hp}/{self.engine.hero_max_hp} | "
+                    f"Monster {self.engine.monster_hp}/{self.engine.monster_max_hp}\n")
+        self.logger.log(log_entry)
+
+        direction, value = self.engine.current_value_key.split(":", 1)
+        record = make_record(
+            "battle", direction, value, self.engine.format_number(correct_answer), user_answer, is_correct,
+            sig_figs=self.engine.current_sigfigs, streak=self.engine.streak, level=self.engine.level,
+            hero_hp=self.engine.hero_hp, hero_max_hp=self.engine.hero_max_hp,
+            monster_hp=self.engine.monster_hp, monster_max_hp=self.engine.monster_max_hp,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.engine.seed,
+            question=self.engine.questions_drawn - 1
+        )
+        self.record_logger.log(to_jsonl(record))
     
     def show_help(self):
         help_text = """⚔️ BATTLE INSTRUCTIONS ⚔️
@@ -874,10 +717,67 @@ Example:
 Good luck, warrior! ⚔️"""
         messagebox.showinfo("❓ Help", help_text)
     
-    def run(self):
+    def new_game(self):
+        """Drop the current game and start again at level 1."""
+        if not messagebox.askyesno("🆕 New Game", "Start a new game at level 1?\nThis battle will be lost."):
+            return
+        if self.outcome_id is not None:
+            self.root.after_cancel(self.outcome_id)
+            self.outcome_id = None
+        self.engine = BattleEngine()
+        self.fx_rng = quiz_logic.effects_rng(self.engine.seed)
+        self.particles.rng = self.fx_rng
+        self.logger.log(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Session seed: {self.engine.seed} (new game)\n")
+        self.show_monster()
+        self.update_displays()
+        self.new_question()
+
+    def close_window(self):
+        self.clock.stop()
+        self.close_store()
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
+    
+    def finish(self):
+        """Leave the game: back to the launcher when hosted, otherwise close the window"""
+        if self.on_exit is not None:
+            self.on_exit()
+        else:
+            self.root.destroy()
+    
+    def load_game(self):
+        """Engine from the last save, or None to start a new game."""
+        data = self.store.load()
+        if data is None:
+            return None
+        try:
+            engine = BattleEngine.from_snapshot(data)
+        except ValueError as e:
+            print(f"Save ignored: {e}")
+            return None
+        # A defeat ends the game: start a new one
+        if engine.hero_hp <= 0:
+            return None
+        # Finish a victory the window was closed in the middle of
+        if engine.monster_hp <= 0:
+            engine.next_monster()
+        return engine
+
+    def save_game(self):
+        if self.store is not None:
+            self.store.save(self.engine.snapshot())
+
+    def close_store(self):
+        if self.store is not None:
+            self.store.close()
+
+    def start_log(self):
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write("=== Battle Arena Log ===\n\n")
+    
+    def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
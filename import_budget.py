@@ -0,0 +1,53 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Modules that must import without tkinter, and how long a cold import may take.
+# They measure 15-30 ms here (mostly re, enum, json and decimal from the standard
+# library), so the budget leaves room for noise but not for numpy-sized imports.
+HEADLESS_MODULES = ("quiz_logic", "battle_engine", "log_records")
+BUDGET_MS = 50.0
+RUNS = 5
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure(module):
+    """Best cumulative cold-import time (ms) over RUNS fresh interpreters, and whether tkinter got pulled in."""
+    code = f"import sys, {module}; print('tkinter' in sys.modules)"
+    best = None
+    uses_tk = False
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             capture_output=True, text=True, check=True)
+        uses_tk = uses_tk or out.stdout.strip() == "True"
+        for match in IMPORT_LINE.finditer(out.stderr):
+            if match.group(3) == module:
+                ms = int(match.group(2)) / 1000
+                best = ms if best is None else min(best, ms)
+    return best, uses_tk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the headless game logic imports fast and without tkinter.")
+    parser.add_argument("modules", nargs="*", default=HEADLESS_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        ms, uses_tk = measure(module)
+        problems = []
+        if uses_tk:
+            problems.append("imports tkinter")
+        if ms is None or ms > args.budget_ms:
+            problems.append(f"over {args.budget_ms:.0f} ms budget")
+        failed = failed or bool(problems)
+        status = "FAIL: " + ", ".join(problems) if problems else "ok"
+        print(f"{module:<16} {ms if ms is not None else float('nan'):>7.1f} ms  {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import importlib
+import time
+import tkinter as tk
+
+# (button text, module, class, description). Modules are imported on first pick.
+GAMES = [
+    ("⚔️ Math Battle Arena", "hero_monster_v3", "BattleConverterGame",
+     "Beat monsters with km ↔ m conversions"),
+    ("🚀 Rocket Launch", "rocket", "RocketLaunchGame",
+     "Convert the altitude to launch the rocket"),
+    ("🌟 Distance Converter Adventure", "andre_v2", "KidsConversionGame",
+     "Practice km ↔ m with hints and achievements"),
+    ("➗ Division Quiz", "division_quiz02", "DivisionQuizApp",
+     "Times-table division practice"),
+]
+
+
+class GameLauncher:
+    """One Tk root for every game: pick a game, play it, come back to the menu.
+
+    Games are imported the first time they are picked and built inside this
+    root (they take root/on_exit). Going back tears the game's widgets,
+    timers and key bindings down without restarting Python or Tk.
+    """
+
+    def __init__(self):
+        self.root = tk.Tk()
+        self.game = None
+        self.last_switch_ms = None
+        self.colors = {
+            'bg': '#1a1a2e',
+            'card': '#16213e',
+            'accent': '#ffd700',
+            'text': '#ffffff',
+            'muted': '#a0a0c0'
+        }
+        self.show_menu()
+
+    def clear_root(self):
+        """Remove everything a game left on the root: widgets, timers, bindings"""
+        for after_id in self.root.tk.splitlist(self.root.tk.call('after', 'info')):
+            self.root.after_cancel(after_id)
+        for child in self.root.winfo_children():
+            child.destroy()
+        for sequence in self.root.bind():
+            self.root.unbind(sequence)
+        self.root.protocol("WM_DELETE_WINDOW", self.root.destroy)
+
+    def show_menu(self):
+        self.game = None
+        self.clear_root()
+        self.root.title("🎮 Maths Quiz Games")
+        self.root.geometry("520x520")
+        self.root.configure(bg=self.colors['bg'])
+
+        tk.Label(
+            self.root,
+            text="🎮 Pick a game!",
+            font=('Arial', 26, 'bold'),
+            fg=self.colors['accent'],
+            bg=self.colors['bg']
+        ).pack(pady=(25, 15))
+
+        for title, module, class_name, description in GAMES:
+            card = tk.Frame(self.root, bg=self.colors['card'], padx=10, pady=8)
+            card.pack(fill='x', padx=30, pady=6)
+            tk.Button(
+                card,
+                text=title,
+                font=('Arial', 14, 'bold'),
+                width=28,
+                cursor='hand2',
+                command=lambda m=module, c=class_name: self.open_game(m, c)
+            ).pack()
+            tk.Label(
+                card,
+                text=description,
+                font=('Arial', 10),
+                fg=self.colors['muted'],
+                bg=self.colors['card']
+            ).pack()
+
+        if self.last_switch_ms is not None:
+            tk.Label(
+                self.root,
+                text=f"Last switch: {self.last_switch_ms:.0f} ms",
+                font=('Arial', 9),
+                fg=self.colors['muted'],
+                bg=self.colors['bg']
+            ).pack(side='bottom', pady=8)
+
+    def open_game(self, module_name, class_name):
+        start = time.perf_counter()
+        game_class = getattr(importlib.import_module(module_name), class_name)
+        self.clear_root()
+        self.game = game_class(self.root, on_exit=self.back_to_menu)
+        self.root.update_idletasks()
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+
+    def back_to_menu(self):
+        # Called from inside the game's own callbacks, so rebuild once they return
+        self.root.after_idle(self.show_menu)
+
+    def run(self):
+        self.root.mainloop()
+
+
+if __name__ == "__main__":
+    GameLauncher().run()
@@ -0,0 +1,200 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+from log_records import DIVISION_HEADER, parse_division_row, parse_legacy_line
+
+CHUNK_BYTES = 32 * 1024 * 1024
+MISSED_CAPACITY = 2000
+
+
+class BoundedCounter(Counter):
+    """Counter that forgets its rarest keys once it grows past `capacity`."""
+
+    def __init__(self, capacity=MISSED_CAPACITY):
+        super().__init__()
+        self.capacity = capacity
+
+    def add(self, key, count=1):
+        self[key] += count
+        if len(self) > self.capacity:
+            self.prune()
+
+    def merge(self, other):
+        for key, count in other.items():
+            self[key] += count
+        if len(self) > self.capacity:
+            self.prune()
+
+    def prune(self):
+        keep = self.most_common(self.capacity // 2)
+        self.clear()
+        self.update(dict(keep))
+
+
+def new_stats():
+    return {"attempts": 0, "correct": 0, "best_streak": 0, "max_level": 0, "max_difficulty": 0}
+
+
+def add_record(stats, record):
+    stats["attempts"] += 1
+    if record["ok"]:
+        stats["correct"] += 1
+    stats["best_streak"] = max(stats["best_streak"], record["streak"])
+    # "level" is the battle level in battle records and the difficulty in kids records
+    if record["game"] == "battle":
+        stats["max_level"] = max(stats["max_level"], record["level"])
+    elif record["game"] == "kids":
+        stats["max_difficulty"] = max(stats["max_difficulty"], record["level"])
+
+
+def merge_stats(into, other):
+    into["attempts"] += other["attempts"]
+    into["correct"] += other["correct"]
+    into["best_streak"] = max(into["best_streak"], other["best_streak"])
+    into["max_level"] = max(into["max_level"], other["max_level"])
+    into["max_difficulty"] = max(into["max_difficulty"], other["max_difficulty"])
+
+
+def conversion_label(record):
+    if record["direction"] == "km_to_m":
+        return f"{record['value']} km → m"
+    if record["direction"] == "m_to_km":
+        return f"{record['value']} m → km"
+    return record["value"].replace("/", " ÷ ")
+
+
+def student_name(path, mode):
+    if mode == "file":
+        return os.path.splitext(os.path.basename(path))[0]
+    return os.path.basename(os.path.dirname(os.path.abspath(path))) or "unknown"
+
+
+def file_kind(path):
+    with open(path, 'rb') as f:
+        first = f.readline().decode('utf-8', 'replace')
+    return "division" if first.startswith(DIVISION_HEADER) else "text"
+
+
+def plan_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """Split a file into byte ranges; each line belongs to the range holding its first byte."""
+    size = os.path.getsize(path)
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+
+
+def read_lines(path, start, end):
+    with open(path, 'rb') as f:
+        if start:
+            # The line straddling `start` was read by the previous chunk
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line.decode('utf-8', 'replace')
+
+
+def read_records(path, kind, start, end):
+    lines = read_lines(path, start, end)
+    if kind == "division":
+        for row in csv.reader(lines):
+            if len(row) < 8 or row[0] == "datetime":
+                continue
+            try:
+                record = parse_division_row(row)
+            except ValueError:
+                continue
+            yield record
+    else:
+        for line in lines:
+            record = parse_legacy_line(line)
+            if record is not None:
+                yield record
+
+
+def analyze_chunk(task):
+    path, kind, student, start, end = task
+    by_day = {}
+    by_student = {}
+    missed = BoundedCounter()
+    for record in read_records(path, kind, start, end):
+        day = datetime.date.fromtimestamp(record["ts"]).isoformat()
+        add_record(by_day.setdefault(day, new_stats()), record)
+        add_record(by_student.setdefault(student, new_stats()), record)
+        if record["ok"] is False:
+            missed.add(conversion_label(record))
+    return by_day, by_student, dict(missed)
+
+
+def analyze(paths, workers=None, student_mode="dir", chunk_bytes=CHUNK_BYTES):
+    tasks = []
+    for path in paths:
+        kind = file_kind(path)
+        student = student_name(path, student_mode)
+        for start, end in plan_chunks(path, chunk_bytes):
+            tasks.append((path, kind, student, start, end))
+
+    by_day = {}
+    by_student = {}
+    missed = BoundedCounter()
+    with Pool(workers or os.cpu_count()) as pool:
+        for chunk_day, chunk_student, chunk_missed in pool.imap_unordered(analyze_chunk, tasks):
+            for day, stats in chunk_day.items():
+                merge_stats(by_day.setdefault(day, new_stats()), stats)
+            for student, stats in chunk_student.items():
+                merge_stats(by_student.setdefault(student, new_stats()), stats)
+            missed.merge(chunk_missed)
+    return by_day, by_student, missed
+
+
+def accuracy(stats):
+    return (stats["correct"] / stats["attempts"] * 100) if stats["attempts"] else 0
+
+
+def print_table(title, rows):
+    print(f"=== {title} ===")
+    print(f"{'':<20} {'attempts':>9} {'accuracy':>9} {'best streak':>12} {'level':>6} {'difficulty':>10}")
+    for name, stats in rows:
+        print(f"{name:<20} {stats['attempts']:>9} {accuracy(stats):>8.1f}% "
+              f"{stats['best_streak']:>12} {stats['max_level']:>6} {stats['max_difficulty']:>10}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy, streak and level report over game logs.")
+    parser.add_argument("logs", nargs="+", help="battle/kids/rocket text logs or division CSV logs")
+    parser.add_argument("--student-from", choices=("dir", "file"), default="dir",
+                        help="name students after the log's folder (default) or file name")
+    parser.add_argument("--top", type=int, default=15, help="how many most-missed conversions to show")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // (1024 * 1024))
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    by_day, by_student, missed = analyze(args.logs, args.workers, args.student_from,
+                                         args.chunk_mb * 1024 * 1024)
+    print_table("Per day", sorted(by_day.items()))
+    print_table("Per student", sorted(by_student.items()))
+    print("=== Most missed conversions ===")
+    for label, count in missed.most_common(args.top):
+        print(f"{count:>6}  {label}")
+
+    if args.json:
+        report = {
+            "per_day": by_day,
+            "per_student": by_student,
+            "most_missed": missed.most_common(args.top),
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
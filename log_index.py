@@ -0,0 +1,168 @@
+"""Sidecar time index for the text/CSV attempt logs.
+
+<log>.idx holds a small header and then (timestamp, byte offset) pairs, one
+for roughly every STRIDE bytes of log. Timestamps are stored as the integer
+YYYYMMDDHHMMSS so they sort like the text they came from. The index is
+extended incrementally as the log grows, and range queries binary-search it
+through mmap before scanning only the lines inside the range.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+INDEX_MAGIC = b"MQIX"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<4sHHqq")  # magic, version, unused, bytes indexed so far, log inode
+ENTRY = struct.Struct("<qq")       # timestamp key, byte offset of the line
+STRIDE = 64 * 1024
+
+
+def line_key(line):
+    """Timestamp key of a log line as YYYYMMDDHHMMSS, or None if the line has none."""
+    if line[:1] == b"[":
+        stamp = line[1:20]
+    else:
+        stamp = line[:19]  # division CSV rows start with the bare timestamp
+    if len(stamp) != 19 or stamp[4:5] != b"-" or stamp[10:11] != b" ":
+        return None
+    digits = stamp[0:4] + stamp[5:7] + stamp[8:10] + stamp[11:13] + stamp[14:16] + stamp[17:19]
+    if not digits.isdigit():
+        return None
+    return int(digits)
+
+
+def text_key(text, end=False):
+    """Turn 'YYYY-MM-DD[ HH[:MM[:SS]]]' into a timestamp key. end=True rounds up."""
+    digits = "".join(ch for ch in text if ch.isdigit())
+    if len(digits) not in (8, 10, 12, 14):
+        raise ValueError(f"Unrecognised time: {text!r}")
+    pad = "9" if end else "0"
+    return int(digits + pad * (14 - len(digits)))
+
+
+def index_path(log_path):
+    return log_path + ".idx"
+
+
+def log_identity(log_path):
+    return os.stat(log_path).st_ino
+
+
+def update_index(log_path, stride=STRIDE):
+    """Bring <log>.idx up to date with the log, indexing only what was appended."""
+    idx_path = index_path(log_path)
+    log_size = os.path.getsize(log_path)
+    identity = log_identity(log_path)
+    indexed = 0
+    last_offset = -stride
+    if os.path.exists(idx_path):
+        with open(idx_path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) == HEADER.size:
+                magic, version, _, indexed, stored_identity = HEADER.unpack(header)
+                if magic != INDEX_MAGIC or version != INDEX_VERSION or stored_identity != identity \
+                        or indexed > log_size:
+                    indexed = 0  # different or truncated log: start again
+                else:
+                    entries = (os.path.getsize(idx_path) - HEADER.size) // ENTRY.size
+                    if entries:
+                        f.seek(HEADER.size + (entries - 1) * ENTRY.size)
+                        last_offset = ENTRY.unpack(f.read(ENTRY.size))[1]
+    if indexed == 0:
+        with open(idx_path, 'wb') as f:
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, 0, identity))
+        last_offset = -stride
+    if indexed >= log_size:
+        return
+
+    new_entries = []
+    pos = indexed
+    with open(log_path, 'rb') as f:
+        f.seek(pos)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # half-written last line; pick it up next time
+            if pos - last_offset >= stride:
+                key = line_key(line)
+                if key is not None:
+                    new_entries.append(ENTRY.pack(key, pos))
+                    last_offset = pos
+            pos += len(line)
+
+    with open(idx_path, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        f.write(b"".join(new_entries))
+        f.seek(0)
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, pos, identity))
+
+
+def start_offset(idx_path, start_key):
+    """Offset of the last indexed line strictly before start_key (0 if none)."""
+    size = os.path.getsize(idx_path)
+    count = (size - HEADER.size) // ENTRY.size
+    if count == 0:
+        return 0
+    with open(idx_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries = memoryview(mm)[HEADER.size:HEADER.size + count * ENTRY.size].cast('q')
+        try:
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if entries[mid * 2] < start_key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return entries[(lo - 1) * 2 + 1] if lo else 0
+        finally:
+            entries.release()
+
+
+def read_range(log_path, start, end, update=True):
+    """Yield the log lines whose timestamp is in [start, end). start/end are keys or text."""
+    start_key = text_key(start) if isinstance(start, str) else start
+    end_key = text_key(end, end=True) + 1 if isinstance(end, str) else end
+    if update:
+        update_index(log_path)
+    offset = start_offset(index_path(log_path), start_key)
+    if os.path.getsize(log_path) == 0:
+        return
+    with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = offset
+        while pos < size:
+            newline = mm.find(b"\n", pos)
+            stop = size if newline < 0 else newline + 1
+            line = mm[pos:stop]
+            pos = stop
+            key = line_key(line)
+            if key is None:
+                continue
+            if key >= end_key:
+                break
+            if key >= start_key:
+                yield line.decode('utf-8', 'replace')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the log lines between two times using a sidecar index.")
+    parser.add_argument("log")
+    parser.add_argument("--from", dest="start", help="e.g. 2025-03-04 or '2025-03-04 15:30'")
+    parser.add_argument("--to", dest="end", help="inclusive; defaults to the end of --from's day")
+    parser.add_argument("--build", action="store_true", help="only build/update the index")
+    args = parser.parse_args()
+
+    update_index(args.log)
+    if args.build:
+        print(f"Index up to date: {index_path(args.log)}")
+        return
+    if not args.start:
+        parser.error("--from is required unless --build is given")
+    end = args.end or args.start[:10]
+    for line in read_range(args.log, args.start, end, update=False):
+        sys.stdout.write(line)
+
+
+if __name__ == "__main__":
+    main()
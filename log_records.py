@@ -0,0 +1,339 @@
+"""Structured attempt records shared by every game, plus a converter for old text logs.
+
+One record per answered question:
+
+    v           schema version
+    ts          unix time of the answer (seconds)
+    game        "battle", "kids", "rocket" or "division"
+    qid         stable question id (crc32 of "<direction>:<value>", 8 hex digits)
+    direction   "km_to_m", "m_to_km" or "div"
+    sig_figs    significant figures the answer is graded to (0 = exact / unknown)
+    value       the number in the question, as shown ("12.5", or "84/7" for division)
+    correct     the expected answer, as shown
+    user        what the student typed
+    ok          true / false, or null for input that could not be graded
+    streak, level, hero_hp, hero_max_hp, monster_hp, monster_max_hp
+                game state after the answer (0 when the game has no such thing);
+                level is the battle level in "battle" records and the difficulty
+                level (1-3) in "kids" records, including hero_monster.py's, whose
+                dungeon level is not recorded
+    elapsed_ms  time from question shown to answer, or null if unknown
+    seed        content seed of the game session (v2+), or null if unknown;
+                the session's questions can be regenerated from it
+    question    number of the question in its session, from 0: the n of
+                quiz_logic.question_rng(seed, n) (v3+), or null for games
+                that do not number their questions
+
+v4 records have the same fields as v3. Only how questions are drawn from
+a seed changed (quiz_logic.question_rng and the battle value draw), so the
+questions of older records cannot be regenerated from their seed.
+
+Records are written as JSONL (one compact object per line) or as a fixed-width
+binary file (MAGIC header then RECORD_STRUCT rows).
+"""
+import datetime
+import itertools
+import json
+import os
+import re
+import struct
+import zlib
+
+SCHEMA_VERSION = 4
+
+GAMES = ("battle", "kids", "rocket", "division")
+DIRECTIONS = ("km_to_m", "m_to_km", "div")
+
+FIELDS = ("v", "ts", "game", "qid", "direction", "sig_figs", "value", "correct", "user", "ok",
+          "streak", "level", "hero_hp", "hero_max_hp", "monster_hp", "monster_max_hp", "elapsed_ms", "seed",
+          "question")
+
+# Fixed-width binary layout (little endian, 90 bytes per record since v3; v2 files had no
+# question number and 86, v1 files no seed either and 78)
+MAGIC = b"MQLG"
+HEADER_STRUCT = struct.Struct("<4sHH")
+RECORD_STRUCT = struct.Struct("<HdBBIB12s12s16sbHHhhiiIQI")
+RECORD_STRUCT_V2 = struct.Struct("<HdBBIB12s12s16sbHHhhiiIQ")
+RECORD_STRUCT_V1 = struct.Struct("<HdBBIB12s12s16sbHHhhiiI")
+NO_ELAPSED = 0xFFFFFFFF
+NO_SEED = 0xFFFFFFFFFFFFFFFF
+NO_QUESTION = 0xFFFFFFFF
+
+
+def question_id(direction, value):
+    return f"{zlib.crc32(f'{direction}:{value}'.encode('utf-8')):08x}"
+
+
+def make_record(game, direction, value, correct, user, ok, sig_figs=0, streak=0, level=0,
+                hero_hp=0, hero_max_hp=0, monster_hp=0, monster_max_hp=0,
+                elapsed_ms=None, ts=None, seed=None, question=None):
+    """Build one record dict with every schema field filled in."""
+    value = str(value)
+    return {
+        "v": SCHEMA_VERSION,
+        "ts": round(ts if ts is not None else datetime.datetime.now().timestamp(), 3),
+        "game": game,
+        "qid": question_id(direction, value),
+        "direction": direction,
+        "sig_figs": sig_figs,
+        "value": value,
+        "correct": str(correct),
+        "user": str(user),
+        "ok": ok,
+        "streak": streak,
+        "level": level,
+        "hero_hp": hero_hp,
+        "hero_max_hp": hero_max_hp,
+        "monster_hp": monster_hp,
+        "monster_max_hp": monster_max_hp,
+        "elapsed_ms": None if elapsed_ms is None else int(elapsed_ms),
+        "seed": seed,
+        "question": question,
+    }
+
+
+# --------- JSONL ---------
+def to_jsonl(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# --------- fixed-width binary ---------
+def _fixed(text, size):
+    # Truncate on a character boundary so the field always decodes
+    data = text.encode('utf-8')
+    while len(data) > size:
+        text = text[:-1]
+        data = text.encode('utf-8')
+    return data
+
+
+def pack_record(record):
+    ok = record["ok"]
+    elapsed = record["elapsed_ms"]
+    seed = record.get("seed")
+    question = record.get("question")
+    return RECORD_STRUCT.pack(
+        record["v"],
+        record["ts"],
+        GAMES.index(record["game"]),
+        DIRECTIONS.index(record["direction"]),
+        int(record["qid"], 16),
+        record["sig_figs"],
+        _fixed(record["value"], 12),
+        _fixed(record["correct"], 12),
+        _fixed(record["user"], 16),
+        -1 if ok is None else int(ok),
+        record["streak"],
+        record["level"],
+        record["hero_hp"],
+        record["hero_max_hp"],
+        record["monster_hp"],
+        record["monster_max_hp"],
+        NO_ELAPSED if elapsed is None else min(int(elapsed), NO_ELAPSED - 1),
+        NO_SEED if seed is None else seed,
+        NO_QUESTION if question is None else question,
+    )
+
+
+def unpack_record(data):
+    if len(data) == RECORD_STRUCT_V1.size:
+        fields = RECORD_STRUCT_V1.unpack(data) + (NO_SEED, NO_QUESTION)
+    elif len(data) == RECORD_STRUCT_V2.size:
+        fields = RECORD_STRUCT_V2.unpack(data) + (NO_QUESTION,)
+    else:
+        fields = RECORD_STRUCT.unpack(data)
+    (v, ts, game, direction, qid, sig_figs, value, correct, user, ok, streak, level,
+     hero_hp, hero_max_hp, monster_hp, monster_max_hp, elapsed, seed, question) = fields
+    return {
+        "v": v,
+        "ts": ts,
+        "game": GAMES[game],
+        "qid": f"{qid:08x}",
+        "direction": DIRECTIONS[direction],
+        "sig_figs": sig_figs,
+        "value": value.rstrip(b"\0").decode('utf-8'),
+        "correct": correct.rstrip(b"\0").decode('utf-8'),
+        "user": user.rstrip(b"\0").decode('utf-8'),
+        "ok": None if ok < 0 else bool(ok),
+        "streak": streak,
+        "level": level,
+        "hero_hp": hero_hp,
+        "hero_max_hp": hero_max_hp,
+        "monster_hp": monster_hp,
+        "monster_max_hp": monster_max_hp,
+        "elapsed_ms": None if elapsed == NO_ELAPSED else elapsed,
+        "seed": None if seed == NO_SEED else seed,
+        "question": None if question == NO_QUESTION else question,
+    }
+
+
+def binary_header():
+    return HEADER_STRUCT.pack(MAGIC, SCHEMA_VERSION, RECORD_STRUCT.size)
+
+
+def read_binary(path):
+    with open(path, 'rb') as f:
+        magic, version, size = HEADER_STRUCT.unpack(f.read(HEADER_STRUCT.size))
+        if magic != MAGIC or size not in (RECORD_STRUCT.size, RECORD_STRUCT_V2.size, RECORD_STRUCT_V1.size):
+            raise ValueError(f"{path} is not an attempt record file")
+        while True:
+            data = f.read(size)
+            if len(data) < size:
+                break
+            yield unpack_record(data)
+
+
+# --------- legacy text logs ---------
+TS = r"^\[(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] "
+BATTLE_LINE = re.compile(
+    TS + r"(?P<mark>[✓✗]) Q: (?P<q>.*) \| User: (?P<user>.*) \| Correct: (?P<correct>[^|]*) \| "
+    r"Streak: (?P<streak>\d+) \| Lv (?P<level>\d+) \| "
+    r"Hero (?P<hero_hp>-?\d+)/(?P<hero_max_hp>\d+) \| Monster (?P<monster_hp>-?\d+)/(?P<monster_max_hp>\d+)$"
+)
+KIDS_LINE = re.compile(
+    TS + r"Q: (?P<q>.*) \| User: (?P<user>.*) \| Correct: (?P<correct>[^|]*) \| (?P<result>CORRECT|INCORRECT)"
+    r"(?: \| Streak: (?P<streak>\d+) \| Level: (?P<level>\d+))?"
+    r"(?: \| HeroHP (?P<hero_hp>-?\d+)/(?P<hero_max_hp>\d+) \| MonsterHP (?P<monster_hp>-?\d+)/(?P<monster_max_hp>\d+))?$"
+)
+ROCKET_LINE = re.compile(
+    TS + r"Conversion: (?P<value>\S+) (?P<unit_from>meters|km) to (?P<unit_to>\S+) \| "
+    r"Input: (?P<user>.*) \| Target: (?P<correct>\S+) \| (?P<result>SUCCESS|FAILED)$"
+)
+QUESTION_VALUE = re.compile(r"(\d+(?:\.\d+)?)\s*(kilometers|km|meters|m)\b")
+DIVISION_HEADER = "datetime,question_number,dividend,divisor"
+
+
+def parse_timestamp(text):
+    return datetime.datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+
+
+def infer_sig_figs(value):
+    # Old logs never stored sig figs; count the digits the value actually shows
+    digits = value.replace(".", "").lstrip("0")
+    if "." not in value:
+        digits = digits.rstrip("0")
+    return max(1, len(digits))
+
+
+def question_direction(question):
+    match = QUESTION_VALUE.search(question)
+    if not match:
+        return None, None
+    value, unit = match.groups()
+    return ("km_to_m" if unit in ("km", "kilometers") else "m_to_km"), value
+
+
+def _int(match, name):
+    text = match.group(name)
+    return int(text) if text is not None else 0
+
+
+def parse_legacy_line(line):
+    """Turn one line of battle_log.txt / kids_conversion_log.txt / rocket_launch_log.txt into a record."""
+    line = line.rstrip("\r\n")
+    match = BATTLE_LINE.match(line)
+    if match:
+        game, ok = "battle", match.group("mark") == "✓"
+    else:
+        match = KIDS_LINE.match(line)
+        if match:
+            game, ok = "kids", match.group("result") == "CORRECT"
+    if match:
+        direction, value = question_direction(match.group("q"))
+        if direction is None:
+            return None
+        return make_record(
+            game, direction, value, match.group("correct").strip(), match.group("user"), ok,
+            sig_figs=infer_sig_figs(value),
+            streak=_int(match, "streak"), level=_int(match, "level"),
+            hero_hp=_int(match, "hero_hp"), hero_max_hp=_int(match, "hero_max_hp"),
+            monster_hp=_int(match, "monster_hp"), monster_max_hp=_int(match, "monster_max_hp"),
+            ts=parse_timestamp(match.group("ts")),
+        )
+
+    match = ROCKET_LINE.match(line)
+    if match:
+        direction = "m_to_km" if match.group("unit_from") == "meters" else "km_to_m"
+        return make_record(
+            "rocket", direction, match.group("value"), match.group("correct"), match.group("user"),
+            match.group("result") == "SUCCESS",
+            ts=parse_timestamp(match.group("ts")),
+        )
+    return None
+
+
+def parse_division_row(row):
+    """Turn one division_quiz_log.csv row (either quiz version) into a record."""
+    ts = datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S").timestamp()
+    dividend, divisor, answer, user, valid, correct = row[2:8]
+    return make_record(
+        "division", "div", f"{dividend}/{divisor}", answer, user,
+        None if valid != "yes" else correct == "yes",
+        streak=int(row[11]) if len(row) > 11 and row[11] else 0,
+        ts=ts,
+    )
+
+
+def convert_legacy(lines):
+    """Yield records from an iterable of legacy log lines, skipping headers and junk."""
+    lines = iter(lines)
+    first = next(lines, "")
+    if first.startswith(DIVISION_HEADER):
+        # csv and argparse are imported where used, to keep this module quick to import
+        import csv
+        for row in csv.reader(lines):
+            if len(row) >= 8:
+                try:
+                    yield parse_division_row(row)
+                except ValueError:
+                    continue
+        return
+    for line in itertools.chain([first], lines):
+        record = parse_legacy_line(line)
+        if record is not None:
+            yield record
+
+
+def convert_file(src, dst, binary=False):
+    count = 0
+    with open(src, encoding='utf-8', errors='replace', newline='') as f_in, \
+            open(dst, 'wb' if binary else 'w', **({} if binary else {"encoding": "utf-8"})) as f_out:
+        if binary:
+            f_out.write(binary_header())
+        for record in convert_legacy(f_in):
+            f_out.write(pack_record(record) if binary else to_jsonl(record))
+            count += 1
+    return count
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert old game logs to structured attempt records.")
+    parser.add_argument("logs", nargs="+", help="battle_log.txt, kids_conversion_log.txt, "
+                                                "rocket_launch_log.txt or division_quiz_log.csv")
+    parser.add_argument("--binary", action="store_true", help="write fixed-width .bin instead of .jsonl")
+    parser.add_argument("-o", "--output", help="output file (only with a single input); by default "
+                                              "battle_log.converted.jsonl and so on, so the .jsonl "
+                                              "records the games write themselves are left alone")
+    parser.add_argument("--force", action="store_true", help="overwrite output files that already exist")
+    args = parser.parse_args()
+
+    if args.output and len(args.logs) > 1:
+        parser.error("--output needs exactly one input log")
+    for src in args.logs:
+        dst = args.output or src.rsplit(".", 1)[0] + (".converted.bin" if args.binary else ".converted.jsonl")
+        if os.path.exists(dst) and not args.force:
+            parser.error(f"{dst} already exists; pass --force to overwrite it")
+        count = convert_file(src, dst, args.binary)
+        print(f"{src}: {count} records -> {dst}")
+
+
+if __name__ == "__main__":
+    main()
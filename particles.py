@@ -0,0 +1,120 @@
+import math
+import random
+
+MAX_PARTICLES = 160
+TICK_MS = 30
+
+
+class ParticleSystem:
+    """Spark particles drawn with a fixed pool of canvas ovals.
+
+    Particle state lives in flat per-slot lists and every live particle is
+    advanced by one tick() callback, either from its own after() loop or as
+    one animation on a FrameClock. Velocities and lifetimes are per tick_ms.
+    Ovals are created on first use up to max_particles and then hidden and
+    reused; when the pool is full the oldest spark is recycled for the new one.
+    """
+
+    def __init__(self, canvas, max_particles=MAX_PARTICLES, tick_ms=TICK_MS, radius=4, clock=None, rng=random):
+        self.canvas = canvas
+        self.rng = rng
+        self.clock = clock
+        self.max_particles = max_particles
+        self.tick_ms = tick_ms
+        self.radius = radius
+
+        self.items = []
+        self.x = [0.0] * max_particles
+        self.y = [0.0] * max_particles
+        self.dx = [0.0] * max_particles
+        self.dy = [0.0] * max_particles
+        self.life = [0.0] * max_particles
+        self.active = []
+        self.free = []
+        self.after_id = None
+
+    def burst(self, x, y, count=12, colors=('#ff0000', '#ff6600', '#ffff00', '#ffffff'),
+              speed=(3, 8), steps=15):
+        """Throw `count` sparks out of (x, y) in random directions for `steps` ticks."""
+        for _ in range(count):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            velocity = self.rng.uniform(*speed)
+            self.spawn(x, y, math.cos(angle) * velocity, math.sin(angle) * velocity,
+                       self.rng.choice(colors), steps)
+        self.canvas.tag_raise('particle')
+        self.start()
+
+    def spawn(self, x, y, dx, dy, color, steps):
+        slot = self.take_slot()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.life[slot] = steps
+        r = self.radius
+        item = self.items[slot]
+        self.canvas.coords(item, x - r, y - r, x + r, y + r)
+        self.canvas.itemconfig(item, fill=color, state='normal')
+
+    def take_slot(self):
+        if self.free:
+            slot = self.free.pop()
+        elif len(self.items) < self.max_particles:
+            slot = len(self.items)
+            self.items.append(self.canvas.create_oval(0, 0, 0, 0, outline='', state='hidden',
+                                                      tags='particle'))
+        else:
+            # Pool exhausted: steal the oldest live spark
+            slot = self.active.pop(0)
+        self.active.append(slot)
+        return slot
+
+    def tick(self, steps=1.0):
+        """Advance every live particle by `steps` ticks; returns True while any are still alive."""
+        canvas = self.canvas
+        x, y, dx, dy, life, items = self.x, self.y, self.dx, self.dy, self.life, self.items
+        r = self.radius
+        still_alive = []
+        for slot in self.active:
+            life[slot] -= steps
+            if life[slot] < 0:
+                canvas.itemconfig(items[slot], state='hidden')
+                self.free.append(slot)
+                continue
+            x[slot] += dx[slot] * steps
+            y[slot] += dy[slot] * steps
+            canvas.coords(items[slot], x[slot] - r, y[slot] - r, x[slot] + r, y[slot] + r)
+            still_alive.append(slot)
+        self.active = still_alive
+        return bool(still_alive)
+
+    def start(self):
+        if self.after_id is not None:
+            return
+        if self.clock is not None:
+            self.after_id = self.clock.add(self.clock_step)
+        else:
+            self.after_id = self.canvas.after(self.tick_ms, self.run)
+
+    def run(self):
+        self.after_id = None
+        if self.tick():
+            self.after_id = self.canvas.after(self.tick_ms, self.run)
+
+    def clock_step(self, dt, elapsed):
+        if self.tick(dt / self.tick_ms):
+            return True
+        self.after_id = None
+        return False
+
+    def clear(self):
+        if self.after_id is not None:
+            if self.clock is not None:
+                self.clock.cancel(self.after_id)
+            else:
+                self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        for slot in self.active:
+            self.canvas.itemconfig(self.items[slot], state='hidden')
+            self.free.append(slot)
+        self.active = []
@@ -0,0 +1,155 @@
+import argparse
+import csv
+
+import numpy as np
+
+import quiz_logic
+from battle_engine import BattleEngine
+from quiz_logic import format_number
+
+# Same rules as BattleEngine.generate_question_once; ranges come from quiz_logic.difficulty_ranges
+SIG_FIGS = np.array([1, 2, 3, 4], dtype=np.int8)
+SIG_FIG_WEIGHTS = np.array([1, 3, 3, 2], dtype=float) / 9
+ALTERNATE_WEIGHT = 0.85
+
+KM_TO_M = 0
+M_TO_KM = 1
+CONVERSION_TYPES = ("km_to_m", "m_to_km")
+UNITS = (("km", "m"), ("m", "km"))
+
+# Template ids 0-4 are km templates, 5-9 are m templates
+TEMPLATES = BattleEngine.KM_TEMPLATES + BattleEngine.M_TEMPLATES
+KM_TEMPLATE_COUNT = len(BattleEngine.KM_TEMPLATES)
+M_TEMPLATE_COUNT = len(BattleEngine.M_TEMPLATES)
+
+
+def round_sig_array(x, sig):
+    """Vectorised round_sig: round every x to its own number of significant figures."""
+    x = np.asarray(x, dtype=float)
+    sig = np.clip(np.asarray(sig), 1, 6)
+    nonzero = x != 0
+    exp = np.floor(np.log10(np.where(nonzero, np.abs(x), 1.0))).astype(np.int64)
+    shift = exp - sig + 1
+    # Scale by an exact power of ten so the mantissa and divisor are both integers
+    up = np.power(10.0, np.maximum(-shift, 0))
+    down = np.power(10.0, np.maximum(shift, 0))
+    mantissa = np.round(x * up / down)
+    return np.where(nonzero, mantissa * down / up, 0.0)
+
+
+class QuestionBatch:
+    """Columnar km/m questions; question text is only built when asked for."""
+
+    def __init__(self, conversion, values, answers, sig_figs, template_ids, difficulty, seed):
+        self.conversion = conversion
+        self.values = values
+        self.answers = answers
+        self.sig_figs = sig_figs
+        self.template_ids = template_ids
+        self.difficulty = difficulty
+        self.seed = seed
+
+    def __len__(self):
+        return len(self.values)
+
+    def conversion_type(self, i):
+        return CONVERSION_TYPES[self.conversion[i]]
+
+    def units(self, i):
+        return UNITS[self.conversion[i]]
+
+    def question_text(self, i):
+        return TEMPLATES[self.template_ids[i]].format(val=format_number(self.values[i]))
+
+    def answer_text(self, i):
+        return format_number(self.answers[i])
+
+    def value_key(self, i):
+        return f"{self.conversion_type(i)}:{format_number(self.values[i])}"
+
+    def rows(self, start=0, stop=None):
+        """Yield one dict per question, rendering text as it goes."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            unit_from, unit_to = self.units(i)
+            yield {
+                "index": i,
+                "question": self.question_text(i),
+                "unit_from": unit_from,
+                "unit_to": unit_to,
+                "value": format_number(self.values[i]),
+                "answer": self.answer_text(i),
+                "sig_figs": int(self.sig_figs[i]),
+                "template_id": int(self.template_ids[i]),
+            }
+
+
+def generate_conversions(rng, n, first=None):
+    # Each question flips direction with probability 0.85, like the 85/15 alternation
+    flips = (rng.random(n) < ALTERNATE_WEIGHT).astype(np.int8)
+    if first is None:
+        flips[0] = rng.integers(0, 2)
+    else:
+        flips[0] = first
+    return np.cumsum(flips, dtype=np.int64).astype(np.int8) % 2
+
+
+def generate_questions(n, difficulty=1, seed=None):
+    """Generate n km/m questions at once and return them as a QuestionBatch."""
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if difficulty not in quiz_logic.DIFFICULTY_LEVELS:
+        raise ValueError(f"difficulty must be one of {quiz_logic.DIFFICULTY_LEVELS}")
+    rng = np.random.default_rng(seed)
+    km_range, m_range = quiz_logic.difficulty_ranges(difficulty)
+
+    conversion = generate_conversions(rng, n)
+    is_km = conversion == KM_TO_M
+    sig_figs = rng.choice(SIG_FIGS, size=n, p=SIG_FIG_WEIGHTS)
+
+    lo = np.where(is_km, km_range[0], m_range[0])
+    hi = np.where(is_km, km_range[1], m_range[1])
+    raw = rng.uniform(lo, hi)
+
+    # Nice round numbers: km to the nearest 10, m to the nearest 1000
+    tweak = rng.random(n)
+    round_km = is_km & (tweak < 0.3) & (sig_figs <= 2)
+    round_m = ~is_km & (tweak < 0.25) & (sig_figs <= 3)
+    raw = np.where(round_km, np.round(raw / 10) * 10, raw)
+    raw = np.where(round_m, np.round(raw / 1000) * 1000, raw)
+
+    values = round_sig_array(raw, sig_figs)
+    answers = np.where(is_km, values * 1000, values / 1000)
+
+    template_ids = np.where(
+        is_km,
+        rng.integers(0, KM_TEMPLATE_COUNT, n),
+        KM_TEMPLATE_COUNT + rng.integers(0, M_TEMPLATE_COUNT, n),
+    ).astype(np.int16)
+
+    return QuestionBatch(conversion, values, answers, sig_figs, template_ids, difficulty, seed)
+
+
+def write_csv(batch, path):
+    fields = ["index", "question", "unit_from", "unit_to", "value", "answer", "sig_figs", "template_id"]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(batch.rows())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a bank of km/m conversion questions.")
+    parser.add_argument("n", type=int, help="number of questions")
+    parser.add_argument("--difficulty", type=int, default=1, choices=quiz_logic.DIFFICULTY_LEVELS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="question_bank.csv")
+    args = parser.parse_args()
+
+    batch = generate_questions(args.n, args.difficulty, args.seed)
+    write_csv(batch, args.output)
+    print(f"Wrote {len(batch)} questions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Question generation, grading and scoring for the km/m, rocket and division games.
+
+Nothing here imports tkinter, so graders, scripts and servers can use the
+same rules as the Tk games without paying for a GUI. The games keep their
+methods as thin wrappers around these functions. Every generator takes an
+optional `rng` (anything with the random module's methods).
+
+Expected answers are exact Decimals from the shown digits, wrapped in an
+AnswerKey when the question is made; grade() is the one grader every game
+uses, so 3.3 km and 3300 m compare with no float rounding in between.
+"""
+import functools
+import hashlib
+import math
+import random
+import re
+import struct
+from decimal import Decimal, InvalidOperation
+
+CONVERSIONS = ("km_to_m", "m_to_km")
+
+
+# --------- number helpers ---------
+def round_sig(x, sig):
+    """Round to a number of significant figures (1–6)."""
+    if x == 0:
+        return 0.0
+    if sig < 1:
+        sig = 1
+    if sig > 6:
+        sig = 6
+    return float(f"{x:.{sig}g}")
+
+
+def format_number(num):
+    """Format number (no trailing zeros; avoid sci-notation for our ranges)."""
+    if abs(num - int(num)) < 1e-12:
+        return str(int(num))
+    return f"{num:.10f}".rstrip('0').rstrip('.')
+
+
+def tolerance_from_sigfigs(true_value, sigfigs):
+    """Set a forgiving tolerance based on displayed significant figures."""
+    if true_value == 0:
+        return 1e-12
+    magnitude = 10 ** (math.floor(math.log10(abs(true_value))) - sigfigs + 1)
+    return max(0.5 * magnitude, 1e-9)
+
+
+# --------- per-session random streams ---------
+def new_seed():
+    """A fresh 32-bit session seed from the OS, independent of the random module's state."""
+    return random.SystemRandom().getrandbits(32)
+
+
+def effects_rng(seed):
+    """Visual-effects stream for a session, so sparks and stars never shift its questions."""
+    return random.Random(f"fx/{seed}")
+
+
+class QuestionRandom(random.Random):
+    """The random.Random API over BLAKE2b digests of (seed, number), for the few numbers one question draws.
+
+    Seeding a Mersenne Twister hashes the seed and fills 2.5 KB of state,
+    about 10 µs, more than a whole question costs to draw. Here one 64-byte
+    digest gives eight 64-bit words, enough for most questions; a longer
+    draw hashes the next block. Only random() and getrandbits() are defined;
+    choice(), randint(), uniform() and the rest are random.Random's, built
+    on those two.
+    """
+
+    WORDS = struct.Struct("<8Q")
+
+    def __init__(self, seed, number):
+        self.prefix = b"q/%d/%d/" % (seed, number)
+        self.words = self.block(0)
+        self.used = 0
+        self.gauss_next = None
+
+    def block(self, n):
+        return self.WORDS.unpack(hashlib.blake2b(self.prefix + b"%d" % n, digest_size=64).digest())
+
+    def next64(self):
+        used = self.used
+        if used and not used % 8:
+            self.words = self.block(used // 8)
+        self.used = used + 1
+        return self.words[used % 8]
+
+    def random(self):
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits >> (-k % 64)
+
+
+def question_rng(seed, number):
+    """Generator for question `number` (from 0) of a session.
+
+    Derived from the seed rather than carried along, so a session keeps
+    a counter instead of a live generator (about 2.5 KB each).
+    """
+    return QuestionRandom(seed, number)
+
+
+# --------- reading typed answers ---------
+# sign, whole digits, decimal point, fraction digits, exponent
+ANSWER_PATTERN = re.compile(r"\s*([+-]?)(\d*)(?:(\.)(\d*))?(?:[eE]([+-]?\d+))?\s*")
+
+
+class AnswerScan:
+    """What scan_answer() read from one typed answer.
+
+    `error` is None, "empty" or "invalid"; the other fields are only set
+    when it is None. `violation` names padding the km/m games forbid:
+    "leading_zeros" (0005), "zero_fraction" (3.0, 0.00) or
+    "trailing_zeros" (2.50). `whole` means bare digits with no sign,
+    point or exponent. Scans are cached and shared, so treat them as read-only.
+    """
+
+    __slots__ = ("value", "sign", "digits", "sig_figs", "violation", "whole", "error")
+
+    def __init__(self, value=None, sign="", digits=0, sig_figs=0, violation=None, whole=False, error=None):
+        self.value = value
+        self.sign = sign
+        self.digits = digits
+        self.sig_figs = sig_figs
+        self.violation = violation
+        self.whole = whole
+        self.error = error
+
+    def __repr__(self):
+        if self.error:
+            return f"AnswerScan(error={self.error!r})"
+        return f"AnswerScan({self.value}, sig_figs={self.sig_figs}, violation={self.violation!r})"
+
+
+EMPTY_SCAN = AnswerScan(error="empty")
+INVALID_SCAN = AnswerScan(error="invalid")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def scan_answer(text):
+    """Read a typed number in one regex match: exact value, figures and zero padding.
+
+    Typed answers repeat a lot (the same 12 or 2.5 from a whole class), so
+    results are memoised.
+    """
+    m = ANSWER_PATTERN.fullmatch(text)
+    if m is None:
+        return INVALID_SCAN
+    sign, int_part, point, frac_part, exponent = m.groups("")
+    if not int_part and not frac_part:
+        return INVALID_SCAN if (sign or point or exponent) else EMPTY_SCAN
+
+    violation = None
+    if not exponent:
+        if len(int_part) > 1 and int_part[0] == "0":
+            violation = "leading_zeros"
+        elif frac_part:
+            if not frac_part.strip("0"):
+                violation = "zero_fraction"
+            elif frac_part[-1] == "0":
+                violation = "trailing_zeros"
+
+    try:
+        value = Decimal(m.group(0))
+    except InvalidOperation:
+        # An exponent too long even for Decimal, like 1e99999999999999999999999
+        return INVALID_SCAN
+
+    significant = (int_part + frac_part).lstrip("0")
+    if not point:
+        # 1200 is read as 2 figures; write 1.200e3 to mean 4
+        significant = significant.rstrip("0")
+    return AnswerScan(
+        value,
+        sign,
+        len(int_part) + len(frac_part),
+        max(len(significant), 1),
+        violation,
+        not (sign or point or exponent),
+    )
+
+
+def has_unnecessary_zeros(s):
+    """True for padded answers like 3.0, 2.50 or 0005."""
+    return scan_answer(s).violation is not None
+
+
+# --------- exact answers ---------
+def decimal_text(value):
+    """Canonical text for a Decimal: plain digits, no exponent or trailing zeros."""
+    text = format(value, "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+class AnswerKey:
+    """The exact expected answer and the inclusive [lo, hi] range that counts as correct."""
+
+    __slots__ = ("value", "text", "lo", "hi", "whole_only")
+
+    def __init__(self, value, tolerance=Decimal(0), whole_only=False):
+        self.value = value
+        self.text = decimal_text(value)
+        self.lo = value - tolerance
+        self.hi = value + tolerance
+        self.whole_only = whole_only
+
+    def accepts(self, value):
+        return self.lo <= value <= self.hi
+
+    def __repr__(self):
+        return f"AnswerKey({self.text}, [{decimal_text(self.lo)}, {decimal_text(self.hi)}])"
+
+
+def sig_fig_key(answer, sig_figs):
+    """Key for an answer given to `sig_figs` figures: half a unit in the last figure either way."""
+    if answer == 0:
+        return AnswerKey(answer, Decimal("1e-12"))
+    # adjusted() is floor(log10(|answer|)), exactly
+    tolerance = max(Decimal(5).scaleb(answer.adjusted() - sig_figs), Decimal("1e-9"))
+    return AnswerKey(answer, tolerance)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def km_answer_key(conversion_type, value_text, sig_figs):
+    """Key for converting the shown value, worked out from its digits rather than the float.
+
+    Cached, so every session asking the same question shares one key.
+    """
+    value = Decimal(value_text)
+    answer = value.scaleb(3) if conversion_type == "km_to_m" else value.scaleb(-3)
+    return sig_fig_key(answer, sig_figs)
+
+
+def rocket_key(target):
+    """Key for a launch value: near-exact (one part in a billion)."""
+    if target == 0:
+        return AnswerKey(target, Decimal("1e-10"))
+    return AnswerKey(target, max(abs(target) * Decimal("1e-9"), Decimal("1e-12")))
+
+
+def whole_number_key(answer):
+    return AnswerKey(Decimal(answer), whole_only=True)
+
+
+def grade(user_input, key, forbid_zeros=False):
+    """Grade a typed answer against an AnswerKey.
+
+    Returns (status, value) with status "empty", "zeros", "invalid",
+    "correct" or "wrong"; value is the parsed Decimal (int for whole-number
+    keys) or None.
+    """
+    return grade_scan(scan_answer(user_input), key, forbid_zeros)
+
+
+def grade_scan(scan, key, forbid_zeros=False):
+    """grade() for an answer that has already been through scan_answer()."""
+    if scan.error:
+        return scan.error, None
+    if key.whole_only:
+        if not scan.whole:
+            return "invalid", None
+        value = int(scan.value)
+        return ("correct" if key.accepts(value) else "wrong"), value
+    if forbid_zeros and scan.violation:
+        return "zeros", None
+    return ("correct" if key.accepts(scan.value) else "wrong"), scan.value
+
+
+# --------- km/m questions (kids games) ---------
+KIDS_KM_TEMPLATES = (
+    "🚀 The spaceship traveled {val} kilometers.\nHow many meters is that?",
+    "🌙 The moon rover drove {val} km across the surface.\nConvert to meters!",
+    "✈️ The airplane flew {val} kilometers.\nWhat's that in meters?",
+    "🏃 The marathon runner completed {val} km.\nHow many meters did they run?",
+    "🚂 The train traveled {val} kilometers.\nExpress this in meters!",
+    "🎈 The hot air balloon drifted {val} km.\nHow many meters is that?"
+)
+KIDS_M_TEMPLATES = (
+    "🌟 The rocket flew {val} meters into the sky.\nHow many kilometers is that?",
+    "🏊 The swimmer completed {val} meters.\nConvert to kilometers!",
+    "🚴 The cyclist rode {val} meters.\nWhat's that in kilometers?",
+    "🎯 The arrow flew {val} meters.\nExpress this in kilometers!",
+    "🦘 The kangaroo hopped {val} meters total.\nHow many km did it hop?",
+    "⛷️ The skier descended {val} meters.\nConvert to kilometers!"
+)
+
+
+DIFFICULTY_LEVELS = (1, 2, 3)
+
+
+def difficulty_ranges(level):
+    """(km_range, m_range) for difficulty 1 (round numbers) to 3 (decimals)."""
+    if level == 1:
+        return (1, 100), (1000, 10000)
+    if level == 2:
+        return (1, 500), (1000, 30000)
+    return (0.5, 999), (500, 50000)
+
+
+def generate_km_question(difficulty, prev_type=None, force_type=None, rng=random, sig_figs=None):
+    """One candidate km/m question (sig figs drawn 1:3:3:2 from 1–4 unless given).
+
+    Returns (question, answer, unit_from, unit_to, sig_figs, conversion_type,
+    value_key, key); `answer` is the float for display, `key` the exact AnswerKey.
+    """
+    if force_type is not None:
+        conversion_type = force_type
+    elif prev_type in CONVERSIONS:
+        other = "m_to_km" if prev_type == "km_to_m" else "km_to_m"
+        # Strong preference for alternating
+        conversion_type = rng.choices([other, prev_type], weights=[0.85, 0.15])[0]
+    else:
+        conversion_type = rng.choice(CONVERSIONS)
+
+    if sig_figs is None:
+        sig_figs = rng.choices([1, 2, 3, 4], weights=[1, 3, 3, 2])[0]
+    km_range, m_range = difficulty_ranges(difficulty)
+
+    if conversion_type == "km_to_m":
+        raw = rng.uniform(*km_range)
+        if rng.random() < 0.3 and sig_figs <= 2:
+            raw = round(raw / 10) * 10
+        value = round_sig(raw, sig_figs)
+        template = rng.choice(KIDS_KM_TEMPLATES)
+        answer = value * 1000
+        unit_from, unit_to = "km", "m"
+    else:
+        raw = rng.uniform(*m_range)
+        if rng.random() < 0.25 and sig_figs <= 3:
+            raw = round(raw / 1000) * 1000
+        value = round_sig(raw, sig_figs)
+        template = rng.choice(KIDS_M_TEMPLATES)
+        answer = value / 1000
+        unit_from, unit_to = "m", "km"
+
+    value_text = format_number(value)
+    return (template.format(val=value_text), answer, unit_from, unit_to, sig_figs,
+            conversion_type, f"{conversion_type}:{value_text}",
+            km_answer_key(conversion_type, value_text, sig_figs))
+
+
+def pick_km_question(difficulty, prev_type, recent, rng=random):
+    """A question whose value isn't in `recent`, preferring to switch direction (up to 100 tries)."""
+    for attempt in range(100):
+        q = generate_km_question(difficulty, prev_type, rng=rng)
+        if q[6] not in recent:
+            if attempt < 10 and prev_type == q[5]:
+                continue
+            return q
+    alternate = "m_to_km" if prev_type == "km_to_m" else "km_to_m"
+    return generate_km_question(difficulty, prev_type, force_type=alternate, rng=rng)
+
+
+def adjust_difficulty(level, score, total, max_level=3):
+    """Difficulty after `total` answers: checked every 10, up at ≥85% and down below 50%."""
+    if total > 0 and total % 10 == 0:
+        accuracy = score / total * 100
+        if accuracy >= 85 and level < max_level:
+            return level + 1
+        if accuracy < 50 and level > 1:
+            return level - 1
+    return level
+
+
+# --------- rocket missions ---------
+def format_altitude(num):
+    """Format number to appropriate precision (up to 5 significant figures)"""
+    if num == int(num):
+        return str(int(num))
+    return f"{num:.5g}"
+
+
+def generate_mission(rng=random):
+    """A 0–4 km launch mission.
+
+    Returns (story, question, value, target, unit_from, unit_to, visual_km, key).
+    """
+    conversion_type = rng.choice(['m_to_km', 'km_to_m'])
+
+    if conversion_type == 'm_to_km':
+        value_types = [
+            # Whole kilometers
+            lambda: rng.randint(0, 4) * 1000,
+            # Half kilometers
+            lambda: rng.choice([500, 1500, 2500, 3500]),
+            # Quarter kilometers
+            lambda: rng.choice([250, 750, 1250, 1750, 2250, 2750, 3250, 3750]),
+            # Decimal kilometers with varying precision
+            lambda: int(rng.uniform(0, 4000)),
+            # More precise values
+            lambda: int(rng.uniform(0, 4000) * 10) / 10,
+        ]
+        value = rng.choice(value_types)()
+        target = value / 1000
+        exact_target = Decimal(str(value)).scaleb(-3)
+        unit_from, unit_to, unit_word = "meters", "km", "meters"
+        visual_km = target
+    else:
+        km_types = [
+            # Whole numbers
+            lambda: float(rng.randint(0, 4)),
+            # Half values
+            lambda: rng.choice([0.5, 1.5, 2.5, 3.5]),
+            # Quarter values
+            lambda: rng.choice([0.25, 0.75, 1.25, 1.75, 2.25, 2.75, 3.25, 3.75]),
+            # Random decimal values
+            lambda: round(rng.uniform(0, 4), rng.randint(1, 3)),
+            # Very precise values
+            lambda: round(rng.uniform(0, 4), 4),
+        ]
+        value = rng.choice(km_types)()
+        target = value * 1000
+        exact_target = Decimal(str(value)).scaleb(3)
+        unit_from, unit_to, unit_word = "km", "meters", "km"
+        visual_km = value
+
+    shown = format_altitude(value)
+    mission_stories = [
+        f"🛰️ Deploy satellite at {shown} {unit_word} altitude",
+        f"🌌 Reach space station at {shown} {unit_word} height",
+        f"🚀 Launch payload to {shown} {unit_word} orbit",
+        f"⭐ Conduct experiments at {shown} {unit_word} above Earth",
+        f"🌍 Monitor weather from {shown} {unit_word} altitude"
+    ]
+    story = rng.choice(mission_stories)
+    question = f"Mission altitude: {shown} {unit_from}\nConvert to {unit_to} for launch computer:"
+    return story, question, value, target, unit_from, unit_to, visual_km, rocket_key(exact_target)
+
+
+def is_rocket_answer_correct(user_answer, target_answer):
+    """Check if answer is correct within reasonable tolerance"""
+    if abs(target_answer) < 1e-10:
+        return abs(user_answer) < 1e-10
+    return abs(user_answer - target_answer) <= max(1e-9 * abs(target_answer), 1e-12)
+
+
+# --------- division ---------
+def generate_division(min_factor=2, max_factor=12, rng=random):
+    """(dividend, divisor, answer) from the min–max times tables."""
+    a = rng.randint(min_factor, max_factor)
+    b = rng.randint(min_factor, max_factor)
+    return a * b, b, a
@@ -0,0 +1,744 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import secrets
+import signal
+import struct
+import time
+import tracemalloc
+import traceback
+from collections import deque
+
+import quiz_logic
+from attempt_logger import AttemptLogger
+from battle_engine import BattleEngine
+from log_records import make_record, to_jsonl
+
+IDLE_TIMEOUT = 15 * 60
+SWEEP_INTERVAL = 10
+MAX_SESSIONS = 200000
+MAX_MESSAGE = 64 * 1024
+LATENCY_SAMPLES = 10000
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+REASONS = {
+    101: "Switching Protocols", 200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+OPS = ("start", "state", "answer", "question", "end")
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --------- headless game sessions ---------
+class GameSession:
+    """One player's game with no UI: the same rules, flow and attempt records as its Tk window.
+
+    Sessions keep only slots and small numbers; questions are re-derived
+    from (seed, question number) with quiz_logic.question_rng.
+    """
+
+    __slots__ = ("seed", "logger", "shown_at", "last_used")
+    game = ""
+
+    def __init__(self, seed=None, logger=None):
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.logger = logger
+        self.shown_at = self.last_used = time.monotonic()
+
+    def log(self, *args, **kwargs):
+        if self.logger is not None:
+            elapsed_ms = (time.monotonic() - self.shown_at) * 1000
+            self.logger.log(to_jsonl(make_record(self.game, *args, elapsed_ms=elapsed_ms, seed=self.seed, **kwargs)))
+
+
+class BattleSession(GameSession):
+    """hero_monster_v3: one graded answer per question, next monster after a win, over when the hero falls.
+
+    Between requests the game is kept as BattleEngine.snapshot() bytes
+    (148) instead of a live engine with its own objects, and an engine is
+    rebuilt from them for each request, which takes about 6 µs.
+    """
+
+    __slots__ = ("saved",)
+    game = "battle"
+
+    def __init__(self, seed=None, logger=None):
+        super().__init__(seed, logger)
+        engine = BattleEngine(self.seed)
+        engine.new_question()
+        self.saved = engine.snapshot()
+
+    @property
+    def engine(self):
+        return BattleEngine.from_snapshot(self.saved)
+
+    @staticmethod
+    def is_over(engine):
+        return engine.hero_hp <= 0
+
+    def next_question(self):
+        e = self.engine
+        if self.is_over(e):
+            raise RequestError(409, "the hero was defeated; start a new session")
+        if not e.question_answered:
+            raise RequestError(409, "answer the current question first")
+        e.new_question()
+        self.saved = e.snapshot()
+        self.shown_at = time.monotonic()
+
+    def answer(self, text):
+        e = self.engine
+        outcome = e.submit(text)
+        if outcome["status"] == "answered":
+            raise RequestError(409, "this question was already answered; ask for the next one")
+        if outcome["status"] not in ("correct", "wrong"):
+            return outcome
+        direction, value = e.current_value_key.split(":", 1)
+        self.log(direction, value, e.format_number(e.current_answer), outcome["input"], outcome["status"] == "correct",
+                 sig_figs=e.current_sigfigs, streak=e.streak, level=e.level, hero_hp=e.hero_hp,
+                 hero_max_hp=e.hero_max_hp, monster_hp=e.monster_hp, monster_max_hp=e.monster_max_hp,
+                 question=e.questions_drawn - 1)
+        outcome["answer"] = e.current_key.text
+        if outcome["monster_defeated"]:
+            outcome["healed"] = e.next_monster()
+        self.saved = e.snapshot()
+        return outcome
+
+    def state(self):
+        e = self.engine
+        over = self.is_over(e)
+        return {
+            "game": self.game, "question": e.current_question, "unit": e.current_unit_to,
+            "sig_figs": e.current_sigfigs, "next": e.question_answered and not over, "over": over,
+            "score": e.score, "total": e.total_questions, "streak": e.streak, "best_streak": e.best_streak,
+            "level": e.level, "hero_hp": e.hero_hp, "hero_max_hp": e.hero_max_hp,
+            "monster": e.current_monster["name"], "monster_hp": e.monster_hp, "monster_max_hp": e.monster_max_hp,
+        }
+
+
+class RocketSession(GameSession):
+    """rocket.py: one launch per mission; a new mission can be asked for at any time."""
+
+    __slots__ = ("number", "launched", "score", "total")
+    game = "rocket"
+
+    def __init__(self, seed=None, logger=None):
+        super().__init__(seed, logger)
+        self.number = -1
+        self.score = 0
+        self.total = 0
+        self.next_question()
+
+    def next_question(self):
+        self.number += 1
+        self.launched = False
+        self.shown_at = time.monotonic()
+
+    def mission(self):
+        return quiz_logic.generate_mission(quiz_logic.question_rng(self.seed, self.number))
+
+    def answer(self, text):
+        if self.launched:
+            raise RequestError(409, "this rocket has launched; ask for a new mission")
+        _, _, value, target, unit_from, _, _, key = self.mission()
+        user_input = text.strip()
+        status, _ = quiz_logic.grade(user_input, key)
+        if status not in ("correct", "wrong"):
+            return {"status": status}
+        is_correct = status == "correct"
+        self.launched = True
+        self.total += 1
+        self.score += is_correct
+        direction = "m_to_km" if unit_from == "meters" else "km_to_m"
+        self.log(direction, quiz_logic.format_number(value), quiz_logic.format_number(target), user_input, is_correct,
+                 question=self.number)
+        return {"status": status, "input": user_input, "answer": key.text}
+
+    def state(self):
+        story, question, _, _, _, unit_to, _, _ = self.mission()
+        return {
+            "game": self.game, "story": story, "question": question, "unit": unit_to,
+            "next": True, "over": False, "score": self.score, "total": self.total,
+        }
+
+
+class DivisionSession(GameSession):
+    """division_quiz02: retry until correct; the next question unlocks after a correct answer."""
+
+    __slots__ = ("number", "dividend", "divisor", "answer_value", "answered", "solved", "can_advance",
+                 "score", "questions_answered", "streak")
+    game = "division"
+
+    def __init__(self, seed=None, logger=None):
+        super().__init__(seed, logger)
+        self.number = -1
+        self.score = 0
+        self.questions_answered = 0
+        self.streak = 0
+        self.new_question()
+
+    def new_question(self):
+        self.number += 1
+        self.dividend, self.divisor, self.answer_value = quiz_logic.generate_division(
+            rng=quiz_logic.question_rng(self.seed, self.number))
+        self.answered = False
+        self.solved = False
+        self.can_advance = False
+        self.shown_at = time.monotonic()
+
+    def next_question(self):
+        if not self.can_advance:
+            raise RequestError(409, "answer this one correctly first")
+        self.new_question()
+
+    def answer(self, text):
+        user_input = text.strip()
+        status, _ = quiz_logic.grade(user_input, quiz_logic.whole_number_key(self.answer_value))
+        if status == "empty":
+            return {"status": status}
+        value = f"{self.dividend}/{self.divisor}"
+        if status == "invalid":
+            self.can_advance = False
+            self.log("div", value, self.answer_value, user_input, None, streak=self.streak, question=self.number)
+            return {"status": status}
+        if not self.answered:
+            self.questions_answered += 1
+            self.answered = True
+        if status == "correct":
+            if not self.solved:
+                self.score += 1
+                self.streak += 1
+                self.solved = True
+            self.can_advance = True
+        else:
+            self.streak = 0
+            self.can_advance = False
+        self.log("div", value, self.answer_value, user_input, status == "correct", streak=self.streak,
+                 question=self.number)
+        return {"status": status, "input": user_input}
+
+    def state(self):
+        return {
+            "game": self.game, "question": f"{self.dividend} ÷ {self.divisor} = ?", "next": self.can_advance,
+            "over": False, "score": self.score, "total": self.questions_answered, "streak": self.streak,
+        }
+
+
+GAMES = {cls.game: cls for cls in (BattleSession, RocketSession, DivisionSession)}
+
+
+# --------- server ---------
+class LatencyMetrics:
+    """Request counts, errors and recent latencies per operation."""
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.samples = samples
+        self.ops = {}
+
+    def observe(self, op, seconds, failed=False):
+        stat = self.ops.get(op)
+        if stat is None:
+            stat = self.ops[op] = {"count": 0, "errors": 0, "max": 0.0, "recent": deque(maxlen=self.samples)}
+        stat["count"] += 1
+        stat["errors"] += failed
+        stat["recent"].append(seconds)
+        if seconds > stat["max"]:
+            stat["max"] = seconds
+
+    def snapshot(self):
+        out = {}
+        for op, stat in sorted(self.ops.items()):
+            recent = sorted(stat["recent"])
+            n = len(recent)
+            out[op] = {"count": stat["count"], "errors": stat["errors"]}
+            out[op].update({
+                f"p{p}_ms": round(recent[min(n - 1, n * p // 100)] * 1000, 3) if n else 0.0 for p in (50, 90, 99)
+            })
+            out[op]["max_ms"] = round(stat["max"] * 1000, 3)
+        return out
+
+
+class QuizServer:
+    """Hosts many headless game sessions over HTTP and WebSocket.
+
+    HTTP (JSON bodies, keep-alive):
+        POST /sessions {"game": "battle"|"rocket"|"division", "seed": optional}
+        GET /sessions/<id>                      state
+        POST /sessions/<id>/answer {"answer": "2.5"}
+        POST /sessions/<id>/question            next question, when the game allows it
+        DELETE /sessions/<id>
+        GET /metrics
+
+    WebSocket at /ws: send {"op": "start"|"state"|"answer"|"question"|"end", ...}
+    and get back the same JSON as over HTTP plus "code", the HTTP status it
+    would have had (an answer's own "status" is left alone). After "start" the
+    connection stays on that session; {"op": "attach", "id": ...} picks up an
+    existing one.
+
+    Operations never await: each one looks up its session, plays it and
+    replies in one step on the event loop, so requests run one at a time
+    in arrival order and need no locks. An operation that had to await
+    mid-way (a database, say) would need per-session locking. Sessions idle
+    for longer than idle_timeout are evicted.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_sessions=MAX_SESSIONS, logger=None,
+                 sweep_interval=SWEEP_INTERVAL):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.logger = logger
+        self.sweep_interval = sweep_interval
+        # Least recently used first, so eviction only looks at the front; a plain dict keeps
+        # insertion order at under half of OrderedDict's cost per entry
+        self.sessions = {}
+        self.created = 0
+        self.evicted = 0
+        self.metrics = LatencyMetrics()
+        self.server = None
+        self.sweeper = None
+        # writer -> handler task, so close() can end open connections
+        self.clients = {}
+
+    async def start(self, host, port):
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_MESSAGE, backlog=1024)
+        self.sweeper = asyncio.create_task(self.evict_idle())
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.clients):
+                writer.close()
+            await asyncio.gather(*self.clients.values(), return_exceptions=True)
+            await self.server.wait_closed()
+
+    # --------- sessions ---------
+    async def evict_idle(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.evict(time.monotonic() - self.idle_timeout)
+
+    def evict(self, cutoff):
+        expired = []
+        for session_id, session in self.sessions.items():
+            if session.last_used > cutoff:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            del self.sessions[session_id]
+        self.evicted += len(expired)
+
+    def new_session(self, message):
+        game = message.get("game", "battle")
+        cls = GAMES.get(game) if isinstance(game, str) else None
+        if cls is None:
+            raise RequestError(400, f"game must be one of {', '.join(GAMES)}")
+        seed = message.get("seed")
+        if seed is not None and not isinstance(seed, int):
+            raise RequestError(400, "seed must be an integer")
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError(503, "server is full; try again later")
+        session_id = secrets.token_urlsafe(12)
+        session = self.sessions[session_id] = cls(seed, self.logger)
+        self.created += 1
+        return {"id": session_id, "seed": session.seed, "state": session.state()}
+
+    def handle_op(self, op, session_id, message):
+        """Run one operation. Returns (HTTP status, reply); bad requests raise RequestError."""
+        if op == "start":
+            return 201, self.new_session(message)
+        if op not in OPS:
+            raise RequestError(400, f"unknown op {op!r}")
+        session = self.sessions.get(session_id) if isinstance(session_id, str) else None
+        if session is None:
+            raise RequestError(404, "no such session (it may have been idle too long)")
+        # Re-inserting moves it to the end, the most recently used
+        self.sessions[session_id] = self.sessions.pop(session_id)
+        session.last_used = time.monotonic()
+        if op == "state":
+            reply = {}
+        elif op == "answer":
+            answer = message.get("answer")
+            if not isinstance(answer, str):
+                raise RequestError(400, "answer must be a string")
+            reply = session.answer(answer)
+        elif op == "question":
+            session.next_question()
+            reply = {}
+        else:
+            self.sessions.pop(session_id, None)
+            return 200, {"id": session_id, "ended": True}
+        reply["id"] = session_id
+        reply["state"] = session.state()
+        return 200, reply
+
+    def run_op(self, op, session_id, message):
+        start = time.perf_counter()
+        try:
+            status, reply = self.handle_op(op, session_id, message)
+        except RequestError as e:
+            status, reply = e.status, {"error": str(e)}
+        except Exception:
+            # A bug in one game must not drop the connection; report it and keep serving
+            traceback.print_exc()
+            status, reply = 500, {"error": "internal error"}
+        # Unknown ops share one metrics entry, so clients cannot grow the table
+        self.metrics.observe(op if op in OPS else "unknown", time.perf_counter() - start, status >= 400)
+        return status, reply
+
+    def stats(self):
+        stats = {
+            "sessions": len(self.sessions), "created": self.created, "evicted": self.evicted,
+            "ops": self.metrics.snapshot(),
+        }
+        if self.logger is not None:
+            stats["logger"] = self.logger.stats()
+        return stats
+
+    # --------- HTTP ---------
+    def route(self, method, path):
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        if parts == ["sessions"]:
+            return ("start", None) if method == "POST" else None
+        if len(parts) == 2 and parts[0] == "sessions":
+            return {"GET": ("state", parts[1]), "DELETE": ("end", parts[1])}.get(method)
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] in ("answer", "question"):
+            return (parts[2], parts[1]) if method == "POST" else None
+        raise RequestError(404, f"no route for {path}")
+
+    async def handle_client(self, reader, writer):
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    writer.write(http_response(400, {"error": "bad request line"}, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if headers.get("upgrade", "").lower() == "websocket" and path.split("?", 1)[0] == "/ws":
+                    await self.serve_websocket(reader, writer, headers)
+                    break
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    writer.write(http_response(400, {"error": "bad Content-Length"}, False))
+                    break
+                if length > MAX_MESSAGE:
+                    writer.write(http_response(413, {"error": "body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                if path == "/metrics" and method == "GET":
+                    status, reply = 200, self.stats()
+                else:
+                    try:
+                        op_target = self.route(method, path)
+                        if op_target is None:
+                            raise RequestError(405, f"{method} not allowed on {path}")
+                        message = json.loads(body) if body else {}
+                        if not isinstance(message, dict):
+                            raise RequestError(400, "body must be a JSON object")
+                    except (ValueError, RecursionError):
+                        # RecursionError: nested too deeply for the json module
+                        status, reply = 400, {"error": "body is not valid JSON"}
+                    except RequestError as e:
+                        status, reply = e.status, {"error": str(e)}
+                    else:
+                        status, reply = self.run_op(*op_target, message)
+                writer.write(http_response(status, reply, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    # --------- WebSocket ---------
+    async def serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            writer.write(http_response(400, {"error": "missing Sec-WebSocket-Key"}, False))
+            return
+        accept = base64.b64encode(hashlib.sha1(key.encode('ascii') + WS_GUID).digest()).decode('ascii')
+        writer.write((f"HTTP/1.1 101 {REASONS[101]}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('latin-1'))
+        session_id = None
+        fragments = []
+        while True:
+            try:
+                fin, opcode, data = await read_frame(reader)
+            except ValueError:
+                writer.write(ws_frame(WS_CLOSE, struct.pack("!H", 1002)))
+                break
+            if opcode == WS_CLOSE:
+                writer.write(ws_frame(WS_CLOSE, data[:2]))
+                break
+            if opcode == WS_PING:
+                writer.write(ws_frame(WS_PONG, data))
+                continue
+            if opcode == WS_PONG:
+                continue
+            fragments.append(data)
+            if not fin:
+                if sum(map(len, fragments)) > MAX_MESSAGE:
+                    writer.write(ws_frame(WS_CLOSE, struct.pack("!H", 1009)))
+                    break
+                continue
+            data, fragments = b"".join(fragments), []
+
+            try:
+                message = json.loads(data)
+                if not isinstance(message, dict):
+                    raise ValueError
+            except (ValueError, RecursionError):
+                status, reply = 400, {"error": "message is not a JSON object"}
+            else:
+                op = message.get("op")
+                if op == "attach":
+                    session_id = message.get("id")
+                    op = "state"
+                status, reply = self.run_op(op, message.get("id") or session_id, message)
+                if status < 400 and op in ("start", "state"):
+                    session_id = reply["id"]
+            reply["code"] = status
+            writer.write(ws_frame(WS_TEXT, json.dumps(reply, ensure_ascii=False).encode('utf-8')))
+            await writer.drain()
+        await writer.drain()
+
+
+def http_response(status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+def mask_bytes(data, mask):
+    n = len(data)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(key, 'big')).to_bytes(n, 'big')
+
+
+async def read_frame(reader, masked=True):
+    """One WebSocket frame as (fin, opcode, payload). Raises ValueError on a protocol error."""
+    b1, b2 = await reader.readexactly(2)
+    length = b2 & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_MESSAGE:
+        raise ValueError("frame too large")
+    # Clients must mask their frames; servers must not
+    if bool(b2 & 0x80) != masked:
+        raise ValueError("bad frame mask")
+    mask = await reader.readexactly(4) if masked else None
+    data = await reader.readexactly(length)
+    return bool(b1 & 0x80), b1 & 0x0F, mask_bytes(data, mask) if masked else data
+
+
+def ws_frame(opcode, data, mask=None):
+    n = len(data)
+    mask_bit = 0x80 if mask else 0
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, mask_bit | n)
+    elif n < 65536:
+        head = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, n)
+    return head + mask + mask_bytes(data, mask) if mask else head + data
+
+
+# --------- load test ---------
+class HttpClient:
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def call(self, op, session_id, message):
+        method, path = {
+            "start": ("POST", "/sessions"), "state": ("GET", f"/sessions/{session_id}"),
+            "answer": ("POST", f"/sessions/{session_id}/answer"),
+            "question": ("POST", f"/sessions/{session_id}/question"), "end": ("DELETE", f"/sessions/{session_id}"),
+        }[op]
+        body = json.dumps(message).encode('utf-8')
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: quiz\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+
+
+class WebSocketClient:
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(secrets.token_bytes(16)).decode('ascii')
+        self.writer.write((f"GET /ws HTTP/1.1\r\nHost: quiz\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                           f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode('latin-1'))
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        if not head.startswith(b"HTTP/1.1 101"):
+            raise ConnectionError(f"WebSocket upgrade refused: {head[:40]!r}")
+
+    async def call(self, op, session_id, message):
+        message = dict(message, op=op, id=session_id)
+        self.writer.write(ws_frame(WS_TEXT, json.dumps(message).encode('utf-8'), secrets.token_bytes(4)))
+        _, _, data = await read_frame(self.reader, masked=False)
+        reply = json.loads(data)
+        return reply.pop("code"), reply
+
+    async def close(self):
+        self.writer.write(ws_frame(WS_CLOSE, struct.pack("!H", 1000), secrets.token_bytes(4)))
+        self.writer.close()
+
+
+async def play(client, game, answers, latencies, rng):
+    """One simulated player: answer, move on when allowed, start over when the game ends."""
+    session_id = None
+    for _ in range(answers):
+        if session_id is None:
+            start = time.perf_counter()
+            _, reply = await client.call("start", None, {"game": game})
+            latencies.append(time.perf_counter() - start)
+            session_id = reply["id"]
+        start = time.perf_counter()
+        _, reply = await client.call("answer", session_id, {"answer": str(rng.randint(1, 12))})
+        latencies.append(time.perf_counter() - start)
+        state = reply["state"]
+        if state["over"]:
+            session_id = None
+        elif state["next"]:
+            start = time.perf_counter()
+            await client.call("question", session_id, {})
+            latencies.append(time.perf_counter() - start)
+
+
+async def load_test(clients, answers, use_websocket=False, host="127.0.0.1", port=0):
+    """Run `clients` simulated players against a server on localhost and print throughput and latency."""
+    server = QuizServer()
+    host, port = await server.start(host, port)
+    latencies = []
+    games = list(GAMES)
+
+    async def player(i):
+        client = WebSocketClient() if use_websocket else HttpClient()
+        await client.connect(host, port)
+        await play(client, games[i % len(games)], answers, latencies, random.Random(i))
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"{clients} players over {'WebSocket' if use_websocket else 'HTTP'}: {n} requests in {elapsed:.2f} s "
+          f"({n / elapsed:.0f} req/s), {len(server.sessions)} sessions open")
+    print("client latency ms: " + ", ".join(
+        f"p{p} {latencies[min(n - 1, n * p // 100)] * 1000:.2f}" for p in (50, 90, 99)) + f", max {latencies[-1] * 1000:.2f}")
+    for op, stat in server.metrics.snapshot().items():
+        print(f"  server {op:<8} " + ", ".join(f"{name} {value}" for name, value in stat.items()))
+
+
+def measure_memory(n):
+    """Print the bytes each hosted session of every game costs, as seen by tracemalloc.
+
+    Each game plays the same seeds twice and only the second round is
+    measured, so the shared question pools and answer-key cache already
+    hold those questions and only the sessions themselves are counted.
+    """
+    server = QuizServer(max_sessions=n + 1000)
+    seeds = [quiz_logic.new_seed().to_bytes(4, 'little') for _ in range(n)]
+    for game in GAMES:
+        for seed in seeds:
+            server.new_session({"game": game, "seed": int.from_bytes(seed, 'little')})
+        server.sessions.clear()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for seed in seeds:
+            # A fresh int per session, as new_seed() would give
+            server.new_session({"game": game, "seed": int.from_bytes(seed, 'little')})
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print(f"{game}: {used / n:.0f} bytes per session over {n} sessions (including its id and table entry)")
+        server.sessions.clear()
+
+
+async def serve(args):
+    logger = AttemptLogger(args.log) if args.log else None
+    server = QuizServer(args.idle_timeout, args.max_sessions, logger)
+    host, port = await server.start(args.host, args.port)
+    print(f"Quiz server on http://{host}:{port} (WebSocket at ws://{host}:{port}/ws, metrics at /metrics)")
+    stop = asyncio.Event()
+    try:
+        # Stop cleanly on SIGTERM too, so queued attempt records reach the log
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        pass
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        if logger is not None:
+            logger.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the battle, rocket and division games over HTTP/WebSocket.")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to serve the whole network")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="seconds before an idle session is dropped")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--log", help="append attempt records (.jsonl) here")
+    parser.add_argument("--load-test", type=int, metavar="PLAYERS",
+                        help="start a server on a free localhost port and play it with this many clients")
+    parser.add_argument("--answers", type=int, default=20, help="answers per load-test player")
+    parser.add_argument("--websocket", action="store_true", help="load-test over WebSocket instead of HTTP")
+    parser.add_argument("--memory", type=int, metavar="SESSIONS", help="measure memory per session and exit")
+    args = parser.parse_args()
+
+    try:
+        if args.memory:
+            measure_memory(args.memory)
+        elif args.load_test:
+            asyncio.run(load_test(args.load_test, args.answers, args.websocket))
+        else:
+            asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import functools
+import json
+import os
+import random
+import time
+from collections import Counter, deque
+from decimal import Decimal
+from multiprocessing import Pool
+
+import quiz_logic
+from battle_engine import BattleEngine
+from log_records import read_binary, read_jsonl
+
+SESSIONS_PER_TASK = 256
+# Questions have been drawn from the seed the current way since schema v4; older
+# records are still replayed, but their questions are not compared
+QUESTIONS_SINCE = 4
+
+
+def read_records(paths):
+    for path in paths:
+        yield from (read_binary(path) if path.endswith(".bin") else read_jsonl(path))
+
+
+def load_sessions(paths):
+    """Group records into sessions by (game, seed), each in time order.
+
+    Records without a seed (schema v1, converted text logs) have no session
+    boundaries, so they are returned as one unseeded group per game.
+    """
+    sessions = {}
+    for record in read_records(paths):
+        sessions.setdefault((record["game"], record.get("seed")), []).append(record)
+    for records in sessions.values():
+        records.sort(key=lambda r: r["ts"])
+    return [(game, seed, records) for (game, seed), records in sessions.items()]
+
+
+def answer_key(record):
+    return cached_key(record["game"], record["direction"], record["value"], record["sig_figs"])
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def cached_key(game, direction, value, sig_figs):
+    if direction == "div":
+        dividend, divisor = value.split("/")
+        return quiz_logic.whole_number_key(int(dividend) // int(divisor))
+    if game == "rocket":
+        return quiz_logic.rocket_key(Decimal(value).scaleb(3 if direction == "km_to_m" else -3))
+    return quiz_logic.km_answer_key(direction, value, sig_figs)
+
+
+def regrade(record):
+    """True / False with today's rules, or None if the answer would now be turned away (zeros, invalid)."""
+    status, _ = quiz_logic.grade(record["user"], answer_key(record), forbid_zeros=record["game"] == "battle")
+    if status == "correct":
+        return True
+    if status == "wrong":
+        return False
+    return None
+
+
+class Session:
+    """Replays one session's records and collects where today's rules disagree with them."""
+
+    def __init__(self, game, seed, records):
+        self.game = game
+        self.seed = seed
+        self.records = records
+        self.divergences = []
+
+    def diverge(self, index, field, recorded, replayed):
+        self.divergences.append({"game": self.game, "seed": self.seed, "index": index, "field": field,
+                                 "recorded": recorded, "replayed": replayed})
+
+    def check(self, index, record, replayed):
+        for field, value in replayed.items():
+            if record.get(field) != value:
+                self.diverge(index, field, record.get(field), value)
+
+    def check_question(self, index, record, question):
+        if record["v"] < QUESTIONS_SINCE:
+            return
+        recorded = f"{record['direction']}:{record['value']}"
+        if question != recorded:
+            self.diverge(index, "question", recorded, question)
+
+    def replay(self):
+        if self.seed is None:
+            for i, record in enumerate(self.records):
+                self.check(i, record, {"ok": regrade(record)})
+        else:
+            getattr(self, "replay_" + self.game)()
+        return self.divergences
+
+    def replay_battle(self):
+        # Same order as hero_monster_v3: question, answer, record, then next monster
+        engine = BattleEngine(self.seed)
+        for i, record in enumerate(self.records):
+            engine.new_question()
+            self.check_question(i, record, engine.current_value_key)
+            ok = regrade(record)
+            if ok is not None:
+                engine.apply_result(ok)
+            self.check(i, record, {
+                "ok": ok, "streak": engine.streak, "level": engine.level,
+                "hero_hp": engine.hero_hp, "hero_max_hp": engine.hero_max_hp,
+                "monster_hp": engine.monster_hp, "monster_max_hp": engine.monster_max_hp,
+            })
+            if engine.monster_hp <= 0:
+                engine.next_monster()
+            elif engine.hero_hp <= 0:
+                if i + 1 < len(self.records):
+                    self.diverge(i + 1, "ended", "playing", "hero defeated")
+                return
+
+    def replay_kids(self):
+        # hero_monster.py records carry HP; its battle rules and monster draws live in the Tk class,
+        # so for those sessions only answers and streaks are replayed
+        battle = any(record["hero_max_hp"] for record in self.records)
+        rng = random.Random(self.seed)
+        level, score, total, streak = 1, 0, 0, 0
+        prev_type, recent = None, deque(maxlen=20)
+        for i, record in enumerate(self.records):
+            if not battle:
+                q = quiz_logic.pick_km_question(level, prev_type, recent, rng)
+                prev_type = q[5]
+                recent.append(q[6])
+                self.check_question(i, record, q[6])
+                level = quiz_logic.adjust_difficulty(level, score, total)
+            ok = regrade(record)
+            if ok is not None:
+                total += 1
+                score += ok
+                streak = streak + 1 if ok else 0
+            replayed = {"ok": ok, "streak": streak}
+            if not battle:
+                replayed["level"] = level
+            self.check(i, record, replayed)
+
+    def replay_rocket(self):
+        for i, record in enumerate(self.records):
+            if record.get("question") is not None:
+                self.check_question(i, record, mission_question(self.seed, record["question"]))
+            self.check(i, record, {"ok": regrade(record)})
+
+    def replay_division(self):
+        # Records since schema v3 say which question they answer. For older ones it is inferred: a new
+        # question only comes after a correct answer and, once solved, the kid may keep answering the
+        # same question, so a repeated value only counts as a new question when it was answered
+        # correctly and the streak went up.
+        number = -1
+        current, solved, streak = None, False, 0
+        for i, record in enumerate(self.records):
+            logged = record.get("question")
+            if logged is not None:
+                starts = logged != number
+            else:
+                starts = record["value"] != current or (solved and record["ok"] and record["streak"] == streak + 1)
+            if starts:
+                number = logged if logged is not None else number + 1
+                dividend, divisor, _ = quiz_logic.generate_division(rng=quiz_logic.question_rng(self.seed, number))
+                self.check_question(i, record, f"div:{dividend}/{divisor}")
+                current, solved = record["value"], False
+            ok = regrade(record)
+            if ok and not solved:
+                streak += 1
+                solved = True
+            elif ok is False:
+                streak = 0
+            self.check(i, record, {"ok": ok, "streak": streak})
+
+
+def mission_question(seed, number):
+    mission = quiz_logic.generate_mission(quiz_logic.question_rng(seed, number))
+    direction = "m_to_km" if mission[4] == "meters" else "km_to_m"
+    return f"{direction}:{quiz_logic.format_number(mission[2])}"
+
+
+def replay_chunk(sessions):
+    divergences = []
+    records = 0
+    for game, seed, session_records in sessions:
+        divergences.extend(Session(game, seed, session_records).replay())
+        records += len(session_records)
+    return len(sessions), records, divergences
+
+
+def replay(paths, workers=None):
+    """Replay every session in the logs. Returns (sessions, records, divergences)."""
+    sessions = load_sessions(paths)
+    tasks = [sessions[i:i + SESSIONS_PER_TASK] for i in range(0, len(sessions), SESSIONS_PER_TASK)]
+    total_sessions = total_records = 0
+    divergences = []
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        results = [replay_chunk(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = list(pool.imap_unordered(replay_chunk, tasks))
+    for n_sessions, n_records, found in results:
+        total_sessions += n_sessions
+        total_records += n_records
+        divergences.extend(found)
+    return total_sessions, total_records, divergences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logged sessions through the current rules and report divergences.")
+    parser.add_argument("logs", nargs="+", help=".jsonl or .bin attempt records")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="write every divergence to this .jsonl file")
+    parser.add_argument("--show", type=int, default=20, help="divergences to print")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sessions, records, divergences = replay(args.logs, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {sessions} sessions ({records} records) in {elapsed:.2f} s "
+          f"({sessions / elapsed if elapsed else 0:.0f} sessions/s)")
+
+    by_field = Counter(d["field"] for d in divergences)
+    diverged = len({(d["game"], d["seed"]) for d in divergences})
+    print(f"{len(divergences)} divergences in {diverged} sessions"
+          + (": " + ", ".join(f"{field} {count}" for field, count in by_field.most_common()) if by_field else ""))
+    for d in divergences[:args.show]:
+        print(f"  {d['game']} seed={d['seed']} #{d['index']} {d['field']}: "
+              f"recorded {d['recorded']!r}, now {d['replayed']!r}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for d in divergences:
+                f.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
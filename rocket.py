@@ -1,14 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 import datetime
 import os
-import math
 import time
 
+import quiz_logic
+from attempt_logger import AttemptLogger
+from fireworks import Fireworks
+from log_records import make_record, to_jsonl
+from starfield import Starfield
+
 class RocketLaunchGame:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, root=None, on_exit=None, seed=None):
+        # root/on_exit let the launcher host the game in its own Tk root
+        self.root = root if root is not None else tk.Tk()
+        self.on_exit = on_exit
         self.root.title("🚀 Rocket Launch Mission Control! 🌟")
         self.root.geometry("1000x800")
         self.root.configure(bg='#001122')  # Space background
@@ -18,11 +24,23 @@ class RocketLaunchGame:
         self.total_questions = 0
         self.current_value = 0
         self.current_target_value = 0
+        self.current_key = None
         self.current_unit_from = ""
         self.current_unit_to = ""
         self.rocket_y = 0
         self.animation_running = False
+        # Mission n comes from question_rng(seed, n) (seed is logged); flames, stars and fireworks from self.fx_rng
+        self.seed = quiz_logic.new_seed() if seed is None else seed
+        self.rng = None
+        self.missions_drawn = 0
+        self.fx_rng = quiz_logic.effects_rng(self.seed)
         self.log_file = "rocket_launch_log.txt"
+        self.start_log()
+        self.logger = AttemptLogger(self.log_file)
+        self.record_logger = AttemptLogger(os.path.splitext(self.log_file)[0] + ".jsonl")
+        self.logger.log(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Session seed: {self.seed}\n")
+        self.question_shown_at = time.monotonic()
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
         
         # Canvas for animation
         self.canvas_width = 400
@@ -43,11 +61,23 @@ class RocketLaunchGame:
         
         # Animation variables
         self.rocket_pos = [self.canvas_width//2, self.canvas_height - 80]
-        self.fire_particles = []
-        self.firework_particles = []
-        self.stars = []
+        self.rocket_drawn_at = tuple(self.rocket_pos)
+        self.fire_visible = False
+        self.star_count = 30
+        self.frame_ms = 16
+        self.last_frame = time.perf_counter()
+        
+        # A few pre-rolled exhaust shapes; each frame picks one instead of redrawing the fire
+        self.flame_shapes = []
+        for _ in range(6):
+            sparks = [(self.fx_rng.randint(-10, 10), self.fx_rng.randint(5, 15), self.fx_rng.randint(2, 4))
+                      for _ in range(3)]
+            self.flame_shapes.append((self.fx_rng.randint(15, 25), sparks))
         
         self.setup_ui()
+        self.fireworks = Fireworks(self.canvas, rng=self.fx_rng)
+        self.starfield = Starfield(self.canvas, self.star_count,
+                                   (10, 10, self.canvas_width-10, self.canvas_height-200), rng=self.fx_rng)
         self.create_background()
         self.new_mission()
         self.animate()  # Start animation loop
@@ -266,15 +296,10 @@ class RocketLaunchGame:
     def create_background(self):
         """Create the space background with stars, ground, and launch pad"""
         self.canvas.delete("all")
+        self.fireworks.reset()
         
         # Create stars
-        self.stars = []
-        for _ in range(30):
-            x = random.randint(10, self.canvas_width-10)
-            y = random.randint(10, self.canvas_height-200)
-            size = random.randint(1, 2)
-            star_id = self.canvas.create_oval(x-size, y-size, x+size, y+size, fill='white', outline='white')
-            self.stars.append([star_id, x, y, random.uniform(0.5, 2.0)])
+        self.starfield.build()
         
         # Ground
         self.canvas.create_rectangle(0, self.canvas_height-60, self.canvas_width, self.canvas_height, 
@@ -294,11 +319,10 @@ class RocketLaunchGame:
         
         # Reset rocket position
         self.rocket_pos = [self.canvas_width//2, self.canvas_height - 80]
-        self.draw_rocket()
+        self.build_rocket()
     
-    def draw_rocket(self):
-        """Draw the rocket at current position"""
-        self.canvas.delete("rocket")
+    def build_rocket(self):
+        """Create the rocket and its exhaust once; launch frames only move them"""
         x, y = self.rocket_pos
         
         # Rocket body
@@ -308,166 +332,78 @@ class RocketLaunchGame:
         # Fins
         self.canvas.create_polygon(x-8, y-10, x-15, y, x-8, y, fill='red', outline='white', tags="rocket")
         self.canvas.create_polygon(x+8, y-10, x+15, y, x+8, y, fill='red', outline='white', tags="rocket")
+        
+        # Exhaust: main flame and side flames, hidden until launch
+        self.flame = self.canvas.create_polygon(
+            x-6, y, x, y+20, x+6, y,
+            fill=self.colors['fire'], outline='yellow', tags="fire", state='hidden'
+        )
+        self.flame_sparks = [
+            self.canvas.create_oval(x, y, x, y, fill='yellow', outline='orange', tags="fire", state='hidden')
+            for _ in range(3)
+        ]
+        self.rocket_drawn_at = (x, y)
+        self.fire_visible = False
+    
+    def draw_rocket(self):
+        """Move the rocket to the current position"""
+        x, y = self.rocket_pos
+        old_x, old_y = self.rocket_drawn_at
+        if x != old_x or y != old_y:
+            self.canvas.move("rocket", x - old_x, y - old_y)
+            self.rocket_drawn_at = (x, y)
     
     def draw_rocket_fire(self):
-        """Draw rocket exhaust flames"""
+        """Flicker the rocket exhaust by switching to another pre-rolled flame shape"""
         if not self.animation_running:
             return
-            
-        self.canvas.delete("fire")
         x, y = self.rocket_pos
-        
-        # Main flame
-        flame_height = random.randint(15, 25)
-        self.canvas.create_polygon(
-            x-6, y, x, y+flame_height, x+6, y,
-            fill=self.colors['fire'], outline='yellow', tags="fire"
-        )
-        
-        # Side flames
-        for i in range(3):
-            fx = x + random.randint(-10, 10)
-            fy = y + random.randint(5, 15)
-            size = random.randint(2, 4)
-            self.canvas.create_oval(fx-size, fy-size, fx+size, fy+size, 
-                                  fill='yellow', outline='orange', tags="fire")
+        flame_height, sparks = self.fx_rng.choice(self.flame_shapes)
+        self.canvas.coords(self.flame, x-6, y, x, y+flame_height, x+6, y)
+        for spark, (dx, dy, size) in zip(self.flame_sparks, sparks):
+            fx, fy = x + dx, y + dy
+            self.canvas.coords(spark, fx-size, fy-size, fx+size, fy+size)
+        if not self.fire_visible:
+            self.canvas.itemconfig("fire", state='normal')
+            self.fire_visible = True
     
-    def draw_fireworks(self):
-        """Draw celebration fireworks"""
-        if not self.firework_particles:
-            return
-            
-        self.canvas.delete("fireworks")
-        
-        for particle in self.firework_particles[:]:
-            x, y, vx, vy, life, color = particle
-            
-            # Update position
-            x += vx
-            y += vy
-            vy += 0.3  # gravity
-            life -= 1
-            
-            if life > 0:
-                size = max(1, life // 3)
-                self.canvas.create_oval(x-size, y-size, x+size, y+size, 
-                                      fill=color, outline=color, tags="fireworks")
-                particle[0], particle[1], particle[3], particle[5] = x, y, vy, life
-            else:
-                self.firework_particles.remove(particle)
+    def hide_rocket_fire(self):
+        self.canvas.itemconfig("fire", state='hidden')
+        self.fire_visible = False
+    
+    def draw_fireworks(self, steps=1.0):
+        """Draw celebration fireworks (steps is in 100 ms firework ticks)"""
+        self.fireworks.tick(steps)
     
     def create_firework(self, x, y):
         """Create a firework explosion"""
-        colors = ['red', 'yellow', 'green', 'blue', 'purple', 'orange', 'pink']
-        for _ in range(12):
-            angle = random.uniform(0, 2*math.pi)
-            speed = random.uniform(3, 8)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            life = random.randint(20, 40)
-            color = random.choice(colors)
-            self.firework_particles.append([x, y, vx, vy, life, color])
+        self.fireworks.burst(x, y)
     
     def format_number(self, num):
         """Format number to appropriate precision (up to 5 significant figures)"""
-        if num == int(num):
-            return str(int(num))
-        else:
-            # Format with up to 5 significant figures
-            formatted = f"{num:.5g}"
-            return formatted
+        return quiz_logic.format_altitude(num)
     
     def generate_mission(self):
         """Generate a new mission with meters/km conversion (0-4km range)"""
-        # Randomly choose conversion direction
-        conversion_type = random.choice(['m_to_km', 'km_to_m'])
-        
-        if conversion_type == 'm_to_km':
-            # Generate meters that convert to 0-4km range
-            # Create various types of values for interesting conversions
-            value_types = [
-                # Whole kilometers
-                lambda: random.randint(0, 4) * 1000,
-                # Half kilometers  
-                lambda: random.choice([500, 1500, 2500, 3500]),
-                # Quarter kilometers
-                lambda: random.choice([250, 750, 1250, 1750, 2250, 2750, 3250, 3750]),
-                # Decimal kilometers with varying precision
-                lambda: int(random.uniform(0, 4000)),
-                # More precise values
-                lambda: int(random.uniform(0, 4000) * 10) / 10,
-            ]
-            
-            meters = random.choice(value_types)()
-            target_km = meters / 1000
-            
-            unit_from = "meters"
-            unit_to = "km"
-            
-        else:  # km_to_m
-            # Generate km values in 0-4 range
-            km_types = [
-                # Whole numbers
-                lambda: float(random.randint(0, 4)),
-                # Half values
-                lambda: random.choice([0.5, 1.5, 2.5, 3.5]),
-                # Quarter values
-                lambda: random.choice([0.25, 0.75, 1.25, 1.75, 2.25, 2.75, 3.25, 3.75]),
-                # Random decimal values
-                lambda: round(random.uniform(0, 4), random.randint(1, 3)),
-                # Very precise values
-                lambda: round(random.uniform(0, 4), 4),
-            ]
-            
-            km_value = random.choice(km_types)()
-            target_meters = km_value * 1000
-            
-            meters = km_value
-            target_km = target_meters
-            
-            unit_from = "km"
-            unit_to = "meters"
-        
-        # Generate mission stories
-        if conversion_type == 'm_to_km':
-            mission_stories = [
-                f"🛰️ Deploy satellite at {self.format_number(meters)} meters altitude",
-                f"🌌 Reach space station at {self.format_number(meters)} meters height", 
-                f"🚀 Launch payload to {self.format_number(meters)} meters orbit",
-                f"⭐ Conduct experiments at {self.format_number(meters)} meters above Earth",
-                f"🌍 Monitor weather from {self.format_number(meters)} meters altitude"
-            ]
-            story = random.choice(mission_stories)
-            question = f"Mission altitude: {self.format_number(meters)} {unit_from}\nConvert to {unit_to} for launch computer:"
-            visual_km = target_km  # For animation
-            
-        else:  # km_to_m
-            mission_stories = [
-                f"🛰️ Deploy satellite at {self.format_number(meters)} km altitude",
-                f"🌌 Reach space station at {self.format_number(meters)} km height",
-                f"🚀 Launch payload to {self.format_number(meters)} km orbit", 
-                f"⭐ Conduct experiments at {self.format_number(meters)} km above Earth",
-                f"🌍 Monitor weather from {self.format_number(meters)} km altitude"
-            ]
-            story = random.choice(mission_stories)
-            question = f"Mission altitude: {self.format_number(meters)} {unit_from}\nConvert to {unit_to} for launch computer:"
-            visual_km = meters  # For animation (km value)
-        
-        return story, question, meters, target_km, unit_from, unit_to, visual_km
+        return quiz_logic.generate_mission(self.rng)
     
     def new_mission(self):
         """Start a new mission"""
         if self.animation_running:
             return
             
-        story, question, value, target_value, unit_from, unit_to, visual_km = self.generate_mission()
+        self.rng = quiz_logic.question_rng(self.seed, self.missions_drawn)
+        self.missions_drawn += 1
+        story, question, value, target_value, unit_from, unit_to, visual_km, key = self.generate_mission()
         
         self.current_value = value
         self.current_target_value = target_value
+        self.current_key = key
         self.current_unit_from = unit_from
         self.current_unit_to = unit_to
         self.visual_km = visual_km  # For animation purposes
         self.user_answer = 0
+        self.question_shown_at = time.monotonic()
         
         self.mission_label.config(text=story)
         self.question_label.config(text=question)
@@ -484,14 +420,7 @@ class RocketLaunchGame:
     
     def is_answer_correct(self, user_answer, target_answer):
         """Check if answer is correct within reasonable tolerance"""
-        if abs(target_answer) < 1e-10:  # Handle zero case
-            return abs(user_answer) < 1e-10
-        
-        # Use relative tolerance for better precision handling
-        relative_tolerance = 1e-9
-        absolute_tolerance = 1e-12
-        
-        return abs(user_answer - target_answer) <= max(relative_tolerance * abs(target_answer), absolute_tolerance)
+        return quiz_logic.is_rocket_answer_correct(user_answer, target_answer)
     
     def launch_rocket(self):
         """Launch the rocket with user's answer"""
@@ -499,19 +428,18 @@ class RocketLaunchGame:
             return
             
         user_input = self.answer_var.get().strip()
+        status, user_answer = quiz_logic.grade(user_input, self.current_key)
         
-        if not user_input:
+        if status == "empty":
             messagebox.showwarning("Mission Control", "🚨 Enter target value before launch!")
             return
         
-        try:
-            self.user_answer = float(user_input)
-        except ValueError:
+        if status == "invalid":
             messagebox.showerror("Input Error", "⚠️ Please enter a valid number!")
             return
         
-        # Check answer
-        is_correct = self.is_answer_correct(self.user_answer, self.current_target_value)
+        self.user_answer = float(user_answer)
+        is_correct = status == "correct"
         
         self.total_questions += 1
         
@@ -545,13 +473,13 @@ class RocketLaunchGame:
                 self.root.after(50, launch_step)
             else:
                 # Reached target - celebrate!
-                self.canvas.delete("fire")
+                self.hide_rocket_fire()
                 self.status_label.config(text="🚀 MISSION SUCCESS!", fg=self.colors['success'])
                 
                 # Create fireworks
                 for _ in range(3):
-                    fx = random.randint(50, self.canvas_width-50)
-                    fy = random.randint(50, 150)
+                    fx = self.fx_rng.randint(50, self.canvas_width-50)
+                    fy = self.fx_rng.randint(50, 150)
                     self.create_firework(fx, fy)
                 
                 self.animation_running = False
@@ -597,7 +525,7 @@ class RocketLaunchGame:
                 self.root.after(50, launch_to_user_altitude)
             else:
                 # Reached user's altitude
-                self.canvas.delete("fire")
+                self.hide_rocket_fire()
                 
                 # Show user's altitude marker
                 x, y = self.rocket_pos
@@ -681,17 +609,17 @@ class RocketLaunchGame:
     
     def animate(self):
         """Main animation loop for background effects"""
+        now = time.perf_counter()
+        dt = min(now - self.last_frame, 0.25)
+        self.last_frame = now
+        
         # Twinkling stars
-        for star_data in self.stars:
-            star_id, x, y, twinkle_speed = star_data
-            brightness = int(128 + 127 * math.sin(time.time() * twinkle_speed))
-            color = f"#{brightness:02x}{brightness:02x}{brightness:02x}"
-            self.canvas.itemconfig(star_id, fill=color, outline=color)
+        self.starfield.update(now)
         
         # Draw fireworks if any
-        self.draw_fireworks()
+        self.draw_fireworks(dt / 0.1)
         
-        self.root.after(100, self.animate)
+        self.root.after(self.frame_ms, self.animate)
     
     def update_score_display(self):
         """Update score display"""
@@ -705,11 +633,16 @@ class RocketLaunchGame:
         
         log_entry = f"[{timestamp}] Conversion: {question} | Input: {user_answer} | Target: {self.format_number(correct_answer)} | {result}\n"
         
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Could not write to log: {e}")
+        self.logger.log(log_entry)
+
+        direction = "m_to_km" if self.current_unit_from == "meters" else "km_to_m"
+        record = make_record(
+            "rocket", direction, self.format_number(self.current_value), self.format_number(correct_answer),
+            user_answer, is_correct,
+            elapsed_ms=(time.monotonic() - self.question_shown_at) * 1000, seed=self.seed,
+            question=self.missions_drawn - 1
+        )
+        self.record_logger.log(to_jsonl(record))
     
     def show_help(self):
         """Show help dialog"""
@@ -765,14 +698,31 @@ Good luck, Commander! 🌟"""
             message = "Thanks for visiting Mission Control! 🚀\n\nCome back anytime to launch more rockets! 🌟"
         
         messagebox.showinfo("Mission Control - Final Report 📊", message)
-        self.root.destroy()
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
     
-    def run(self):
-        """Start the game"""
+    def close_window(self):
+        """Flush the attempt log and close the window"""
+        self.logger.close()
+        self.record_logger.close()
+        self.finish()
+    
+    def finish(self):
+        """Leave the game: back to the launcher when hosted, otherwise close the window"""
+        if self.on_exit is not None:
+            self.on_exit()
+        else:
+            self.root.destroy()
+    
+    def start_log(self):
+        """Write the log header the first time the log is created"""
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write("=== Rocket Launch Mission Log ===\n\n")
-        
+    
+    def run(self):
+        """Start the game"""
         self.root.mainloop()
 
 if __name__ == "__main__":
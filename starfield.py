@@ -0,0 +1,88 @@
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to plain lists
+    np = None
+
+PHASES = 256
+LEVELS = 24
+
+
+class Starfield:
+    """Twinkling stars that only touch the canvas when a star's colour changes.
+
+    Brightness follows 128 + 127*sin(phase) like the old loop, but the sine is
+    sampled once into a PHASES-entry table of quantized LEVELS, each with a
+    ready-made colour string. A star's phase is its own offset plus time times
+    its twinkle speed, so one update() is a table lookup per star and an
+    itemconfig only for stars that moved to another level.
+    """
+
+    def __init__(self, canvas, count, bounds, levels=LEVELS, phases=PHASES, use_numpy=True, rng=random):
+        self.canvas = canvas
+        self.rng = rng
+        self.count = count
+        self.bounds = bounds  # (x0, y0, x1, y1) area the stars are scattered over
+        self.phases = phases
+        self.np = np if use_numpy else None
+        self.palette = []
+        for level in range(levels):
+            brightness = round(1 + 254 * level / (levels - 1))
+            self.palette.append(f"#{brightness:02x}{brightness:02x}{brightness:02x}")
+        self.phase_level = [round((math.sin(2 * math.pi * p / phases) + 1) / 2 * (levels - 1))
+                            for p in range(phases)]
+        self.items = []
+        self.offsets = []
+        self.rates = []
+        self.levels = []
+
+    def build(self):
+        """Create the star ovals (after the canvas was cleared)"""
+        x0, y0, x1, y1 = self.bounds
+        self.items = []
+        self.offsets = []
+        self.rates = []
+        for _ in range(self.count):
+            x = self.rng.randint(x0, x1)
+            y = self.rng.randint(y0, y1)
+            size = self.rng.randint(1, 2)
+            self.items.append(self.canvas.create_oval(x-size, y-size, x+size, y+size,
+                                                      fill='white', outline='white', tags="stars"))
+            self.offsets.append(self.rng.randrange(self.phases))
+            # Twinkle speed in radians per second, stored as table steps per second
+            self.rates.append(self.rng.uniform(0.5, 2.0) * self.phases / (2 * math.pi))
+        self.levels = [-1] * self.count
+        if self.np is not None:
+            self.offsets = self.np.array(self.offsets, dtype=self.np.int64)
+            self.rates = self.np.array(self.rates)
+            self.levels = self.np.full(self.count, -1, dtype=self.np.int64)
+            self.phase_table = self.np.array(self.phase_level, dtype=self.np.int64)
+
+    def update(self, t):
+        """Recolour the stars whose brightness level changed since the last call; returns how many did"""
+        canvas = self.canvas
+        items = self.items
+        palette = self.palette
+        if self.np is not None:
+            phase = (self.offsets + (self.rates * t).astype(self.np.int64)) % self.phases
+            levels = self.phase_table[phase]
+            changed = self.np.flatnonzero(levels != self.levels)
+            self.levels = levels
+            for i, level in zip(changed.tolist(), levels[changed].tolist()):
+                color = palette[level]
+                canvas.itemconfig(items[i], fill=color, outline=color)
+            return len(changed)
+        phases = self.phases
+        phase_level = self.phase_level
+        current = self.levels
+        changed = 0
+        for i in range(len(items)):
+            level = phase_level[(self.offsets[i] + int(self.rates[i] * t)) % phases]
+            if level != current[i]:
+                current[i] = level
+                color = palette[level]
+                canvas.itemconfig(items[i], fill=color, outline=color)
+                changed += 1
+        return changed
@@ -0,0 +1,48 @@
+import pytest
+
+from battle_engine import BattleEngine
+
+
+def test_hint_once_per_question():
+    engine = BattleEngine(seed=3)
+    engine.new_question()
+    assert engine.use_hint() is not None
+    assert engine.use_hint() is None
+    assert engine.hints_used == 1
+    engine.submit("987654321")
+    engine.new_question()
+    assert engine.use_hint() is not None
+    assert engine.hints_used == 2
+
+
+def test_snapshot_keeps_question_state():
+    engine = BattleEngine(seed=3)
+    engine.new_question()
+    engine.use_hint()
+    restored = BattleEngine.from_snapshot(engine.snapshot())
+    assert restored.current_question == engine.current_question
+    assert restored.hint_used and not restored.question_answered
+    assert restored.use_hint() is None
+
+    restored.submit("987654321")
+    again = BattleEngine.from_snapshot(restored.snapshot())
+    assert again.question_answered and again.hint_used
+    assert again.submit("1") == {"status": "answered"}
+    assert again.snapshot() == restored.snapshot()
+
+
+def test_restored_engine_draws_the_same_questions():
+    engine = BattleEngine(seed=8)
+    engine.new_question()
+    engine.submit("987654321")
+    restored = BattleEngine.from_snapshot(engine.snapshot())
+    engine.new_question()
+    restored.new_question()
+    assert restored.current_question == engine.current_question
+
+
+def test_damaged_snapshot_is_rejected():
+    data = bytearray(BattleEngine(seed=3).snapshot())
+    data[10] ^= 1
+    with pytest.raises(ValueError):
+        BattleEngine.from_snapshot(bytes(data))
@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+import pytest
+
+import quiz_logic
+from quiz_logic import EMPTY_SCAN, INVALID_SCAN, scan_answer
+
+
+@pytest.mark.parametrize("text, value, sig_figs", [
+    ("12", "12", 2),
+    ("2.5", "2.5", 2),
+    ("0", "0", 1),
+    ("1200", "1200", 2),
+    ("1.200e3", "1200", 4),
+    ("5.", "5", 1),
+    ("1E-3", "0.001", 1),
+])
+def test_scan_reads_value_and_figures(text, value, sig_figs):
+    scan = scan_answer(text)
+    assert scan.error is None
+    assert scan.value == Decimal(value)
+    assert scan.sig_figs == sig_figs
+    assert scan.violation is None
+
+
+@pytest.mark.parametrize("text, violation", [
+    ("0005", "leading_zeros"),
+    ("00", "leading_zeros"),
+    ("3.0", "zero_fraction"),
+    ("0.00", "zero_fraction"),
+    (".0", "zero_fraction"),
+    ("2.50", "trailing_zeros"),
+    ("-3.10", "trailing_zeros"),
+])
+def test_scan_flags_zero_padding(text, violation):
+    assert scan_answer(text).violation == violation
+
+
+def test_exponent_is_not_padding():
+    assert scan_answer("05e1").violation is None
+    assert scan_answer("2.50e1").violation is None
+
+
+@pytest.mark.parametrize("text, value, whole", [
+    ("+5", "5", False),
+    ("-5", "-5", False),
+    ("-0", "0", False),
+    ("5", "5", True),
+])
+def test_scan_sign(text, value, whole):
+    scan = scan_answer(text)
+    assert scan.value == Decimal(value)
+    assert scan.whole is whole
+
+
+@pytest.mark.parametrize("text", ["  12  ", "\t12\n", " 12", "12 "])
+def test_scan_ignores_surrounding_whitespace(text):
+    assert scan_answer(text).value == 12
+
+
+@pytest.mark.parametrize("text", ["", " ", "\t\n"])
+def test_scan_empty(text):
+    assert scan_answer(text) is EMPTY_SCAN
+
+
+@pytest.mark.parametrize("text", [".", "+", "-", "e5", "1e", "1.2.3", "1 2", "abc", "1,5", "0x10", "inf", "nan"])
+def test_scan_invalid(text):
+    assert scan_answer(text) is INVALID_SCAN
+
+
+def test_huge_exponent_is_invalid_not_an_error():
+    assert scan_answer("1e99999999999999999999999") is INVALID_SCAN
+    assert scan_answer("-1e-99999999999999999999999") is INVALID_SCAN
+
+
+def test_large_exponent_is_graded_wrong():
+    key = quiz_logic.km_answer_key("km_to_m", "5", 1)
+    assert quiz_logic.grade("1e999999999999999999", key) == ("wrong", Decimal("1e999999999999999999"))
+
+
+def test_grade_huge_exponent_is_invalid():
+    key = quiz_logic.km_answer_key("km_to_m", "5", 1)
+    assert quiz_logic.grade("1e99999999999999999999999", key) == ("invalid", None)
+    assert quiz_logic.grade("1e99999999999999999999999", quiz_logic.whole_number_key(7)) == ("invalid", None)
+
+
+def test_grade_within_sig_fig_tolerance():
+    key = quiz_logic.km_answer_key("m_to_km", "1234", 2)
+    assert quiz_logic.grade("1.2", key)[0] == "correct"
+    assert quiz_logic.grade("1.3", key)[0] == "wrong"
+    assert quiz_logic.grade("1.20", key, forbid_zeros=True)[0] == "zeros"
+
+
+def test_whole_number_key_rejects_decimals():
+    key = quiz_logic.whole_number_key(12)
+    assert quiz_logic.grade("12", key) == ("correct", 12)
+    assert quiz_logic.grade("12.0", key) == ("invalid", None)
+    assert quiz_logic.grade("13", key) == ("wrong", 13)
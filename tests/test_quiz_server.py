@@ -0,0 +1,350 @@
+import asyncio
+import json
+import re
+import secrets
+import struct
+import time
+
+import pytest
+
+import quiz_logic
+import quiz_server
+from quiz_server import HttpClient, QuizServer, WebSocketClient, read_frame, ws_frame
+
+
+def run(test, **server_args):
+    """Run test(server, host, port) against a fresh server on localhost."""
+    async def main():
+        server = QuizServer(**server_args)
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            await test(server, host, port)
+        finally:
+            await server.close()
+    asyncio.run(main())
+
+
+async def http(host, port):
+    client = HttpClient()
+    await client.connect(host, port)
+    return client
+
+
+async def raw_request(host, port, request):
+    """Send raw bytes; return (status, JSON reply)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(re.search(rb"Content-Length: (\d+)", head).group(1))
+    body = await reader.readexactly(length)
+    writer.close()
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+def post(path, body):
+    return (f"POST {path} HTTP/1.1\r\nHost: quiz\r\nContent-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+
+def battle_answer(state):
+    value = re.search(r"([\d.]+) (?:km|kilometers|m|meters)$", state["question"]).group(1)
+    conversion = "km_to_m" if state["unit"] == "m" else "m_to_km"
+    return quiz_logic.km_answer_key(conversion, value, state["sig_figs"]).text
+
+
+def division_answer(state):
+    dividend, divisor = re.match(r"(\d+) ÷ (\d+)", state["question"]).groups()
+    return str(int(dividend) // int(divisor))
+
+
+def rocket_answer(seed, number):
+    return quiz_logic.generate_mission(quiz_logic.question_rng(seed, number))[-1].text
+
+
+# --------- game flows over HTTP ---------
+def test_battle_flow():
+    async def test(server, host, port):
+        client = await http(host, port)
+        status, reply = await client.call("start", None, {"game": "battle", "seed": 7})
+        assert status == 201 and reply["seed"] == 7
+        session_id, state = reply["id"], reply["state"]
+        assert not state["next"] and state["hero_hp"] == state["hero_max_hp"]
+
+        status, reply = await client.call("question", session_id, {})
+        assert status == 409
+
+        status, reply = await client.call("answer", session_id, {"answer": battle_answer(state)})
+        assert status == 200 and reply["status"] == "correct"
+        assert reply["state"]["monster_hp"] < state["monster_hp"] and reply["state"]["next"]
+
+        status, reply = await client.call("answer", session_id, {"answer": "1"})
+        assert status == 409
+
+        status, reply = await client.call("question", session_id, {})
+        assert status == 200 and not reply["state"]["next"]
+
+        status, reply = await client.call("answer", session_id, {"answer": "987654321"})
+        assert reply["status"] == "wrong" and reply["state"]["hero_hp"] < state["hero_hp"]
+        await client.close()
+    run(test)
+
+
+def test_battle_same_seed_same_questions():
+    async def test(server, host, port):
+        client = await http(host, port)
+        questions = []
+        for _ in range(2):
+            _, reply = await client.call("start", None, {"game": "battle", "seed": 99})
+            questions.append(reply["state"]["question"])
+        assert questions[0] == questions[1]
+        await client.close()
+    run(test)
+
+
+def test_battle_ends_when_hero_falls():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "battle"})
+        session_id = reply["id"]
+        for _ in range(50):
+            _, reply = await client.call("answer", session_id, {"answer": "987654321"})
+            if reply["state"]["over"]:
+                break
+            await client.call("question", session_id, {})
+        assert reply["state"]["over"] and reply["state"]["hero_hp"] == 0
+        status, _ = await client.call("question", session_id, {})
+        assert status == 409
+        await client.close()
+    run(test)
+
+
+def test_rocket_flow():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "rocket"})
+        session_id, seed = reply["id"], reply["seed"]
+        status, reply = await client.call("answer", session_id, {"answer": rocket_answer(seed, 0)})
+        assert status == 200 and reply["status"] == "correct"
+        status, reply = await client.call("answer", session_id, {"answer": "1"})
+        assert status == 409
+
+        # A new mission can be asked for at any time, answered or not
+        await client.call("question", session_id, {})
+        await client.call("question", session_id, {})
+        status, reply = await client.call("answer", session_id, {"answer": rocket_answer(seed, 2)})
+        assert reply["status"] == "correct" and reply["state"]["score"] == 2
+        await client.close()
+    run(test)
+
+
+def test_division_flow():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "division"})
+        session_id, state = reply["id"], reply["state"]
+
+        _, reply = await client.call("answer", session_id, {"answer": "2.5"})
+        assert reply["status"] == "invalid"
+        _, reply = await client.call("answer", session_id, {"answer": "999"})
+        assert reply["status"] == "wrong"
+        status, _ = await client.call("question", session_id, {})
+        assert status == 409
+
+        _, reply = await client.call("answer", session_id, {"answer": division_answer(state)})
+        assert reply["status"] == "correct" and reply["state"]["next"] and reply["state"]["streak"] == 1
+        status, reply = await client.call("question", session_id, {})
+        assert status == 200 and not reply["state"]["next"]
+        await client.close()
+    run(test)
+
+
+def test_end_session():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "rocket"})
+        status, reply = await client.call("end", reply["id"], {})
+        assert status == 200 and reply["ended"]
+        status, _ = await client.call("state", reply["id"], {})
+        assert status == 404
+        await client.close()
+    run(test)
+
+
+# --------- bad requests ---------
+@pytest.mark.parametrize("game", ["battle", "rocket", "division"])
+def test_huge_exponent_answer_is_invalid(game):
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": game})
+        status, reply = await client.call("answer", reply["id"], {"answer": "1e99999999999999999999999"})
+        assert status == 200 and reply["status"] == "invalid"
+        await client.close()
+    run(test)
+
+
+@pytest.mark.parametrize("message", [{"game": ["x"]}, {"game": "chess"}, {"game": None}, {"seed": "7"}])
+def test_bad_start_is_400(message):
+    async def test(server, host, port):
+        client = await http(host, port)
+        status, reply = await client.call("start", None, message)
+        assert status == 400 and "error" in reply
+        await client.close()
+    run(test)
+
+
+@pytest.mark.parametrize("body", [b"{", b"[1, 2]", b"\"x\"", b"[" * 5000 + b"]" * 5000])
+def test_bad_body_is_400(body):
+    async def test(server, host, port):
+        status, reply = await raw_request(host, port, post("/sessions", body))
+        assert status == 400
+    run(test)
+
+
+def test_answer_must_be_a_string():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "battle"})
+        status, _ = await client.call("answer", reply["id"], {"answer": 12})
+        assert status == 400
+        await client.close()
+    run(test)
+
+
+def test_routes():
+    async def test(server, host, port):
+        status, _ = await raw_request(host, port, b"GET /nowhere HTTP/1.1\r\n\r\n")
+        assert status == 404
+        status, _ = await raw_request(host, port, b"PUT /sessions HTTP/1.1\r\n\r\n")
+        assert status == 405
+        status, _ = await raw_request(host, port, b"GET /sessions/nope HTTP/1.1\r\n\r\n")
+        assert status == 404
+        status, reply = await raw_request(host, port, b"GET /metrics HTTP/1.1\r\n\r\n")
+        assert status == 200 and "sessions" in reply
+    run(test)
+
+
+def test_server_full():
+    async def test(server, host, port):
+        client = await http(host, port)
+        await client.call("start", None, {"game": "rocket"})
+        status, _ = await client.call("start", None, {"game": "rocket"})
+        assert status == 503
+        await client.close()
+    run(test, max_sessions=1)
+
+
+def test_unexpected_error_is_500_and_counted(monkeypatch):
+    def broken(self, text):
+        raise ZeroDivisionError
+    monkeypatch.setattr(quiz_server.RocketSession, "answer", broken)
+
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "rocket"})
+        status, reply = await client.call("answer", reply["id"], {"answer": "1"})
+        assert status == 500
+        # The connection survives
+        status, _ = await client.call("start", None, {"game": "rocket"})
+        assert status == 201
+        assert server.metrics.snapshot()["answer"]["errors"] == 1
+        await client.close()
+    run(test)
+
+
+# --------- idle eviction ---------
+def test_evicts_least_recently_used_first():
+    async def test(server, host, port):
+        client = await http(host, port)
+        ids = []
+        for _ in range(3):
+            _, reply = await client.call("start", None, {"game": "division"})
+            ids.append(reply["id"])
+        server.sessions[ids[0]].last_used = server.sessions[ids[1]].last_used = 0.0
+        await client.call("state", ids[0], {})
+        server.evict(time.monotonic() - 60)
+        assert list(server.sessions) == [ids[2], ids[0]]
+        assert server.evicted == 1
+        status, _ = await client.call("state", ids[1], {})
+        assert status == 404
+        await client.close()
+    run(test)
+
+
+def test_idle_sessions_are_swept():
+    async def test(server, host, port):
+        client = await http(host, port)
+        _, reply = await client.call("start", None, {"game": "rocket"})
+        await asyncio.sleep(0.3)
+        status, _ = await client.call("state", reply["id"], {})
+        assert status == 404
+        await client.close()
+    run(test, idle_timeout=0.05, sweep_interval=0.05)
+
+
+# --------- WebSocket ---------
+def test_websocket_session():
+    async def test(server, host, port):
+        client = WebSocketClient()
+        await client.connect(host, port)
+        status, reply = await client.call("start", None, {"game": "division"})
+        assert status == 201
+        session_id, state = reply["id"], reply["state"]
+        # After "start" the connection stays on that session
+        status, reply = await client.call("answer", None, {"answer": division_answer(state)})
+        assert status == 200 and reply["status"] == "correct"
+
+        other = WebSocketClient()
+        await other.connect(host, port)
+        status, reply = await other.call("attach", session_id, {})
+        assert status == 200 and reply["state"]["score"] == 1
+        status, reply = await other.call("question", None, {})
+        assert status == 200
+
+        status, reply = await client.call(["x"], None, {})
+        assert status == 400
+        status, reply = await client.call(None, None, {})
+        assert status == 400
+        assert server.metrics.snapshot()["unknown"]["errors"] == 2
+        await client.close()
+        await other.close()
+    run(test)
+
+
+def test_websocket_ping_and_fragments():
+    async def test(server, host, port):
+        client = WebSocketClient()
+        await client.connect(host, port)
+        client.writer.write(ws_frame(quiz_server.WS_PING, b"hi", secrets.token_bytes(4)))
+        _, opcode, data = await read_frame(client.reader, masked=False)
+        assert (opcode, data) == (quiz_server.WS_PONG, b"hi")
+
+        message = json.dumps({"op": "start", "game": "rocket"}).encode('utf-8')
+        first, rest = message[:10], message[10:]
+        head = ws_frame(quiz_server.WS_TEXT, first, secrets.token_bytes(4))
+        # Clear FIN on the first frame; the rest follows as a continuation frame
+        client.writer.write(bytes([head[0] & 0x7F]) + head[1:])
+        client.writer.write(ws_frame(0x0, rest, secrets.token_bytes(4)))
+        _, _, data = await read_frame(client.reader, masked=False)
+        assert json.loads(data)["code"] == 201
+        await client.close()
+    run(test)
+
+
+def test_websocket_unmasked_frame_closes():
+    async def test(server, host, port):
+        client = WebSocketClient()
+        await client.connect(host, port)
+        client.writer.write(ws_frame(quiz_server.WS_TEXT, b"{}"))
+        _, opcode, data = await read_frame(client.reader, masked=False)
+        assert opcode == quiz_server.WS_CLOSE and struct.unpack("!H", data) == (1002,)
+    run(test)
+
+
+def test_websocket_deep_nesting_is_400():
+    async def test(server, host, port):
+        client = WebSocketClient()
+        await client.connect(host, port)
+        client.writer.write(ws_frame(quiz_server.WS_TEXT, b"[" * 5000 + b"]" * 5000, secrets.token_bytes(4)))
+        _, _, data = await read_frame(client.reader, masked=False)
+        assert json.loads(data)["code"] == 400
+        await client.close()
+    run(test)
@@ -0,0 +1,36 @@
+import quiz_logic
+from log_records import make_record
+from replay import Session, mission_question
+
+
+def rocket_record(seed, number, value, v=None):
+    record = make_record("rocket", "km_to_m", value, "0", "0", False, seed=seed, question=number)
+    if v is not None:
+        record["v"] = v
+    return record
+
+
+def test_current_records_replay_cleanly():
+    seed = 11
+    records = []
+    for number in range(5):
+        mission = quiz_logic.generate_mission(quiz_logic.question_rng(seed, number))
+        direction = "m_to_km" if mission[4] == "meters" else "km_to_m"
+        value = quiz_logic.format_number(mission[2])
+        records.append(make_record("rocket", direction, value, mission[-1].text, mission[-1].text, True,
+                                   seed=seed, question=number, ts=number))
+    assert Session("rocket", seed, records).replay() == []
+
+
+def test_changed_question_diverges():
+    seed = 11
+    assert mission_question(seed, 0) != "km_to_m:0.5"
+    divergences = Session("rocket", seed, [rocket_record(seed, 0, "0.5")]).replay()
+    assert [d["field"] for d in divergences] == ["question"]
+
+
+def test_questions_before_v4_are_not_compared():
+    seed = 11
+    for v in (2, 3):
+        record = rocket_record(seed, 0 if v == 3 else None, "0.5", v=v)
+        assert Session("rocket", seed, [record]).replay() == []
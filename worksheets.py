@@ -0,0 +1,194 @@
+import argparse
+import html
+import os
+import random
+from collections import Counter
+from multiprocessing import Pool
+
+import quiz_logic
+from battle_engine import BattleEngine
+
+# Division facts come from the 2-12 times tables
+MIN_FACTOR, MAX_FACTOR = 2, 12
+MAX_TRIES = 200
+# Redraws of one paper before giving up on the shared-question limit
+MAX_REDRAWS = 200
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2em; }}
+.paper {{ page-break-after: always; }}
+h3 {{ margin-bottom: 0.3em; }}
+li {{ margin-bottom: 1.2em; }}
+.answer {{ display: block; margin-top: 0.4em; }}
+.accept {{ color: #555; font-size: 0.9em; }}
+@media print {{ body {{ margin: 0; }} }}
+</style>
+</head>
+<body>
+"""
+PAGE_FOOT = "</body>\n</html>\n"
+
+
+def km_question(rng, difficulty, conversion_type, sig_figs):
+    q = quiz_logic.generate_km_question(difficulty, force_type=conversion_type, rng=rng, sig_figs=sig_figs)
+    key = q[7]
+    accept = f"accept {quiz_logic.decimal_text(key.lo)} to {quiz_logic.decimal_text(key.hi)}"
+    return q[6], q[0], key, q[3], accept
+
+
+def rocket_question(rng):
+    story, question, value, _, unit_from, unit_to, _, key = quiz_logic.generate_mission(rng)
+    return f"rocket:{unit_from}:{value}", f"{story}\n{question}", key, unit_to, ""
+
+
+def division_question(rng):
+    dividend, divisor, answer = quiz_logic.generate_division(MIN_FACTOR, MAX_FACTOR, rng)
+    return f"div:{dividend}/{divisor}", f"{dividend} ÷ {divisor} = ?", quiz_logic.whole_number_key(answer), "", ""
+
+
+def unique_question(make, used):
+    for _ in range(MAX_TRIES):
+        question = make()
+        if question[0] not in used:
+            used.add(question[0])
+            return question
+    raise ValueError("could not find enough different questions; ask for fewer per paper")
+
+
+def make_paper(seed, number, km=10, rocket=4, division=6, difficulty=2, attempt=0):
+    """Questions for one paper as (section, [(id, text, key, unit, accept), ...]) pairs.
+
+    Every paper has the same mix: the same number of km→m and m→km
+    questions and the same spread of significant figures, so papers are
+    equally hard. No question appears twice on a paper.
+    """
+    rng = random.Random(f"{seed}/{number}/{attempt}")
+    used = set()
+
+    # Sig figs and directions spread the same way on every paper, in a shuffled order
+    table = BattleEngine.SIG_FIG_TABLE
+    mix = [(quiz_logic.CONVERSIONS[i % 2], table[i % len(table)]) for i in range(km)]
+    rng.shuffle(mix)
+    sections = [
+        ("Distances (km ↔ m)",
+         [unique_question(lambda: km_question(rng, difficulty, *m), used) for m in mix]),
+        ("Rocket missions", [unique_question(lambda: rocket_question(rng), used) for _ in range(rocket)]),
+        ("Division", [unique_question(lambda: division_question(rng), used) for _ in range(division)]),
+    ]
+    return [(title, questions) for title, questions in sections if questions]
+
+
+def question_ids(sections):
+    return [q[0] for _, questions in sections for q in questions]
+
+
+def shared_counts(ids, papers_with):
+    """How many of `ids` each earlier paper also has, from the question id -> paper numbers index."""
+    shared = Counter()
+    for qid in ids:
+        shared.update(papers_with.get(qid, ()))
+    return shared
+
+
+def render_paper(number, sections):
+    out = [f'<section class="paper">\n<h2>Paper {number}</h2>\n<p>Name: ____________________ Class: ________</p>\n']
+    start = 1
+    for title, questions in sections:
+        out.append(f'<h3>{html.escape(title)}</h3>\n<ol start="{start}">\n')
+        for _, text, _, unit, _ in questions:
+            text = html.escape(text).replace("\n", "<br>")
+            out.append(f'<li>{text}<span class="answer">Answer: ______________ {html.escape(unit)}</span></li>\n')
+        out.append("</ol>\n")
+        start += len(questions)
+    out.append("</section>\n")
+    return "".join(out)
+
+
+def render_key(number, sections):
+    out = [f'<section class="paper">\n<h2>Paper {number}: answers</h2>\n']
+    start = 1
+    for title, questions in sections:
+        out.append(f'<h3>{html.escape(title)}</h3>\n<ol start="{start}">\n')
+        for _, _, key, unit, accept in questions:
+            note = f' <span class="accept">({html.escape(accept)})</span>' if accept else ""
+            out.append(f"<li>{key.text} {html.escape(unit)}{note}</li>\n")
+        out.append("</ol>\n")
+        start += len(questions)
+    out.append("</section>\n")
+    return "".join(out)
+
+
+def build_paper(args):
+    """Worker: make and render one paper. Returns (number, question ids, paper html, key html)."""
+    seed, number, counts, difficulty, attempt = args
+    sections = make_paper(seed, number, *counts, difficulty=difficulty, attempt=attempt)
+    return number, question_ids(sections), render_paper(number, sections), render_key(number, sections)
+
+
+def write_papers(n, seed, out_dir, counts=(10, 4, 6), difficulty=2, workers=None, max_shared=None):
+    """Build `n` papers across a process pool, streaming them to papers.html and answer_keys.html.
+
+    No two papers have more than `max_shared` questions in common (default a
+    quarter of a paper). They cannot be fully disjoint: there are only 121
+    division facts and few distances with 1-2 significant figures.
+    """
+    if counts[2] > (MAX_FACTOR - MIN_FACTOR + 1) ** 2:
+        raise ValueError("more division questions than there are facts in the times tables")
+    if max_shared is None:
+        max_shared = sum(counts) // 4
+    os.makedirs(out_dir, exist_ok=True)
+    papers_path = os.path.join(out_dir, "papers.html")
+    keys_path = os.path.join(out_dir, "answer_keys.html")
+    papers_with = {}
+    tasks = ((seed, number, counts, difficulty, 0) for number in range(1, n + 1))
+    with open(papers_path, 'w', encoding='utf-8') as papers, open(keys_path, 'w', encoding='utf-8') as keys, \
+            Pool(workers or os.cpu_count()) as pool:
+        papers.write(PAGE_HEAD.format(title="Worksheets"))
+        keys.write(PAGE_HEAD.format(title="Answer keys"))
+        for number, ids, paper_html, key_html in pool.imap(build_paper, tasks, chunksize=16):
+            attempt = 0
+            # Too much in common with an earlier paper: redraw this one
+            while max(shared_counts(ids, papers_with).values(), default=0) > max_shared:
+                attempt += 1
+                if attempt > MAX_REDRAWS:
+                    raise ValueError(f"paper {number} shares more than {max_shared} questions with an earlier one "
+                                     f"after {MAX_REDRAWS} redraws; allow more (--max-shared) or ask for fewer papers")
+                _, ids, paper_html, key_html = build_paper((seed, number, counts, difficulty, attempt))
+            for qid in ids:
+                papers_with.setdefault(qid, []).append(number)
+            papers.write(paper_html)
+            keys.write(key_html)
+        papers.write(PAGE_FOOT)
+        keys.write(PAGE_FOOT)
+    return papers_path, keys_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate printable worksheets and their answer keys.")
+    parser.add_argument("papers", type=int, help="number of papers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--km", type=int, default=10, help="km/m questions per paper")
+    parser.add_argument("--rocket", type=int, default=4, help="rocket missions per paper")
+    parser.add_argument("--division", type=int, default=6, help="division facts per paper")
+    parser.add_argument("--difficulty", type=int, default=2, choices=(1, 2, 3))
+    parser.add_argument("--max-shared", type=int, default=None,
+                        help="most questions any two papers may have in common (default: a quarter of a paper); "
+                             "papers cannot be fully disjoint, as there are only 121 division facts and few "
+                             "distances with 1-2 significant figures")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default="worksheets")
+    args = parser.parse_args()
+
+    papers_path, keys_path = write_papers(args.papers, args.seed, args.output_dir,
+                                          (args.km, args.rocket, args.division), args.difficulty, args.workers,
+                                          args.max_shared)
+    print(f"Wrote {args.papers} papers to {papers_path} and their answers to {keys_path}")
+
+
+if __name__ == "__main__":
+    main()